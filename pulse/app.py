@@ -4,10 +4,12 @@ Built with Streamlit.
 """
 
 import streamlit as st
-import time
 import threading
+import uuid
 from pulse.config import get_default_config
 from pulse.core.brain import Brain
+from pulse.core.compression import CachedCompressor
+from pulse.core.events import TurnEvent
 
 # Configure page settings
 print("DEBUG: Setting page config...")
@@ -102,6 +104,103 @@ class VoiceManager:
 def get_voice_manager():
     return VoiceManager()
 
+
+UI_HISTORY_LIMIT = 50
+VOICE_FEED_INTERVAL = 0.5
+
+
+def sync_messages(brain):
+    """
+    Bring st.session_state.messages up to date with Memory.
+
+    The first run loads the last UI_HISTORY_LIMIT messages; after that only
+    rows newer than the last one we rendered are fetched, and nothing is
+    read at all while the memory version is unchanged.
+    """
+    state = st.session_state
+    # Read the version before fetching so a concurrent write is picked up
+    # on the next sync rather than lost.
+    version = brain.memory.version
+
+    if "memory_version" not in state:
+        history = brain.memory.get_history(limit=UI_HISTORY_LIMIT, session=brain.session)
+        state.messages = [{"role": msg.role, "content": msg.content} for msg in history]
+        state.last_message_id = history[-1].id if history else 0
+    elif version != state.memory_version:
+        new_messages = brain.memory.get_since(state.last_message_id, session=brain.session)
+        if new_messages:
+            state.messages.extend({"role": msg.role, "content": msg.content} for msg in new_messages)
+            del state.messages[:-UI_HISTORY_LIMIT]
+            state.last_message_id = new_messages[-1].id
+
+    state.memory_version = version
+
+
+def reset_messages():
+    """Drop the UI cache so the next sync reloads from Memory."""
+    for key in ("messages", "memory_version", "last_message_id"):
+        st.session_state.pop(key, None)
+
+
+def get_voice_feed(brain):
+    """This browser session's subscription to the Brain's turn events."""
+    if "voice_feed" not in st.session_state:
+        st.session_state.voice_feed = brain.events.subscribe()
+        st.session_state.voice_partial = ""
+        st.session_state.voice_status = ""
+    return st.session_state.voice_feed
+
+
+def web_source() -> str:
+    """Event source tag of this browser session's typed turns."""
+    if "web_source" not in st.session_state:
+        st.session_state.web_source = f"web:{uuid.uuid4().hex[:8]}"
+    return st.session_state.web_source
+
+
+def close_voice_feed():
+    feed = st.session_state.pop("voice_feed", None)
+    if feed:
+        feed.close()
+
+
+@st.fragment(run_every=VOICE_FEED_INTERVAL)
+def voice_feed_panel(brain):
+    """
+    Render live voice activity from the event feed.
+
+    Only this fragment wakes on the timer, and it just drains an in-memory
+    queue. Streamed chunks are drawn in place; the full app reruns only
+    when a voice (or other external) turn was stored, so the chat history
+    picks it up. Turns typed in this browser session are already on screen.
+    """
+    state = st.session_state
+    turn_stored = False
+    own_source = web_source()
+    for event in get_voice_feed(brain).drain():
+        if event.metadata.get("session", brain.session) != brain.session:
+            continue
+        if event.metadata.get("source") == own_source:
+            continue
+        if event.kind == TurnEvent.STATUS:
+            state.voice_status = event.content
+        elif event.kind == TurnEvent.RESPONSE_CHUNK:
+            state.voice_partial += event.content
+        elif event.kind in (TurnEvent.USER_MESSAGE, TurnEvent.RESPONSE):
+            turn_stored = True
+            if event.kind == TurnEvent.RESPONSE:
+                state.voice_partial = ""
+
+    if turn_stored:
+        st.rerun()
+
+    if state.voice_partial:
+        with st.chat_message("assistant"):
+            st.markdown(state.voice_partial + "▌")
+    if state.voice_status:
+        st.caption(f"🎤 Voice: {state.voice_status}")
+
+
 def main():
     print("DEBUG: Entering main()...")
     brain = get_brain()
@@ -162,17 +261,30 @@ def main():
         brain.config.enable_context_optimization = context_opt
         
         if context_opt:
-            st.code(f"Strategy: Haste + Compress\nRate: {brain.config.compression_rate}", language="text")
+            backend = brain.compressor.name if brain.compressor else "none"
+            st.code(
+                f"Strategy: Haste + Compress\nBackend: {backend}\nRate: {brain.config.compression_rate}",
+                language="text"
+            )
             st.success("Context optimization active")
+            if isinstance(brain.compressor, CachedCompressor):
+                stats = brain.compressor.stats()
+                st.caption(f"Compression cache: {stats['hits']} hits / {stats['misses']} misses")
         else:
             st.warning("Sending raw full history")
+        if brain.response_cache:
+            stats = brain.response_cache.stats()
+            st.caption(f"Response cache: {stats['hits']} hits / {stats['misses']} misses")
+        if brain.semantic_cache:
+            stats = brain.semantic_cache.stats()
+            st.caption(f"Semantic cache: {stats['hits']} hits / {stats['lookups']} lookups, {stats['size']} stored")
             
         st.divider()
         
         # Memory actions
         if st.button("Clear Conversation History", type="primary"):
             brain.clear_memory()
-            st.session_state.messages = []
+            reset_messages()
             st.rerun()
 
     # Main Chat Interface
@@ -180,13 +292,9 @@ def main():
     st.caption("High-performance assistant powered by ScaleDown & OpenRouter")
 
     # --- DB-DRIVEN UI SYNC ---
-    # Always fetch latest history from Brain Memory to ensure voice chats show up
-    # We use a larger limit to show context
-    db_history = brain.memory.get_history(limit=50)
-    
-    # st.session_state.messages is now just a cache/buffer for the UI render
-    # We rebuild it from DB every time to catch external changes (Voice)
-    st.session_state.messages = [{"role": msg.role, "content": msg.content} for msg in db_history]
+    # st.session_state.messages is a cache of what Memory holds; only new
+    # rows (e.g. voice turns) are fetched on each run.
+    sync_messages(brain)
 
     # Display chat history
     for message in st.session_state.messages:
@@ -195,8 +303,8 @@ def main():
 
     # Chat Input
     if prompt := st.chat_input("How can I help you today?"):
-        # Add user message to UI immediately (optimistic update)
-        st.session_state.messages.append({"role": "user", "content": prompt})
+        # Show the user message immediately. It is not added to the cache:
+        # stream_thought stores it, and the next sync picks it up from Memory.
         with st.chat_message("user"):
             st.markdown(prompt)
 
@@ -206,14 +314,14 @@ def main():
             full_response = ""
             
             # Show "thinking" indicator if optimization is ON
-            if brain.config.enable_context_optimization and len(st.session_state.messages) > 4:
-                with st.status("Optimizing context with ScaleDown...", expanded=False) as status:
+            if brain.config.enable_context_optimization and len(st.session_state.messages) >= 4:
+                with st.status("Optimizing context...", expanded=False) as status:
                     pass
             
             try:
                 # Stream response
                 # Note: stream_thought handles adding to memory internally
-                for chunk in brain.stream_thought(prompt):
+                for chunk in brain.stream_thought(prompt, source=web_source()):
                     full_response += chunk
                     message_placeholder.markdown(full_response + "▌")
                 
@@ -222,11 +330,12 @@ def main():
             except Exception as e:
                 st.error(f"An error occurred: {str(e)}")
                 
-    # --- AUTO-REFRESH FOR VOICE ---
-    # If voice is running, checking for new messages in DB
+    # --- LIVE VOICE FEED ---
+    # While voice is running, voice turns are pushed to us as events
     if voice_manager.is_running():
-        time.sleep(2) # Refresh every 2 seconds
-        st.rerun()
+        voice_feed_panel(brain)
+    else:
+        close_voice_feed()
 
 if __name__ == "__main__":
     main()
@@ -34,20 +34,89 @@ class PulseConfig:
         "google/gemini-2.0-pro-exp-02-05:free",
         "mistralai/mistral-7b-instruct:free",
     ])
+    # Hedged requests: race the next fallback against a slow model (0 = off).
+    # Off by default since every hedge is an extra request against free-tier rate limits.
+    hedge_delay_ms: float = 0.0  # Start the next model once a request has run this long
+    hedge_ttfb_ms: float = 0.0  # ...or has had no response headers for this long
+    # Order fallbacks by observed model health, persisted to "<db_path>.health.json"
+    model_health: bool = True
+    
+    # HTTP connection handling for the LLM clients
+    openrouter_base_url: str = "https://openrouter.ai/api/v1"
+    http_pool_connections: int = 4  # Hosts kept in the keep-alive pool
+    http_pool_maxsize: int = 16  # Open connections kept per host
+    http_prewarm: bool = True  # Connect to the API host in the background at startup
+    http_async_max_connections: int = 200  # Connection pool of the async clients
+    async_io_workers: int = 16  # Threads AsyncBrain runs memory and context work on
     
     # Voice Settings
-    tts_engine: str = "system"  # "system" (PowerShell), "pyttsx3", or "elevenlabs"
+    tts_engine: str = "system"  # "system" (PowerShell), "pyttsx3", "elevenlabs", "espeak" or "stub" (silent)
     stt_engine: str = "whisper"
     wake_words: list = field(default_factory=lambda: ["pulse", "hello", "hey", "hi", "ok pulse"])
     whisper_model_size: str = "base"
+    whisper_device: Optional[str] = None  # "cuda"/"cpu"; None lets Whisper choose
+    whisper_language: Optional[str] = "english"  # None detects the language per utterance
+    whisper_preload: bool = True  # Load the Whisper model in the background at start-up
+    wake_word_engine: str = "auto"  # "local" (enrolled templates), "google", or "auto" (local once enrolled)
+    wake_word_templates: str = field(default_factory=lambda: str(Path.home() / ".pulse" / "wake_words.npz"))
+    stream_voice: bool = True  # Speak responses sentence by sentence while they stream
+    barge_in: bool = True  # Stop speaking when the user starts talking
+    barge_in_ratio: float = 3.0  # Speech is this many times louder (RMS) than the noise floor...
+    barge_in_min_rms: float = 500.0  # ...and at least this loud (16-bit samples)
+    barge_in_onset_ms: int = 150  # Sustained speech needed to interrupt
     
     # Storage Settings
     db_path: str = field(default_factory=lambda: str(Path.home() / ".pulse" / "pulse_data.db"))
     encryption_key: Optional[str] = None  # Auto-generated if not provided
+    session_id: str = "default"  # Conversation partition used by Brain
+    # Write-behind: queue messages and persist them in background batches
+    memory_write_behind: bool = False
+    memory_flush_interval: float = 0.05  # Seconds a batch may wait to fill up
+    memory_max_batch: int = 256
+    
+    # Semantic long-term memory (local embeddings of past turns)
+    enable_semantic_memory: bool = True
+    semantic_top_k: int = 3  # Older turns recalled into context
+    semantic_min_score: float = 0.3  # Cosine similarity threshold
+    semantic_max_rows: int = 20000  # Newest turns of the session scanned per recall
+    embedding_dim: int = 256
+    
+    # Semantic cache: answer near-duplicates of earlier standalone questions (needs numpy)
+    enable_semantic_cache: bool = True
+    semantic_cache_size: int = 512  # Cached exchanges; the least recently used is evicted
+    semantic_cache_threshold: float = 0.9  # Cosine similarity of the normalised queries
+    semantic_cache_ttl: float = 3600.0  # Seconds
+    semantic_cache_context_turns: int = 2  # Recent turns that must match too (the last one always does)
+    
+    # Context window packing
+    context_history_limit: int = 20  # Recent messages considered per turn
+    context_recent_messages: int = 4  # Newest messages always sent raw
+    context_token_budget: Optional[int] = None  # Prompt budget; None = model limit minus reserve
+    response_token_reserve: int = 1024  # Tokens left free for the reply
     
     # ScaleDown Settings
     enable_context_optimization: bool = True
-    compression_rate: str = "auto"
+    # "auto" (ScaleDown when a key is set, else none), "scaledown", "local" or "none"
+    compressor_backend: str = "auto"
+    compression_rate: str = "auto"  # Fraction of tokens to keep, or "auto"
+    compression_cache_size: int = 256  # Cached compressions kept in memory; 0 disables
+    compression_cache_ttl: float = 3600.0  # Seconds
+    summary_rebase_every: int = 8  # Rebuild the rolling summary from raw turns every N folds
+    enable_precompute: bool = True  # Compress the next turn's older history in the background
+    precompute_deadline_ms: float = 150.0  # How long a turn waits for it before sending raw turns
+    
+    # Response cache for repeated identical LLM requests. Only deterministic
+    # requests are cached, so Brain's turns use it only with llm_temperature = 0
+    # (or response_cache_any_temperature); otherwise it serves direct client callers.
+    response_cache_size: int = 256  # Cached responses kept in memory; 0 disables
+    response_cache_ttl: float = 3600.0  # Seconds
+    # Also cache sampled requests (temperature > 0 or unset), which normally
+    # get a fresh answer every time
+    response_cache_any_temperature: bool = False
+    llm_temperature: Optional[float] = None  # Sent with Brain's requests; None: the provider's default
+    
+    # Persist caches to "<db_path>.cache" (encrypted like Memory when a key is set)
+    persistent_cache: bool = True
     
     # Optional API Keys
     elevenlabs_api_key: Optional[str] = None
@@ -62,9 +131,13 @@ class PulseConfig:
             OPENROUTER_API_KEY: OpenRouter API key
             PULSE_DEFAULT_MODEL: Default LLM model
             PULSE_FALLBACK_MODEL: Fallback LLM model
-            PULSE_TTS_ENGINE: TTS engine (pyttsx3/elevenlabs)
+            PULSE_TTS_ENGINE: TTS engine (system/pyttsx3/elevenlabs/espeak/stub)
             PULSE_WAKE_WORD: Wake word for voice activation
             PULSE_DB_PATH: Database file path
+            PULSE_SESSION: Conversation session to use
+            OPENROUTER_BASE_URL: OpenRouter-compatible API endpoint
+            PULSE_COMPRESSOR: Compression backend (auto/scaledown/local/none)
+            PULSE_HEDGE_TTFB_MS: Race the next fallback after this long without a response
             ELEVENLABS_API_KEY: ElevenLabs API key (optional)
         """
         config = cls(
@@ -75,6 +148,10 @@ class PulseConfig:
             tts_engine=os.environ.get("PULSE_TTS_ENGINE", cls.tts_engine),
             wake_words=os.environ.get("PULSE_WAKE_WORDS", "pulse,hello,hey,hi").split(","),
             db_path=os.environ.get("PULSE_DB_PATH", str(Path.home() / ".pulse" / "pulse_data.db")),
+            session_id=os.environ.get("PULSE_SESSION", cls.session_id),
+            openrouter_base_url=os.environ.get("OPENROUTER_BASE_URL", cls.openrouter_base_url),
+            compressor_backend=os.environ.get("PULSE_COMPRESSOR", cls.compressor_backend),
+            hedge_ttfb_ms=float(os.environ.get("PULSE_HEDGE_TTFB_MS", cls.hedge_ttfb_ms)),
             elevenlabs_api_key=os.environ.get("ELEVENLABS_API_KEY"),
         )
         return config
@@ -83,8 +160,8 @@ class PulseConfig:
         """Validate that required configuration is present."""
         errors = []
         
-        if not self.scaledown_api_key:
-            errors.append("SCALEDOWN_API_KEY is required")
+        if self.compressor_backend == "scaledown" and not self.scaledown_api_key:
+            errors.append("SCALEDOWN_API_KEY is required for the scaledown compressor")
         
         if not self.openrouter_api_key:
             errors.append("OPENROUTER_API_KEY is required")
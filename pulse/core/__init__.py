@@ -2,8 +2,10 @@
 Pulse Core - Brain, Memory, and LLM Client.
 """
 
+from pulse.core.events import EventBus, TurnEvent
 from pulse.core.memory import Memory, Message
 from pulse.core.openrouter_client import OpenRouterClient
 from pulse.core.brain import Brain
+from pulse.core.async_brain import AsyncBrain
 
-__all__ = ["Memory", "Message", "OpenRouterClient", "Brain"]
+__all__ = ["Memory", "Message", "EventBus", "TurnEvent", "OpenRouterClient", "Brain", "AsyncBrain"]
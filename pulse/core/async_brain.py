@@ -0,0 +1,148 @@
+"""
+AsyncBrain: asyncio front end to the Brain.
+
+LLM calls go through AsyncOpenRouterClient on the event loop. Everything
+that blocks (SQLite memory, context assembly with compression and recall,
+skills) runs in a thread pool, so one process can serve hundreds of
+concurrent conversations with a handful of threads.
+"""
+
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncGenerator, Optional
+
+from pulse.config import PulseConfig
+from pulse.core.async_clients import AsyncOpenRouterClient
+from pulse.core.brain import Brain
+from pulse.core.events import TurnEvent
+from pulse.core.response_cache import split_chunks
+
+
+class AsyncBrain:
+    """
+    Async counterpart of Brain with the same conversation semantics.
+
+    Shares one Brain (memory, events, compression, skills) for the turn
+    logic; only the I/O scheduling differs. Call `aclose()` when done.
+    """
+
+    def __init__(self, config: PulseConfig, session: Optional[str] = None):
+        self.config = config
+        self.llm = AsyncOpenRouterClient(
+            api_key=config.openrouter_api_key,
+            default_model=config.default_model,
+            fallback_models=config.fallback_models,
+            base_url=config.openrouter_base_url,
+            max_connections=config.http_async_max_connections,
+            max_keepalive=config.http_async_max_connections,
+            hedge_delay_ms=config.hedge_delay_ms,
+            hedge_ttfb_ms=config.hedge_ttfb_ms,
+            health=Brain._make_health(config)
+        )
+        self.brain = Brain(config, session, llm=self.llm)
+        # The response cache lives with Brain's cache database
+        self.llm.response_cache = self.brain.response_cache
+        self.session = self.brain.session
+        self.memory = self.brain.memory
+        self.events = self.brain.events
+        self._io = ThreadPoolExecutor(max_workers=config.async_io_workers, thread_name_prefix="pulse-io")
+
+    async def _io_call(self, fn, *args, **kwargs):
+        """Run a blocking call in the I/O pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._io, functools.partial(fn, *args, **kwargs))
+
+    async def prewarm(self, connections: int = 1) -> int:
+        """Open connections to the API host before the first turn needs them."""
+        return await self.llm.prewarm(connections)
+
+    async def think(self, user_input: str, system_prompt: str = None, session: Optional[str] = None,
+                    source: Optional[str] = None) -> str:
+        """
+        Process user input and return a response. `source` tags the turn's
+        events, as for Brain.think().
+        """
+        session = session or self.session
+        fingerprint, hit = await self._io_call(self.brain._semantic_check, user_input, system_prompt, session)
+        if hit:
+            return await self._io_call(self.brain._serve_cached, hit, user_input, session, source)
+
+        context_messages, context_report = await self._io_call(
+            self.brain._start_turn, user_input, system_prompt, session, source
+        )
+
+        skill = self.brain._find_skill(user_input)
+        if skill:
+            return await self._io_call(self.brain._run_skill, skill, user_input, session, source)
+
+        start_time = time.time()
+        result = await self.llm.chat(context_messages, **self.brain._llm_params(reasoning={"enabled": True}))
+        latency = (time.time() - start_time) * 1000
+
+        metadata = self.brain._response_metadata(result, latency, context_report)
+        await self._io_call(self.brain._finish_turn, session, result["content"], metadata, source,
+                            model=result.get("model"))
+        await self._io_call(self.brain._remember_answer, user_input, fingerprint, result["content"], context_report)
+        return result["content"]
+
+    async def stream_thought(self, user_input: str, system_prompt: str = None, session: Optional[str] = None,
+                             source: Optional[str] = None) -> AsyncGenerator[str, None]:
+        """
+        Stream the response. The full text is saved even if the stream is
+        closed early.
+        """
+        session = session or self.session
+        fingerprint, hit = await self._io_call(self.brain._semantic_check, user_input, system_prompt, session)
+        if hit:
+            await self._io_call(self.brain._add_user_message, user_input, session, source)
+            try:
+                for chunk in split_chunks(hit.response):
+                    self.events.publish(TurnEvent.RESPONSE_CHUNK, chunk, session=session, source=source)
+                    yield chunk
+            finally:
+                await self._io_call(self.brain._finish_turn, session, hit.response,
+                                    {"semantic_cache": hit.to_dict()}, source, semantic_cache=True)
+            return
+
+        skill = self.brain._find_skill(user_input)
+        if skill:
+            await self._io_call(self.brain._add_user_message, user_input, session, source)
+            result = await self._io_call(self.brain._execute_skill, skill, user_input)
+            try:
+                self.events.publish(TurnEvent.RESPONSE_CHUNK, result, session=session, source=source)
+                yield result
+            finally:
+                await self._io_call(self.brain._finish_turn, session, result, {"skill": skill.name},
+                                    source, skill=skill.name)
+            return
+
+        context_messages, context_report = await self._io_call(
+            self.brain._start_turn, user_input, system_prompt, session, source
+        )
+
+        full_response = []
+        timings = []  # This stream's own timing (the client's last_timing may be another turn's)
+        try:
+            async for chunk in self.llm.stream(context_messages, on_timing=timings.append, **self.brain._llm_params()):
+                full_response.append(chunk)
+                self.events.publish(TurnEvent.RESPONSE_CHUNK, chunk, session=session, source=source)
+                yield chunk
+            await self._io_call(self.brain._remember_answer, user_input, fingerprint,
+                                "".join(full_response), context_report)
+        finally:
+            content = "".join(full_response)
+            if content:
+                timing = timings[0].to_dict() if timings and timings[0] else None
+                metadata = {"context": context_report.to_dict(), "timing": timing}
+                await self._io_call(self.brain._finish_turn, session, content, metadata, source)
+
+    async def clear_memory(self, session: Optional[str] = None):
+        """Clear the conversation history of a session (the active one by default)."""
+        await self._io_call(self.brain.clear_memory, session)
+
+    async def aclose(self):
+        await self.llm.aclose()
+        self._io.shutdown(wait=True)
+        self.memory.close()
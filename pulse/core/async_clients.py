@@ -0,0 +1,397 @@
+"""
+Asyncio variants of the LLM clients (needs httpx).
+
+Same behaviour as OpenRouterClient and GeminiClient (payloads, fallback
+and retry rules, response parsing are inherited) but `chat` is a coroutine
+and `stream` an async generator, so one event loop can keep hundreds of
+requests in flight. Each client owns its httpx connection pools; call
+`aclose()` when done.
+"""
+
+import asyncio
+import itertools
+import math
+import time
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional
+
+from pulse.core.gemini_client import GeminiClient
+from pulse.core.http import RequestTiming
+from pulse.core.model_health import ModelHealthRegistry
+from pulse.core.openrouter_client import OpenRouterClient, _Attempt
+from pulse.core.response_cache import ResponseCache
+from pulse.core.sse import SSEEvent, SSEParser
+from pulse.exceptions import InferenceError
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+DEFAULT_MAX_CONNECTIONS = 200
+DEFAULT_MAX_KEEPALIVE = 50
+# httpcore scans its whole pool on every request state change, which gets
+# quadratic with hundreds of requests in flight; requests are spread over
+# several small pools instead of one big one.
+POOL_SHARD_SIZE = 16
+
+
+class _AsyncPhaseTimer:
+    """PhaseTimer for httpx, fed by its connection trace events."""
+
+    def __init__(self):
+        self.timing = RequestTiming()
+        self._start = time.perf_counter()
+        self._phase_start = 0.0
+
+    async def trace(self, event_name: str, info: Dict[str, Any]):
+        # connect_tcp and start_tls bracket the handshake of a new connection
+        if event_name.startswith(("connection.connect_tcp.", "connection.start_tls.")):
+            if event_name.endswith(".started"):
+                self._phase_start = time.perf_counter()
+            elif event_name.endswith(".complete"):
+                self.timing.connect_ms += (time.perf_counter() - self._phase_start) * 1000
+
+    def _elapsed(self) -> float:
+        return (time.perf_counter() - self._start) * 1000
+
+    def first_byte(self):
+        self.timing.ttfb_ms = self._elapsed()
+
+    def done(self) -> RequestTiming:
+        if not self.timing.ttfb_ms:
+            self.first_byte()
+        self.timing.total_ms = self._elapsed()
+        return self.timing
+
+
+async def _aiter_events(response: "httpx.Response") -> AsyncGenerator[SSEEvent, None]:
+    """SSE events of a streamed httpx response, parsed as the bytes arrive."""
+    parser = SSEParser()
+    async for chunk in response.aiter_bytes():
+        for event in parser.feed(chunk):
+            yield event
+    for event in parser.close():
+        yield event
+
+
+class _PoolShards:
+    """Round-robin set of httpx.AsyncClient pools sharing the connection limits."""
+
+    def __init__(self, max_connections: int, max_keepalive: int, timeout: float):
+        if not HTTPX_AVAILABLE:
+            raise ImportError("httpx is required for the async clients. Run: pip install httpx")
+        count = max(1, math.ceil(max_connections / POOL_SHARD_SIZE))
+        limits = httpx.Limits(
+            max_connections=math.ceil(max_connections / count),
+            max_keepalive_connections=math.ceil(max_keepalive / count)
+        )
+        self.clients = [httpx.AsyncClient(limits=limits, timeout=timeout) for _ in range(count)]
+        self._cycle = itertools.cycle(self.clients)
+
+    def next(self) -> "httpx.AsyncClient":
+        return next(self._cycle)
+
+    async def aclose(self):
+        await asyncio.gather(*(client.aclose() for client in self.clients))
+
+
+class AsyncOpenRouterClient(OpenRouterClient):
+    """
+    OpenRouterClient with `await chat(...)` and `async for chunk in stream(...)`.
+
+    Requests run concurrently, so `last_timing` is only indicative: take a
+    request's own timing from chat()'s result["timing"], or from stream()'s
+    `on_timing` callback.
+    """
+
+    def __init__(self, api_key: str, default_model: str, fallback_models: List[str] = None,
+                 base_url: Optional[str] = None, max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 max_keepalive: int = DEFAULT_MAX_KEEPALIVE, timeout: float = 60,
+                 hedge_delay_ms: float = 0.0, hedge_ttfb_ms: float = 0.0,
+                 health: Optional[ModelHealthRegistry] = None,
+                 response_cache: Optional[ResponseCache] = None):
+        super().__init__(api_key, default_model, fallback_models, base_url=base_url, timeout=timeout,
+                         hedge_delay_ms=hedge_delay_ms, hedge_ttfb_ms=hedge_ttfb_ms, health=health,
+                         response_cache=response_cache)
+        self.pools = _PoolShards(max_connections, max_keepalive, timeout)
+
+    async def prewarm(self, connections: int = 1) -> int:
+        """Open pooled connections to the API host before the first request."""
+        async def warm() -> bool:
+            try:
+                await self.pools.next().head(self.base_url)
+                return True
+            except httpx.HTTPError:
+                return False
+        results = await asyncio.gather(*(warm() for _ in range(max(1, connections))))
+        return sum(results)
+
+    async def chat(self, messages: List[Dict[str, str]], model: str = None, **kwargs) -> Dict[str, Any]:
+        """
+        Send a chat completion request, falling back like OpenRouterClient.chat.
+        """
+        target_model = model or self.default_model
+        cache_key = self._cache_key(target_model, messages, kwargs)
+        cached = self._cache_lookup(cache_key)
+        if cached is not None:
+            return cached
+
+        models_to_try = self._models_to_try(target_model)
+        if self._hedging and len(models_to_try) > 1:
+            result = await self._hedged_chat(models_to_try, messages, **kwargs)
+            if cache_key:
+                self.response_cache.put(cache_key, result)
+            return result
+
+        last_error = None
+        for m in models_to_try:
+            try:
+                if m != models_to_try[0]:
+                    print(f"⚠️ Primary model rate-limited/failed. Retrying with: {m}...")
+                attempt = _Attempt(m)
+                result = await self._make_request(m, messages, attempt=attempt, **kwargs)
+                self._record(m, timing=attempt.timing)
+                self.last_timing = attempt.timing
+                if cache_key:
+                    self.response_cache.put(cache_key, result)
+                return result
+            except InferenceError as e:
+                last_error = e
+                self._record(m, error=e)
+                print(f"❌ Error with model {m}: {e}")
+                if not self._should_retry(e):
+                    raise
+        raise InferenceError(f"All models failed. Last error: {last_error}")
+
+    async def _hedged_chat(self, models: List[str], messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
+        """OpenRouterClient._hedged_chat on tasks; losers are cancelled outright."""
+        waiting = list(models)
+        tasks: Dict[asyncio.Task, _Attempt] = {}
+        last_error = None
+
+        def launch() -> _Attempt:
+            attempt = _Attempt(waiting.pop(0))
+            task = asyncio.ensure_future(self._make_request(attempt.model, messages, attempt=attempt, **kwargs))
+            tasks[task] = attempt
+            return attempt
+
+        newest = launch()
+        try:
+            while tasks:
+                wait = self._hedge_wait(newest) if waiting else None
+                if wait is not None and wait <= 0:
+                    print(f"⏱️ {newest.model} is slow. Racing it with: {waiting[0]}...")
+                    newest = launch()
+                    continue
+                done, _ = await asyncio.wait(tasks, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    attempt = tasks.pop(task)
+                    try:
+                        result = task.result()
+                    except InferenceError as e:
+                        last_error = e
+                        self._record(attempt.model, error=e)
+                        print(f"❌ Error with model {attempt.model}: {e}")
+                        if not self._should_retry(e):
+                            raise
+                        continue
+                    self._record(attempt.model, timing=attempt.timing)
+                    self.last_timing = attempt.timing
+                    return result
+                if waiting and not tasks:
+                    print(f"⚠️ Primary model rate-limited/failed. Retrying with: {waiting[0]}...")
+                    newest = launch()
+        finally:
+            for task, attempt in tasks.items():
+                task.cancel()
+                self._abandon(attempt)
+
+        raise InferenceError(f"All models failed. Last error: {last_error}")
+
+    async def _make_request(self, model: str, messages: List[Dict[str, str]],
+                            attempt: Optional[_Attempt] = None, **kwargs) -> Dict[str, Any]:
+        self._begin(model, attempt)
+        payload = self._build_payload(model, messages, **kwargs)
+        timer = _AsyncPhaseTimer()
+        try:
+            async with self.pools.next().stream(
+                "POST", f"{self.base_url}/chat/completions",
+                headers=self.headers, json=payload, extensions={"trace": timer.trace}
+            ) as response:
+                timer.first_byte()
+                if attempt is not None:
+                    attempt.first_byte.set()
+                body = await response.aread()
+        except httpx.TimeoutException:
+            raise InferenceError(f"Request timed out for model {model}")
+        except httpx.HTTPError as e:
+            raise InferenceError(f"Network error: {str(e)}")
+        timing = timer.done()
+        if attempt is None:
+            self.last_timing = timing
+        else:
+            attempt.timing = timing
+
+        text = body.decode("utf-8", errors="replace")
+        if response.status_code != 200:
+            raise self._api_error(response.status_code, text, response.headers)
+        try:
+            data = response.json()
+        except ValueError:
+            raise InferenceError("Invalid API response: not JSON")
+        result = self._parse_completion(data, model)
+        result["timing"] = timing.to_dict()
+        return result
+
+    async def stream(self, messages: List[Dict[str, str]], model: str = None,
+                     on_timing: Optional[Callable[[Optional[RequestTiming]], None]] = None,
+                     **kwargs) -> AsyncGenerator[str, None]:
+        """
+        Stream chat completion chunks, falling back like OpenRouterClient.stream.
+
+        `on_timing` is called with this stream's timing once it is read to
+        the end (None when it was served from the response cache).
+        """
+        target_model = model or self.default_model
+        cache_key = self._cache_key(target_model, messages, kwargs)
+        cached = self._cache_lookup(cache_key)
+        if cached is not None:
+            for chunk in self.response_cache.chunks(cached):
+                yield chunk
+            if on_timing is not None:
+                on_timing(None)
+            return
+
+        models_to_try = self._models_to_try(target_model)
+        last_error = None
+        for m in models_to_try:
+            try:
+                if m != models_to_try[0]:
+                    print(f"⚠️ Streaming fallback: switching to {m}...")
+                chunks = []
+                attempt = _Attempt(m)
+                async for chunk in self._make_stream_request(m, messages, attempt=attempt, **kwargs):
+                    chunks.append(chunk)
+                    yield chunk
+                self._record(m, timing=attempt.timing)
+                if on_timing is not None:
+                    on_timing(attempt.timing)
+                if cache_key:
+                    self.response_cache.put(cache_key, {"content": "".join(chunks), "model": m}, chunks)
+                return
+            except GeneratorExit:
+                self._abandon(attempt)  # Closed by the consumer: no outcome to report
+                raise
+            except InferenceError as e:
+                last_error = e
+                self._record(m, error=e)
+                if not self._should_retry(e):
+                    raise
+        raise InferenceError(f"All streaming models failed. Last error: {last_error}")
+
+    async def _make_stream_request(self, model: str, messages: List[Dict[str, str]],
+                                   attempt: Optional[_Attempt] = None, **kwargs) -> AsyncGenerator[str, None]:
+        self._begin(model, attempt)
+        payload = self._build_payload(model, messages, stream=True, **kwargs)
+        timer = _AsyncPhaseTimer()
+        try:
+            async with self.pools.next().stream(
+                "POST", f"{self.base_url}/chat/completions",
+                headers=self.headers, json=payload, extensions={"trace": timer.trace}
+            ) as response:
+                timer.first_byte()
+                if response.status_code != 200:
+                    body = await response.aread()
+                    raise self._api_error(response.status_code, body.decode("utf-8", errors="replace"), response.headers)
+
+                done = False
+                async for event in _aiter_events(response):
+                    # Keep reading past [DONE] so the connection goes back to the pool
+                    if not done:
+                        content, done = self._parse_stream_data(event.data)
+                        if content:
+                            yield content
+        except httpx.HTTPError as e:
+            raise InferenceError(f"Stream network error: {str(e)}")
+        finally:
+            self.last_timing = timer.done()
+            if attempt is not None:
+                attempt.timing = self.last_timing
+
+    async def aclose(self):
+        await self.pools.aclose()
+
+
+class AsyncGeminiClient(GeminiClient):
+    """GeminiClient with `await chat(...)` and `async for chunk in stream(...)`."""
+
+    def __init__(self, api_key: str, model: str = "gemini-1.5-flash", base_url: Optional[str] = None,
+                 max_connections: int = DEFAULT_MAX_CONNECTIONS, max_keepalive: int = DEFAULT_MAX_KEEPALIVE):
+        super().__init__(api_key, model, base_url=base_url)
+        self.pools = _PoolShards(max_connections, max_keepalive, 60)
+
+    async def chat(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
+        """
+        Send a chat message to Gemini, retrying 429/503 with backoff.
+        """
+        model_name = self.model.replace("models/", "")
+        url = f"{self.base_url}/models/{model_name}:generateContent"
+        payload = self._build_payload(messages, **kwargs)
+
+        max_retries = 3
+        backoff = 2
+        for attempt in range(max_retries):
+            timer = _AsyncPhaseTimer()
+            try:
+                response = await self.pools.next().post(
+                    url, headers=self._headers(), json=payload, timeout=30,
+                    extensions={"trace": timer.trace}
+                )
+            except httpx.HTTPError as e:
+                if attempt == max_retries - 1:
+                    raise InferenceError(f"Network error after {max_retries} attempts: {str(e)}")
+                await asyncio.sleep(backoff)
+                continue
+            self.last_timing = timer.done()
+
+            if response.status_code == 200:
+                result = self._parse_response(response.json())
+                result["timing"] = self.last_timing.to_dict()
+                return result
+            if response.status_code in [429, 503] and attempt < max_retries - 1:
+                print(f"Gemini API rate limit (429). Retrying in {backoff}s...")
+                await asyncio.sleep(backoff)
+                backoff *= 2
+                continue
+            raise InferenceError(f"Gemini API Error {response.status_code}: {response.text}")
+        raise InferenceError("No response received from Gemini API.")
+
+    async def stream(self, messages: List[Dict[str, str]], **kwargs) -> AsyncGenerator[str, None]:
+        """
+        Stream chat response.
+        """
+        model_name = self.model.replace("models/", "")
+        url = f"{self.base_url}/models/{model_name}:streamGenerateContent?alt=sse"
+        payload = self._build_payload(messages, **kwargs)
+
+        timer = _AsyncPhaseTimer()
+        try:
+            async with self.pools.next().stream(
+                "POST", url, headers=self._headers(), json=payload, extensions={"trace": timer.trace}
+            ) as response:
+                timer.first_byte()
+                if response.status_code != 200:
+                    body = await response.aread()
+                    raise InferenceError(f"Stream Error {response.status_code}: {body.decode('utf-8', 'replace')}")
+                async for event in _aiter_events(response):
+                    text = self._parse_stream_data(event.data)
+                    if text:
+                        yield text
+        except httpx.HTTPError as e:
+            raise InferenceError(f"Stream error: {str(e)}")
+        finally:
+            self.last_timing = timer.done()
+
+    async def aclose(self):
+        await self.pools.aclose()
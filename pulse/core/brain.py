@@ -1,19 +1,34 @@
 """
 The Brain: Central Orchestrator for Pulse Ecosystem.
-Integrates Memory, ScaleDown, and OpenRouter.
+Integrates Memory, context compression (ScaleDown or local), and OpenRouter.
 """
 
+import hashlib
 import time
-from typing import List, Dict, Generator, Union
-
-from scaledown import ScaleDownCompressor
-from scaledown.exceptions import APIError as ScaleDownAPIError
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from threading import Lock, Thread
+from typing import List, Dict, Generator, Optional, Tuple, Union
 
 from pulse.config import PulseConfig
-from pulse.core.memory import Memory
+from pulse.core.cache import LRUCache, SQLiteCache, TieredCache
+from pulse.core.compression import (
+    SCALEDOWN_AVAILABLE, CachedCompressor, Compressor, RollingSummarizer, ScaleDownBackend
+)
+from pulse.core.context import ContextBuilder, ContextReport, ContextSection
+from pulse.core.embeddings import HashingEmbedder, NUMPY_AVAILABLE
+from pulse.core.events import EventBus, TurnEvent
+from pulse.core.local_compressor import LocalCompressor
+from pulse.core.memory import Memory, Message
+from pulse.core.response_cache import ResponseCache, split_chunks
+from pulse.core.semantic_cache import SemanticCache, SemanticHit
+from pulse.core.model_health import ModelHealthRegistry
+from pulse.core.semantic_memory import SemanticMemory
+from pulse.core.tokens import MESSAGE_OVERHEAD, context_limit
 from pulse.core.openrouter_client import OpenRouterClient
 from pulse.exceptions import ConfigurationError, ContextOptimizationError, InferenceError
 
+DEFAULT_SYSTEM_PROMPT = "You are Pulse, a helpful, intelligent, and efficient AI assistant."
+
 
 class Brain:
     """
@@ -21,155 +36,521 @@ class Brain:
     
     Responsibility:
     1. Manage conversation state via Memory.
-    2. Optimize context usage via ScaleDown.
+    2. Optimize context usage via ScaleDown or the local compressor.
     3. Generate responses via OpenRouter.
+
+    Conversations are scoped to a session: `session` is the active one, and
+    every public method also accepts an explicit session to act on.
     """
     
-    def __init__(self, config: PulseConfig):
+    def __init__(self, config: PulseConfig, session: Optional[str] = None, llm: Optional[OpenRouterClient] = None):
         self.config = config
+        self.session = session or config.session_id
         
         # Initialize components
-        self.memory = Memory(config.db_path, config.encryption_key)
-        
-        self.llm = OpenRouterClient(
-            api_key=config.openrouter_api_key,
-            default_model=config.default_model,
-            fallback_models=config.fallback_models
+        self.memory = Memory(
+            config.db_path,
+            config.encryption_key,
+            write_behind=config.memory_write_behind,
+            flush_interval=config.memory_flush_interval,
+            max_batch=config.memory_max_batch,
+            session=self.session
         )
+        self.events = EventBus()
+
+        # Semantic recall of older turns (needs numpy)
+        self.semantic_memory = None
+        if config.enable_semantic_memory:
+            if NUMPY_AVAILABLE:
+                self.semantic_memory = SemanticMemory(
+                    self.memory, HashingEmbedder(config.embedding_dim), max_rows=config.semantic_max_rows
+                )
+            else:
+                print("Warning: numpy not installed, semantic memory disabled.")
+
+        # Answers to near-duplicate standalone questions (needs numpy)
+        self.semantic_cache = None
+        if config.enable_semantic_cache and NUMPY_AVAILABLE:
+            self.semantic_cache = SemanticCache(
+                HashingEmbedder(config.embedding_dim),
+                capacity=config.semantic_cache_size,
+                threshold=config.semantic_cache_threshold,
+                ttl=config.semantic_cache_ttl
+            )
+        
+        self.response_cache = None
+        if config.response_cache_size:
+            self.response_cache = ResponseCache(
+                self._make_cache("responses", config.response_cache_size, config.response_cache_ttl),
+                any_temperature=config.response_cache_any_temperature
+            )
+
+        # An injected client (e.g. AsyncBrain's) is warmed up by its owner
+        self.llm = llm
+        if self.llm is None:
+            self.llm = OpenRouterClient(
+                api_key=config.openrouter_api_key,
+                default_model=config.default_model,
+                fallback_models=config.fallback_models,
+                base_url=config.openrouter_base_url,
+                pool_connections=config.http_pool_connections,
+                pool_maxsize=config.http_pool_maxsize,
+                hedge_delay_ms=config.hedge_delay_ms,
+                hedge_ttfb_ms=config.hedge_ttfb_ms,
+                health=self._make_health(config),
+                response_cache=self.response_cache
+            )
+            if config.http_prewarm:
+                # Have the TCP+TLS handshake done before the first turn needs it
+                Thread(target=self.llm.prewarm, name="pulse-prewarm", daemon=True).start()
         
-        # Initialize ScaleDown if API key is present
-        self.compressor = None
-        if config.scaledown_api_key:
-            import scaledown as sd
-            sd.set_api_key(config.scaledown_api_key)
-            self.compressor = ScaleDownCompressor(
-                target_model="gpt-4o",  # ScaleDown target model for compression
-                rate=config.compression_rate
+        self.compressor = self._make_compressor()
+        if self.compressor and config.compression_cache_size:
+            self.compressor = CachedCompressor(
+                self.compressor,
+                self._make_cache("compression", config.compression_cache_size, config.compression_cache_ttl),
+                rate=config.compression_rate,
+                target_model="gpt-4o"
             )
             
+        self.summarizer = None
+        if self.compressor:
+            self.summarizer = RollingSummarizer(self.compressor, self.memory, config.summary_rebase_every)
+
+        # Background compression of the history that ages out next turn
+        self._precompute_pool = None
+        self._precompute: Dict[str, Future] = {}
+        self._precompute_lock = Lock()
+        if self.summarizer and config.enable_precompute:
+            self._precompute_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pulse-precompute")
+            
         # Skill Registry
         from pulse.skills.system_skills import TimeSkill, SystemInfoSkill
         self.skills = [TimeSkill(), SystemInfoSkill()]
 
     
-    def think(self, user_input: str, system_prompt: str = None) -> str:
+    def think(self, user_input: str, system_prompt: str = None, session: Optional[str] = None,
+              source: Optional[str] = None) -> str:
         """
         Process user input and return a response (synchronous).
+
+        `source` tags the turn's events (e.g. "voice"), so subscribers can
+        tell their own turns from others.
         """
-        # 1. Add user message to memory
-        self.memory.add("user", user_input)
-        
-        # 2. Prepare context
-        context_messages = self._prepare_context(system_prompt)
+        session = session or self.session
+
+        # 1. Answer near-duplicates of earlier questions from the semantic cache
+        fingerprint, hit = self._semantic_check(user_input, system_prompt, session)
+        if hit:
+            return self._serve_cached(hit, user_input, session, source)
+
+        # 2. Store the user message and prepare context
+        context_messages, context_report = self._start_turn(user_input, system_prompt, session, source)
         
         # 3. Check for skills
-        for skill in self.skills:
-            for cmd in skill.commands:
-                if cmd.lower() in user_input.lower():
-                    print(f"Executing Skill: {skill.name}")
-                    result = skill.execute({"user_input": user_input})
-                    self.memory.add("assistant", result, metadata={"skill": skill.name})
-                    return result
+        skill = self._find_skill(user_input)
+        if skill:
+            return self._run_skill(skill, user_input, session, source)
         
         # 4. Call LLM
         start_time = time.time()
         # Enable reasoning for models that support it
-        result = self.llm.chat(context_messages, reasoning={"enabled": True})
+        result = self.llm.chat(context_messages, **self._llm_params(reasoning={"enabled": True}))
         latency = (time.time() - start_time) * 1000
         
-        response_content = result["content"]
-        
-        # 4. Save response to memory
-        metadata = {
-            "model": result.get("model"),
-            "latency_ms": latency,
-            "usage": result.get("usage"),
-            "reasoning_details": result.get("reasoning_details")
-        }
-        self.memory.add("assistant", response_content, metadata)
+        # 5. Save response to memory
+        metadata = self._response_metadata(result, latency, context_report)
+        self._finish_turn(session, result["content"], metadata, source, model=result.get("model"))
+        self._remember_answer(user_input, fingerprint, result["content"], context_report)
         
-        return response_content
+        return result["content"]
 
-    def stream_thought(self, user_input: str, system_prompt: str = None) -> Generator[str, None, None]:
+    def stream_thought(self, user_input: str, system_prompt: str = None, session: Optional[str] = None,
+                       source: Optional[str] = None) -> Generator[str, None, None]:
         """
-        Stream the thought process (response).
+        Stream the thought process (response). `source` is as for think().
         """
-        self.memory.add("user", user_input)
-        context_messages = self._prepare_context(system_prompt)
+        session = session or self.session
+        fingerprint, hit = self._semantic_check(user_input, system_prompt, session)
+        if hit:
+            self._add_user_message(user_input, session, source)
+            try:
+                for chunk in split_chunks(hit.response):
+                    self.events.publish(TurnEvent.RESPONSE_CHUNK, chunk, session=session, source=source)
+                    yield chunk
+            finally:
+                self._finish_turn(session, hit.response, {"semantic_cache": hit.to_dict()}, source,
+                                  semantic_cache=True)
+            return
+
+        skill = self._find_skill(user_input)
+        if skill:
+            self._add_user_message(user_input, session, source)
+            result = self._execute_skill(skill, user_input)
+            # Chunk before the final RESPONSE, as for LLM turns
+            try:
+                self.events.publish(TurnEvent.RESPONSE_CHUNK, result, session=session, source=source)
+                yield result
+            finally:
+                self._finish_turn(session, result, {"skill": skill.name}, source, skill=skill.name)
+            return
+
+        context_messages, context_report = self._start_turn(user_input, system_prompt, session, source)
         
         full_response = []
+        timings = []
         
         try:
-            for chunk in self.llm.stream(context_messages):
+            for chunk in self.llm.stream(context_messages, on_timing=timings.append, **self._llm_params()):
                 full_response.append(chunk)
+                self.events.publish(TurnEvent.RESPONSE_CHUNK, chunk, session=session, source=source)
                 yield chunk
+            self._remember_answer(user_input, fingerprint, "".join(full_response), context_report)
         finally:
             # Save full response even if interrupted
             content = "".join(full_response)
             if content:
-                self.memory.add("assistant", content)
+                timing = timings[0].to_dict() if timings and timings[0] else None
+                metadata = {"context": context_report.to_dict(), "timing": timing}
+                self._finish_turn(session, content, metadata, source)
+
+    # --- Turn steps (shared with AsyncBrain, which runs them off the event loop) ---
+
+    def _start_turn(self, user_input: str, system_prompt: Optional[str], session: str,
+                    source: Optional[str] = None) -> Tuple[List[Dict[str, str]], ContextReport]:
+        """Store and announce the user message, then build the context for it."""
+        self._add_user_message(user_input, session, source)
+        return self._build_context(system_prompt, session)
 
-    def _prepare_context(self, system_prompt: str = None) -> List[Dict[str, str]]:
+    def _add_user_message(self, user_input: str, session: str, source: Optional[str] = None):
+        self.memory.add("user", user_input, session=session)
+        self.events.publish(TurnEvent.USER_MESSAGE, user_input, session=session, source=source)
+
+    def _context_fingerprint(self, system_prompt: Optional[str], session: str) -> str:
+        """
+        What a cached answer must have been given under: model, system
+        prompt and recent turns. The last turn is always included, so a
+        short follow-up is never answered from another conversation.
+        """
+        digest = hashlib.sha256()
+        parts = [self.llm.default_model, system_prompt or DEFAULT_SYSTEM_PROMPT]
+        turns = max(1, self.config.semantic_cache_context_turns)
+        parts.extend(f"{m.role}: {m.content}" for m in self.memory.get_history(limit=turns, session=session))
+        for part in parts:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def _semantic_check(self, user_input: str, system_prompt: Optional[str],
+                        session: str) -> Tuple[Optional[str], Optional[SemanticHit]]:
+        """
+        The context fingerprint of a new turn and the semantic cache hit for
+        it, if any. Skill commands are left to the skills.
+        """
+        if self.semantic_cache is None or self._find_skill(user_input):
+            return None, None
+        fingerprint = self._context_fingerprint(system_prompt, session)
+        return fingerprint, self.semantic_cache.lookup(user_input, fingerprint)
+
+    def _serve_cached(self, hit: SemanticHit, user_input: str, session: str, source: Optional[str] = None) -> str:
+        self._add_user_message(user_input, session, source)
+        self._finish_turn(session, hit.response, {"semantic_cache": hit.to_dict()}, source, semantic_cache=True)
+        return hit.response
+
+    def _remember_answer(self, user_input: str, fingerprint: Optional[str], content: str,
+                         context_report: ContextReport):
+        """Offer a finished LLM exchange to the semantic cache."""
+        if fingerprint is None:
+            return
+        # An answer drawing on recalled turns depends on this user's history
+        recalled = any(s["name"] == "recalled" and s["included"] for s in context_report.sections)
+        self.semantic_cache.store(user_input, content, fingerprint, reusable=not recalled)
+
+    def _find_skill(self, user_input: str):
+        """The first skill with a command mentioned in `user_input`, if any."""
+        for skill in self.skills:
+            for cmd in skill.commands:
+                if cmd.lower() in user_input.lower():
+                    return skill
+        return None
+
+    def _execute_skill(self, skill, user_input: str) -> str:
+        print(f"Executing Skill: {skill.name}")
+        return skill.execute({"user_input": user_input})
+
+    def _run_skill(self, skill, user_input: str, session: str, source: Optional[str] = None) -> str:
+        result = self._execute_skill(skill, user_input)
+        self._finish_turn(session, result, {"skill": skill.name}, source, skill=skill.name)
+        return result
+
+    def _llm_params(self, **params) -> Dict:
+        """Request parameters for the LLM; temperature 0 also makes turns response-cacheable."""
+        if self.config.llm_temperature is not None:
+            params["temperature"] = self.config.llm_temperature
+        return params
+
+    @staticmethod
+    def _response_metadata(result: Dict, latency: float, context_report: ContextReport) -> Dict:
+        return {
+            "model": result.get("model"),
+            "latency_ms": latency,
+            "timing": result.get("timing"),
+            "cached": result.get("cached", False),
+            "usage": result.get("usage"),
+            "reasoning_details": result.get("reasoning_details"),
+            "context": context_report.to_dict()
+        }
+
+    def _finish_turn(self, session: str, content: str, metadata: Dict, source: Optional[str] = None,
+                     **event_metadata):
+        """Store and announce the assistant response, then start precomputing the next turn."""
+        self.memory.add("assistant", content, metadata, session=session)
+        self.events.publish(TurnEvent.RESPONSE, content, session=session, source=source, **event_metadata)
+        self._schedule_precompute(session)
+
+    def _prepare_context(self, system_prompt: str = None, session: Optional[str] = None) -> List[Dict[str, str]]:
         """
         Prepare and optimize context for the LLM.
         """
-        # Get recent history
-        # We fetch enough messages to form a context, usually last 10-20 exchanges
-        raw_history = self.memory.get_history(limit=20)
-        
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        else:
-            messages.append({"role": "system", "content": "You are Pulse, a helpful, intelligent, and efficient AI assistant."})
+        messages, _ = self._build_context(system_prompt, session)
+        return messages
+
+    def _context_budget(self) -> int:
+        """Prompt token budget: configured, or the model's window minus room for the reply."""
+        if self.config.context_token_budget:
+            return self.config.context_token_budget
+        limit = context_limit(self.llm.default_model)
+        return max(limit // 2, limit - self.config.response_token_reserve)
+
+    def _build_context(self, system_prompt: str = None,
+                       session: Optional[str] = None) -> Tuple[List[Dict[str, str]], ContextReport]:
+        """
+        Assemble the context window within the token budget.
+
+        Returns the messages and a report of the packing decisions.
+        Budget goes to the system prompt first, then recent turns, then
+        the older (compressed) history, then recalled turns.
+        """
+        # Get recent history of the active session only
+        session = session or self.session
+        raw_history = self.memory.get_history(limit=self.config.context_history_limit, session=session)
+
+        builder = ContextBuilder(self._context_budget(), model=self.llm.default_model)
+        builder.add(ContextSection(
+            "system",
+            [{"role": "system", "content": system_prompt or DEFAULT_SYSTEM_PROMPT}],
+            priority=0,
+            required=True
+        ))
+
+        # Pull in relevant turns that are older than the history window
+        recalled = self._recall(raw_history, session)
+        if recalled:
+            builder.add(ContextSection(
+                "recalled",
+                [{
+                    "role": "system",
+                    "content": "Relevant earlier conversation:\n" + "\n".join(
+                        f"{m.role.upper()}: {m.content}" for m in recalled
+                    )
+                }],
+                priority=3,
+                truncatable=True
+            ))
+
+        recent_count = self.config.context_recent_messages
         
-        # If optimization is disabled or we don't have enough history, return as is
-        if not self.config.enable_context_optimization or len(raw_history) < 4 or not self.compressor:
+        # If optimization is disabled or we don't have enough history, send it as is
+        if not self.config.enable_context_optimization or len(raw_history) <= recent_count or not self.compressor:
+            history = []
             for msg in raw_history:
                 m_dict = {"role": msg.role, "content": msg.content}
                 if msg.metadata and "reasoning_details" in msg.metadata:
                     m_dict["reasoning_details"] = msg.metadata["reasoning_details"]
-                messages.append(m_dict)
-            return messages
+                history.append(m_dict)
+            builder.add(ContextSection("history", history, priority=1, trim_oldest=True, min_keep=1))
+            return builder.build()
         
         # --- Context Optimization Logic ---
-        # Strategy: Keep last 2 turns (4 messages) raw, compress the older history
-        
-        recent_turns = raw_history[-4:] 
-        older_turns = raw_history[:-4]
+        # Strategy: Keep the last turns (4 messages by default) raw, compress the older history
         
-        # Convert older turns to a single text block for compression
-        older_context_str = "\n".join([f"{m.role.upper()}: {m.content}" for m in older_turns])
+        recent_turns = raw_history[-recent_count:]
+        older_turns = raw_history[:-recent_count]
         
         # Create a "pseudo-prompt" for the compressor to know what's relevant to the recent conversation
         # Using the last user message as the anchor
         current_query = raw_history[-1].content
         
-        try:
-            # Compress older context
-            compressed = self.compressor.compress(
-                context=older_context_str,
-                prompt=current_query
-            )
-            
+        if not self._await_precompute(session):
+            # Precompute still running: don't compress on the critical path,
+            # send the last stored summary plus the raw turns it doesn't cover
+            summary, unsummarized = self.summarizer.pending(session, older_turns)
+        else:
+            try:
+                # Fold the turns that aged out since last time into the rolling summary
+                # (a no-op when the precompute already did it)
+                summary = self.summarizer.update(session, older_turns, current_query)
+                unsummarized = []
+            except ContextOptimizationError as e:
+                # Fall back to the last stored summary plus the raw turns it doesn't cover
+                print(f"Warning: Context optimization failed ({e}), using raw history.")
+                summary, unsummarized = self.summarizer.pending(session, older_turns)
+
+        if summary:
             # Add compressed summary as a system note or distinct message
-            messages.append({
-                "role": "system", 
-                "content": f"Prior Conversation Summary (Optimized): {compressed.content}"
-            })
-            
-        except ScaleDownAPIError as e:
-            # Fallback to raw if compression fails
-            print(f"Warning: Context optimization failed ({e}), using raw history.")
-            for msg in older_turns:
-                messages.append({"role": msg.role, "content": msg.content})
+            builder.add(ContextSection(
+                "summary",
+                [{
+                    "role": "system",
+                    "content": f"Prior Conversation Summary (Optimized): {summary.content}"
+                }],
+                priority=2,
+                truncatable=True
+            ))
+        if unsummarized:
+            builder.add(ContextSection(
+                "older",
+                [{"role": msg.role, "content": msg.content} for msg in unsummarized],
+                priority=2,
+                tokens=[msg.tokens + MESSAGE_OVERHEAD for msg in unsummarized],
+                trim_oldest=True
+            ))
         
-        # Append recent raw messages
-        for msg in recent_turns:
-            messages.append({"role": msg.role, "content": msg.content})
+        # Recent raw messages; the latest user message is always kept
+        builder.add(ContextSection(
+            "recent",
+            [{"role": msg.role, "content": msg.content} for msg in recent_turns],
+            priority=1,
+            tokens=[msg.tokens + MESSAGE_OVERHEAD for msg in recent_turns],
+            trim_oldest=True,
+            min_keep=1
+        ))
             
-        return messages
+        return builder.build()
+
+    def _schedule_precompute(self, session: str):
+        """
+        Start folding the turns that will age out on the next turn into the
+        rolling summary, in the background.
+
+        Called once an assistant turn is persisted. The next user message
+        will push the window forward by one, so the next turn's older turns
+        are known now; the latest user message stands in for the query.
+        """
+        if not self._precompute_pool or not self.config.enable_context_optimization:
+            return
+        with self._precompute_lock:
+            latest = self._precompute.get(session)
+            if latest is not None and not latest.running() and not latest.done():
+                return  # A queued job reads the history when it starts anyway
+            self._precompute[session] = self._precompute_pool.submit(self._precompute_summary, session)
+
+    def _precompute_summary(self, session: str):
+        recent_count = self.config.context_recent_messages
+        # The next window is these turns plus the upcoming user message
+        history = self.memory.get_history(limit=self.config.context_history_limit - 1, session=session)
+        older_turns = history[:-(recent_count - 1)] if recent_count > 1 else history
+        if len(history) + 1 <= recent_count or not older_turns:
+            return
+        anchor = next((m.content for m in reversed(history) if m.role == "user"), history[-1].content)
+        try:
+            self.summarizer.update(session, older_turns, anchor)
+        except Exception as e:
+            print(f"Warning: Background context compression failed ({e}).")
+
+    def _await_precompute(self, session: str) -> bool:
+        """
+        Wait up to `precompute_deadline_ms` for the session's background
+        compression. Returns False if it is still running.
+        """
+        with self._precompute_lock:
+            future = self._precompute.get(session)
+        if future is None:
+            return True
+        try:
+            future.result(timeout=self.config.precompute_deadline_ms / 1000.0)
+        except FutureTimeoutError:
+            return False
+        with self._precompute_lock:
+            if self._precompute.get(session) is future:
+                del self._precompute[session]
+        return True
+
+    @staticmethod
+    def _make_health(config: PulseConfig) -> Optional[ModelHealthRegistry]:
+        """The model health registry, kept next to the database."""
+        if not config.model_health:
+            return None
+        return ModelHealthRegistry(config.db_path + ".health.json")
+
+    def _make_compressor(self) -> Optional[Compressor]:
+        """
+        Build the configured compression backend.
+
+        "auto" uses ScaleDown when an API key is set and the package is
+        installed, otherwise sends the history uncompressed; the (lossy)
+        local extractive compressor is opt-in.
+        """
+        backend = self.config.compressor_backend
+        if backend == "none":
+            return None
+        if backend not in ("auto", "scaledown", "local"):
+            raise ConfigurationError(f"Unknown compressor backend: {backend}")
+
+        if backend == "auto":
+            if not self.config.scaledown_api_key:
+                return None
+            if not SCALEDOWN_AVAILABLE:
+                print("Warning: scaledown not installed, context compression disabled.")
+                return None
+        if backend != "local":
+            if not self.config.scaledown_api_key:
+                raise ConfigurationError("SCALEDOWN_API_KEY is required for the scaledown compressor")
+            return ScaleDownBackend(
+                self.config.scaledown_api_key,
+                rate=self.config.compression_rate,
+                target_model="gpt-4o"  # ScaleDown target model for compression
+            )
+        if not NUMPY_AVAILABLE:
+            print("Warning: numpy not installed, local context compression disabled.")
+            return None
+        return LocalCompressor(rate=self.config.compression_rate)
+
+    def _make_cache(self, table: str, size: int, ttl: float) -> TieredCache:
+        """In-memory LRU cache, backed by the shared cache database if enabled."""
+        persistent = None
+        if self.config.persistent_cache:
+            persistent = SQLiteCache(
+                self.config.db_path + ".cache", table, ttl=ttl, cipher=self.memory.cipher
+            )
+        return TieredCache(LRUCache(maxsize=size, ttl=ttl), persistent)
+
+    def _recall(self, raw_history: List[Message], session: str) -> List[Message]:
+        """Semantically recall older turns relevant to the latest message."""
+        if not self.semantic_memory or not raw_history:
+            return []
+        return self.semantic_memory.recall(
+            raw_history[-1].content,
+            k=self.config.semantic_top_k,
+            session=session,
+            before_id=raw_history[0].id,
+            min_score=self.config.semantic_min_score
+        )
 
-    def clear_memory(self):
-        """Clear conversation history."""
-        self.memory.clear()
+    def clear_memory(self, session: Optional[str] = None):
+        """Clear the conversation history of a session (the active one by default)."""
+        session = session or self.session
+        with self._precompute_lock:
+            future = self._precompute.pop(session, None)
+        if future is not None:
+            # Don't let a late summary resurrect the dropped history
+            future.result()
+        self.memory.drop_session(session)
+        # Cached answers and summaries may echo the forgotten conversation,
+        # and the persistent tiers keep them in <db>.cache
+        if self.semantic_cache:
+            self.semantic_cache.clear()
+        if self.response_cache:
+            self.response_cache.cache.clear()
+        if isinstance(self.compressor, CachedCompressor):
+            self.compressor.cache.clear()
@@ -0,0 +1,193 @@
+"""
+Generic caching primitives: an in-memory LRU with TTL, an optional
+SQLite-backed persistent tier, and a two-level cache combining them.
+
+Keys and values are strings; callers serialise whatever they store.
+"""
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from pulse.exceptions import StorageError
+
+
+class LRUCache:
+    """Thread-safe LRU cache with per-entry time-to-live."""
+
+    def __init__(self, maxsize: int = 256, ttl: Optional[float] = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires and expires < time.time():
+                del self._data[key]
+                self.expirations += 1
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else ttl
+        expires = time.time() + ttl if ttl else 0.0
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteCache:
+    """
+    Persistent cache tier in its own SQLite table.
+
+    Values can be encrypted at rest by passing a Fernet-compatible `cipher`
+    (e.g. Memory.cipher), since cached values often contain conversation
+    text.
+    """
+
+    def __init__(self, db_path: str, table: str, ttl: Optional[float] = 86400,
+                 max_rows: int = 10000, cipher: Any = None):
+        if not table.isidentifier():
+            raise ValueError(f"Invalid cache table name: {table}")
+        self.db_path = db_path
+        self.table = table
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self.cipher = cipher
+        self._lock = threading.Lock()
+        self._writes = 0
+        try:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            with self._conn:
+                self._conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} "
+                    "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)"
+                )
+        except sqlite3.Error as e:
+            raise StorageError(f"Failed to open cache database: {e}")
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, expires FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        value, expires = row
+        if expires and expires < time.time():
+            return None
+        if self.cipher:
+            try:
+                return self.cipher.decrypt(value.encode()).decode()
+            except Exception:
+                return None
+        return value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else ttl
+        expires = time.time() + ttl if ttl else 0.0
+        if self.cipher:
+            value = self.cipher.encrypt(value.encode()).decode()
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    f"INSERT OR REPLACE INTO {self.table} (key, value, expires) VALUES (?, ?, ?)",
+                    (key, value, expires)
+                )
+            self._writes += 1
+            if self._writes % 100 == 0:
+                self._prune()
+
+    def _prune(self):
+        """Drop expired rows, then the oldest-written ones above max_rows."""
+        with self._conn:
+            # expires = 0 never expires
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE expires > 0 AND expires < ?", (time.time(),)
+            )
+            # INSERT OR REPLACE gives a rewritten key a new, highest rowid
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN (SELECT key FROM {self.table} "
+                "ORDER BY rowid ASC LIMIT max(0, (SELECT COUNT(*) FROM "
+                f"{self.table}) - ?))",
+                (self.max_rows,)
+            )
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM {self.table}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class TieredCache:
+    """
+    In-memory LRU in front of an optional persistent tier, with hit/miss
+    counters. Persistent hits are promoted into memory.
+    """
+
+    def __init__(self, memory: LRUCache, persistent: Optional[SQLiteCache] = None):
+        self.memory = memory
+        self.persistent = persistent
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.memory.get(key)
+        if value is None and self.persistent:
+            value = self.persistent.get(key)
+            if value is not None:
+                self.disk_hits += 1
+                self.memory.set(key, value)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        self.memory.set(key, value, ttl)
+        if self.persistent:
+            self.persistent.set(key, value, ttl)
+
+    def clear(self):
+        self.memory.clear()
+        if self.persistent:
+            self.persistent.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self.memory),
+            "evictions": self.memory.evictions,
+            "expirations": self.memory.expirations,
+        }
@@ -0,0 +1,196 @@
+"""
+Context compression helpers.
+
+Compressors implement `compress(context, prompt)`. ScaleDownBackend is a
+remote round trip to the ScaleDown API; LocalCompressor
+(pulse.core.local_compressor) runs offline. CachedCompressor wraps either
+and skips the call when the same block was already compressed.
+RollingSummarizer keeps the per-turn compression input bounded by folding
+only newly aged-out turns into a persisted summary.
+"""
+
+import hashlib
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from pulse.core.cache import TieredCache
+from pulse.core.memory import Memory, Message, Summary
+from pulse.exceptions import ContextOptimizationError
+
+try:
+    import scaledown
+    from scaledown.exceptions import APIError as ScaleDownAPIError
+    SCALEDOWN_AVAILABLE = True
+except ImportError:
+    SCALEDOWN_AVAILABLE = False
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Leads the compressor input when new turns are folded into a summary
+SUMMARY_PREFIX = "Summary so far: "
+
+
+@dataclass
+class CompressionResult:
+    """Compressed context, shaped like ScaleDown's result (`.content`)."""
+    content: str
+    cached: bool = False
+
+
+class Compressor(ABC):
+    """Abstract base class for context compressors."""
+
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """Backend identifier, part of compression cache keys."""
+        pass
+
+    @abstractmethod
+    def compress(self, context: str, prompt: str) -> CompressionResult:
+        """
+        Compress `context`, keeping what is relevant to `prompt`.
+
+        Raises ContextOptimizationError if the backend fails.
+        """
+        pass
+
+
+class ScaleDownBackend(Compressor):
+    """Compression through the ScaleDown API (needs the `scaledown` package)."""
+
+    def __init__(self, api_key: str, rate: Union[str, float] = "auto", target_model: str = "gpt-4o"):
+        if not SCALEDOWN_AVAILABLE:
+            raise ImportError("scaledown is required for remote compression. Run: pip install scaledown")
+        scaledown.set_api_key(api_key)
+        self.rate = rate
+        self.target_model = target_model
+        self._compressor = scaledown.ScaleDownCompressor(target_model=target_model, rate=rate)
+
+    @property
+    def name(self) -> str:
+        return "scaledown"
+
+    def compress(self, context: str, prompt: str) -> CompressionResult:
+        try:
+            result = self._compressor.compress(context=context, prompt=prompt)
+        except ScaleDownAPIError as e:
+            raise ContextOptimizationError(f"ScaleDown compression failed: {e}")
+        return CompressionResult(content=result.content)
+
+
+class CachedCompressor(Compressor):
+    """
+    Memoising wrapper around a compressor.
+
+    Keys are a SHA-256 over the backend name, the whitespace-normalised
+    context block, the prompt anchor, the rate and the target model, so
+    only an equivalent request can be served from cache. Errors from the wrapped compressor
+    propagate unchanged and are never cached.
+    """
+
+    def __init__(self, compressor: Compressor, cache: TieredCache, rate: Any = "auto", target_model: str = ""):
+        self.compressor = compressor
+        self.cache = cache
+        self.rate = rate
+        self.target_model = target_model
+
+    @property
+    def name(self) -> str:
+        return self.compressor.name
+
+    @staticmethod
+    def _normalise(text: str) -> str:
+        return _WHITESPACE_RE.sub(" ", text).strip()
+
+    def cache_key(self, context: str, prompt: str) -> str:
+        digest = hashlib.sha256()
+        parts = (self.name, self._normalise(context), self._normalise(prompt), str(self.rate), self.target_model)
+        for part in parts:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def compress(self, context: str, prompt: str) -> CompressionResult:
+        key = self.cache_key(context, prompt)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return CompressionResult(content=cached, cached=True)
+
+        result = self.compressor.compress(context=context, prompt=prompt)
+        self.cache.set(key, result.content)
+        return CompressionResult(content=result.content)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
+
+
+def format_turns(turns: List[Message]) -> str:
+    """Flatten turns into the "ROLE: content" block the compressor sees."""
+    return "\n".join(f"{m.role.upper()}: {m.content}" for m in turns)
+
+
+class RollingSummarizer:
+    """
+    Incrementally maintained summary of each session's older history.
+
+    Instead of recompressing the whole older prefix every turn, only the
+    turns that aged out of the recent window since the last update are
+    folded into the stored summary. Every `rebase_every` folds the summary
+    is rebuilt from the raw older turns, so errors from repeatedly
+    summarising a summary can't pile up. Either way the compressor input is
+    bounded by the history window, however long the conversation runs.
+    """
+
+    def __init__(self, compressor: Compressor, memory: Memory, rebase_every: int = 8):
+        self.compressor = compressor
+        self.memory = memory
+        self.rebase_every = rebase_every
+
+    def pending(self, session: str, older_turns: List[Message]) -> Tuple[Optional[Summary], List[Message]]:
+        """The stored summary and the older turns it does not cover yet."""
+        summary = self.memory.get_summary(session)
+        if summary is None:
+            return None, list(older_turns)
+        return summary, [m for m in older_turns if m.id > summary.through_id]
+
+    def update(self, session: str, older_turns: List[Message], prompt: str) -> Optional[Summary]:
+        """
+        Bring the session's summary up to the newest of `older_turns`.
+
+        Returns the stored summary unchanged when nothing new aged out.
+        Compressor errors propagate; the stored summary is left as it was.
+        """
+        if not older_turns:
+            return self.memory.get_summary(session)
+
+        summary, new_turns = self.pending(session, older_turns)
+        if summary is not None and not new_turns:
+            return summary
+
+        # Re-base when there is no summary yet, on schedule, or when none of
+        # the window is covered yet (turns may have aged out unseen, and
+        # folding would cost as much as a re-base anyway).
+        rebase = (
+            summary is None
+            or summary.folds + 1 >= self.rebase_every
+            or len(new_turns) == len(older_turns)
+        )
+        if rebase:
+            context = format_turns(older_turns)
+            folds = 0
+        else:
+            context = f"{SUMMARY_PREFIX}{summary.content}\n{format_turns(new_turns)}"
+            folds = summary.folds + 1
+
+        compressed = self.compressor.compress(context=context, prompt=prompt)
+        updated = Summary(
+            session_id=session,
+            content=compressed.content,
+            through_id=older_turns[-1].id,
+            folds=folds
+        )
+        self.memory.save_summary(updated)
+        return updated
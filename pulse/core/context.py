@@ -0,0 +1,127 @@
+"""
+Token-budget-aware context assembly.
+
+The Brain describes the context as ordered sections (system prompt,
+recalled turns, older history, recent turns), each with a packing
+priority. The builder fills the budget in priority order and reports what
+it kept, trimmed or dropped.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from pulse.core.tokens import MESSAGE_OVERHEAD, estimate_message_tokens
+
+
+@dataclass
+class ContextSection:
+    """A group of messages packed together."""
+    name: str
+    messages: List[Dict[str, Any]]
+    priority: int  # Lower packs first
+    tokens: List[int] = None  # Per-message cost; estimated if not given
+    required: bool = False  # Always included, even over budget
+    trim_oldest: bool = False  # May drop its oldest messages to fit
+    min_keep: int = 0  # With trim_oldest: newest messages that are never dropped
+    truncatable: bool = False  # May cut the text of its last message to fit
+
+    def __post_init__(self):
+        if self.tokens is None:
+            self.tokens = [estimate_message_tokens(m) for m in self.messages]
+
+
+@dataclass
+class ContextReport:
+    """Packing decisions for one context window, stored in response metadata."""
+    model: str
+    budget: int
+    used: int = 0
+    sections: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def over_budget(self) -> bool:
+        return self.used > self.budget
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "budget": self.budget,
+            "used": self.used,
+            "over_budget": self.over_budget,
+            "sections": self.sections,
+        }
+
+
+class ContextBuilder:
+    """
+    Packs sections into a token budget.
+
+    Sections are emitted in the order they were added, but budget is handed
+    out by priority, so e.g. recent turns can claim space before recalled
+    history even though they come last in the prompt.
+    """
+
+    def __init__(self, budget: int, model: str = ""):
+        self.budget = budget
+        self.model = model
+        self._sections: List[ContextSection] = []
+
+    def add(self, section: ContextSection) -> "ContextBuilder":
+        if section.messages:
+            self._sections.append(section)
+        return self
+
+    def build(self) -> Tuple[List[Dict[str, Any]], ContextReport]:
+        remaining = self.budget
+        packed: Dict[int, List[Dict[str, Any]]] = {}
+        report_rows: Dict[int, Dict[str, Any]] = {}
+
+        order = sorted(range(len(self._sections)), key=lambda i: self._sections[i].priority)
+        for i in order:
+            section = self._sections[i]
+            kept, used, truncated = self._pack(section, remaining)
+            remaining -= used
+            packed[i] = kept
+            report_rows[i] = {
+                "name": section.name,
+                "available": len(section.messages),
+                "included": len(kept),
+                "tokens": used,
+                "truncated": truncated,
+            }
+
+        messages = []
+        report = ContextReport(model=self.model, budget=self.budget, used=self.budget - remaining)
+        for i in range(len(self._sections)):
+            messages.extend(packed[i])
+            report.sections.append(report_rows[i])
+        return messages, report
+
+    def _pack(self, section: ContextSection, remaining: int) -> Tuple[List[Dict[str, Any]], int, bool]:
+        total = sum(section.tokens)
+        if section.required or total <= remaining:
+            return list(section.messages), total, False
+
+        if section.trim_oldest:
+            # Keep the newest messages that fit; min_keep are kept regardless
+            kept, used = [], 0
+            for n, (message, cost) in enumerate(zip(reversed(section.messages), reversed(section.tokens))):
+                if n >= section.min_keep and used + cost > remaining:
+                    break
+                kept.append(message)
+                used += cost
+            kept.reverse()
+            return kept, used, False
+
+        if section.truncatable and remaining > MESSAGE_OVERHEAD:
+            last = dict(section.messages[-1])
+            head_cost = sum(section.tokens[:-1])
+            room = remaining - head_cost - MESSAGE_OVERHEAD
+            if room > 0:
+                # ~4 characters per token; cut on a word boundary
+                cut = last["content"][:room * 4].rsplit(" ", 1)[0]
+                last["content"] = cut + " …"
+                cost = estimate_message_tokens(last)
+                return list(section.messages[:-1]) + [last], head_cost + cost, True
+
+        return [], 0, False
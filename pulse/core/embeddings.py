@@ -0,0 +1,83 @@
+"""
+Local text embedders.
+
+Embedders turn text into fixed-size, L2-normalised float32 vectors so that
+cosine similarity is a plain dot product. Everything here runs offline.
+"""
+
+import math
+import re
+import zlib
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import List
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+class Embedder(ABC):
+    """Abstract base class for embedders."""
+
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """Identifier stored alongside persisted vectors; change it when outputs change."""
+        pass
+
+    @property
+    @abstractmethod
+    def dim(self) -> int:
+        """Vector dimensionality."""
+        pass
+
+    @abstractmethod
+    def embed(self, texts: List[str]) -> "np.ndarray":
+        """Embed texts into a (len(texts), dim) float32 matrix of unit rows."""
+        pass
+
+
+class HashingEmbedder(Embedder):
+    """
+    Feature-hashing embedder over word unigrams and bigrams.
+
+    No vocabulary, no model download and no network: each feature is hashed
+    into one of `dim` buckets with a hash-derived sign, weighted by
+    1 + log(tf). Good enough to find earlier turns that share wording with
+    the current query.
+    """
+
+    def __init__(self, dim: int = 256):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for embeddings. Run: pip install numpy")
+        self._dim = dim
+
+    @property
+    def name(self) -> str:
+        return f"hashing-v1-{self._dim}"
+
+    @property
+    def dim(self) -> int:
+        return self._dim
+
+    def _features(self, text: str) -> Counter:
+        tokens = _TOKEN_RE.findall(text.lower())
+        features = Counter(tokens)
+        features.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+        return features
+
+    def embed(self, texts: List[str]) -> "np.ndarray":
+        out = np.zeros((len(texts), self._dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, count in self._features(text).items():
+                h = zlib.crc32(feature.encode())
+                sign = 1.0 if h & 0x80000000 else -1.0
+                out[row, h % self._dim] += sign * (1.0 + math.log(count))
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return out / norms
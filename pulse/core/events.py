@@ -0,0 +1,101 @@
+"""
+In-process publish/subscribe channel for conversation turn events.
+
+The Brain and the VoiceLoop publish what happens during a turn (user
+transcript, streamed response chunks, final response); UIs subscribe and
+update only when something actually arrives.
+"""
+
+import threading
+import time
+import weakref
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class TurnEvent:
+    """Single event published on the EventBus."""
+    kind: str
+    content: str = ""
+    timestamp: float = 0.0
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    # Event kinds
+    USER_MESSAGE = "user_message"      # User input accepted (typed or transcribed)
+    RESPONSE_CHUNK = "response_chunk"  # Partial streamed response text
+    RESPONSE = "response"              # Final response, already persisted
+    STATUS = "status"                  # Voice loop state (listening, thinking, ...)
+
+    def __post_init__(self):
+        if self.timestamp == 0.0:
+            self.timestamp = time.time()
+
+
+class Subscription:
+    """
+    A subscriber's bounded event queue.
+
+    When the subscriber falls behind, the oldest events are dropped so a
+    stalled UI can never make publishers block or grow memory unbounded.
+    """
+
+    def __init__(self, bus: "EventBus", maxsize: int = 256):
+        self._bus = bus
+        self._events = deque(maxlen=maxsize)
+        self._cond = threading.Condition()
+
+    def _push(self, event: TurnEvent):
+        with self._cond:
+            self._events.append(event)
+            self._cond.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[TurnEvent]:
+        """Wait up to `timeout` seconds for the next event; None on timeout."""
+        with self._cond:
+            if not self._events:
+                self._cond.wait(timeout)
+            return self._events.popleft() if self._events else None
+
+    def drain(self) -> List[TurnEvent]:
+        """Return all pending events without blocking."""
+        with self._cond:
+            events = list(self._events)
+            self._events.clear()
+            return events
+
+    def close(self):
+        """Stop receiving events."""
+        self._bus.unsubscribe(self)
+
+
+class EventBus:
+    """
+    Fan-out channel: every published event is delivered to every live
+    subscription. Subscriptions are held weakly, so one that is simply
+    dropped (e.g. with its Streamlit session) goes away on its own.
+    """
+
+    def __init__(self):
+        self._subscribers = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def subscribe(self, maxsize: int = 256) -> Subscription:
+        subscription = Subscription(self, maxsize)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, kind: str, content: str = "", **metadata) -> TurnEvent:
+        """Publish an event to all subscribers. Never blocks on slow consumers."""
+        event = TurnEvent(kind=kind, content=content, metadata=metadata)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription._push(event)
+        return event
@@ -4,18 +4,29 @@ Google Gemini API Client.
 """
 import requests
 import json
-from typing import List, Dict, Generator, Any
+from typing import List, Dict, Generator, Any, Optional, Callable
 
+from pulse.core.http import (
+    DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE, PhaseTimer, RequestTiming, get_session, prewarm
+)
+from pulse.core.sse import has_value, iter_events, string_value
 from pulse.exceptions import InferenceError
 
 class GeminiClient:
     """
     Client for Google's Gemini API via REST.
+
+    Shares the keep-alive session of pulse.core.http with the other clients;
+    `last_timing` holds the phase timings of the latest request.
     """
     BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
     
-    def __init__(self, api_key: str, model: str = "gemini-1.5-flash"):
+    def __init__(self, api_key: str, model: str = "gemini-1.5-flash", base_url: Optional[str] = None,
+                 pool_connections: int = DEFAULT_POOL_CONNECTIONS, pool_maxsize: int = DEFAULT_POOL_MAXSIZE):
         self.api_key = api_key
+        self.base_url = (base_url or self.BASE_URL).rstrip("/")
+        self.session = get_session(pool_connections, pool_maxsize)
+        self.last_timing: Optional[RequestTiming] = None
         # Ensure model has 'models/' prefix if not present, though API often accepts both
         self.model = model
         if not self.model.startswith("models/"):
@@ -28,6 +39,10 @@ class GeminiClient:
     @default_model.setter
     def default_model(self, value: str):
         self.model = value
+
+    def prewarm(self, connections: int = 1) -> int:
+        """Open pooled connections to the API host before the first request."""
+        return prewarm(self.session, self.base_url, connections)
             
     def chat(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
         """
@@ -35,26 +50,9 @@ class GeminiClient:
         """
         # Clean model name if it has prefixes
         model_name = self.model.replace("models/", "")
-        url = f"{self.BASE_URL}/models/{model_name}:generateContent"
-        
-        headers = {
-            "Content-Type": "application/json",
-            "X-goog-api-key": self.api_key
-        }
-        
-        contents = self._prepare_contents(messages)
-        system_instruction = self._extract_system_instruction(messages)
-        
-        payload = {
-            "contents": contents,
-            "generationConfig": {
-                "temperature": kwargs.get("temperature", 0.7),
-                "maxOutputTokens": kwargs.get("max_tokens", 8192)
-            }
-        }
-        
-        if system_instruction:
-            payload["systemInstruction"] = {"parts": [{"text": system_instruction}]}
+        url = f"{self.base_url}/models/{model_name}:generateContent"
+        headers = self._headers()
+        payload = self._build_payload(messages, **kwargs)
         
         # Retry logic for 429 (Quota) or 503 (Overloaded)
         import time
@@ -64,7 +62,11 @@ class GeminiClient:
         response = None
         for attempt in range(max_retries):
             try:
-                response = requests.post(url, headers=headers, json=payload, timeout=30)
+                timer = PhaseTimer()
+                response = self.session.post(url, headers=headers, json=payload, stream=True, timeout=30)
+                timer.first_byte()
+                response.content  # Read the body so the connection returns to the pool
+                self.last_timing = timer.done()
                 
                 if response.status_code == 200:
                     break # Success
@@ -90,40 +92,51 @@ class GeminiClient:
         if response.status_code != 200:
              raise InferenceError(f"Gemini API Error {response.status_code}: {response.text}")
 
-        data = response.json()
-        try:
-            # Handle cases where content might be blocked or empty
-            if 'candidates' not in data or not data['candidates']:
-                raise InferenceError("No candidates returned (possibly blocked).")
-                
-            candidate = data['candidates'][0]
-            if 'content' not in candidate:
-                    finish_reason = candidate.get('finishReason', 'UNKNOWN')
-                    raise InferenceError(f"Response blocked. Reason: {finish_reason}")
-                    
-            text = candidate['content']['parts'][0]['text']
-            usage = data.get("usageMetadata", {})
-            
-            return {
-                "content": text,
-                "model": self.model,
-                "usage": usage
-            }
-        except (KeyError, IndexError) as e:
-                raise InferenceError(f"Unexpected response format: {str(e)}")
+        result = self._parse_response(response.json())
+        result["timing"] = self.last_timing.to_dict()
+        return result
 
-    def stream(self, messages: List[Dict[str, str]], **kwargs) -> Generator[str, None, None]:
+    def stream(self, messages: List[Dict[str, str]],
+               on_timing: Optional[Callable[[Optional[RequestTiming]], None]] = None,
+               **kwargs) -> Generator[str, None, None]:
         """
-        Stream chat response.
+        Stream chat response; `on_timing` gets this stream's timing at the end.
         """
         model_name = self.model.replace("models/", "")
-        url = f"{self.BASE_URL}/models/{model_name}:streamGenerateContent?alt=sse"
-        
-        headers = {
+        url = f"{self.base_url}/models/{model_name}:streamGenerateContent?alt=sse"
+        headers = self._headers()
+        payload = self._build_payload(messages, **kwargs)
+            
+        timer = PhaseTimer()
+        try:
+            with self.session.post(url, headers=headers, json=payload, stream=True, timeout=60) as response:
+                timer.first_byte()
+                
+                if response.status_code != 200:
+                     raise InferenceError(f"Stream Error {response.status_code}: {response.text}")
+                     
+                for event in iter_events(response.raw):
+                    text = self._parse_stream_data(event.data)
+                    if text:
+                        yield text
+                            
+        except InferenceError:
+            raise
+        except Exception as e:
+            raise InferenceError(f"Stream error: {str(e)}")
+        finally:
+            timing = timer.done()
+            self.last_timing = timing
+        if on_timing is not None:
+            on_timing(timing)
+
+    def _headers(self) -> Dict[str, str]:
+        return {
             "Content-Type": "application/json",
             "X-goog-api-key": self.api_key
         }
-        
+
+    def _build_payload(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
         contents = self._prepare_contents(messages)
         system_instruction = self._extract_system_instruction(messages)
         
@@ -137,31 +150,49 @@ class GeminiClient:
         
         if system_instruction:
             payload["systemInstruction"] = {"parts": [{"text": system_instruction}]}
-            
+        return payload
+
+    def _parse_response(self, data: Dict[str, Any]) -> Dict[str, Any]:
         try:
-            response = requests.post(url, headers=headers, json=payload, stream=True, timeout=60)
+            # Handle cases where content might be blocked or empty
+            if 'candidates' not in data or not data['candidates']:
+                raise InferenceError("No candidates returned (possibly blocked).")
+                
+            candidate = data['candidates'][0]
+            if 'content' not in candidate:
+                    finish_reason = candidate.get('finishReason', 'UNKNOWN')
+                    raise InferenceError(f"Response blocked. Reason: {finish_reason}")
+                    
+            text = candidate['content']['parts'][0]['text']
+            usage = data.get("usageMetadata", {})
             
-            if response.status_code != 200:
-                 raise InferenceError(f"Stream Error {response.status_code}: {response.text}")
-                 
-            for line in response.iter_lines():
-                if line:
-                    decoded = line.decode('utf-8')
-                    if decoded.startswith("data: "):
-                        json_str = decoded[6:]
-                        try:
-                            chunk = json.loads(json_str)
-                            if 'candidates' in chunk and chunk['candidates']:
-                                parts = chunk['candidates'][0].get('content', {}).get('parts', [])
-                                if parts:
-                                    text = parts[0].get('text', '')
-                                    if text:
-                                        yield text
-                        except json.JSONDecodeError:
-                            continue
-                            
-        except Exception as e:
-            raise InferenceError(f"Stream error: {str(e)}")
+            return {
+                "content": text,
+                "model": self.model,
+                "usage": usage
+            }
+        except (KeyError, IndexError) as e:
+                raise InferenceError(f"Unexpected response format: {str(e)}")
+
+    @staticmethod
+    def _parse_stream_data(data: str) -> Optional[str]:
+        """Text carried by one SSE event's data, if any."""
+        # Events without text (e.g. the final finishReason) are skipped without decoding,
+        # and a single text part is read without decoding the rest
+        if not has_value(data, '"text"'):
+            return None
+        found, text = string_value(data, '"text"')
+        if found:
+            return text or None
+        try:
+            chunk = json.loads(data)
+        except json.JSONDecodeError:
+            return None
+        if 'candidates' in chunk and chunk['candidates']:
+            parts = chunk['candidates'][0].get('content', {}).get('parts', [])
+            if parts:
+                return parts[0].get('text') or None
+        return None
 
     def _extract_system_instruction(self, messages: List[Dict[str, str]]) -> str:
         """Extract system prompt."""
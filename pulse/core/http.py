@@ -0,0 +1,170 @@
+"""
+Shared HTTP plumbing for the LLM clients.
+
+All clients share keep-alive connection pools, so a turn reuses an open
+TCP+TLS connection instead of paying a fresh handshake. Connections can be
+opened ahead of the first request (pre-warming), and every request records
+how long connecting, the first byte and the whole exchange took.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+DEFAULT_POOL_CONNECTIONS = 4  # Distinct hosts kept
+DEFAULT_POOL_MAXSIZE = 16  # Open connections kept per host
+
+# Connect time spent by the current thread since its request started
+_phase = threading.local()
+
+
+def _record_connect(start: float):
+    _phase.connect_ms = getattr(_phase, "connect_ms", 0.0) + (time.perf_counter() - start) * 1000
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _record_connect(start)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()  # TCP + TLS handshake
+        finally:
+            _record_connect(start)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections report their connect time."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+@dataclass
+class RequestTiming:
+    """Phase timings of one request, in milliseconds from when it started."""
+    connect_ms: float = 0.0  # TCP (+TLS) setup; 0 when a pooled connection was reused
+    ttfb_ms: float = 0.0  # Until the response headers arrived
+    total_ms: float = 0.0  # Until the body was fully read
+
+    @property
+    def reused(self) -> bool:
+        return self.connect_ms == 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "connect_ms": round(self.connect_ms, 2),
+            "ttfb_ms": round(self.ttfb_ms, 2),
+            "total_ms": round(self.total_ms, 2),
+            "reused": self.reused,
+        }
+
+
+class PhaseTimer:
+    """
+    Times one request made from the current thread.
+
+    Call `first_byte()` once the response headers are in and `done()` once
+    the body is consumed.
+    """
+
+    def __init__(self):
+        self.timing = RequestTiming()
+        _phase.connect_ms = 0.0
+        self._start = time.perf_counter()
+
+    def _elapsed(self) -> float:
+        return (time.perf_counter() - self._start) * 1000
+
+    def first_byte(self):
+        self.timing.ttfb_ms = self._elapsed()
+        self.timing.connect_ms = getattr(_phase, "connect_ms", 0.0)
+
+    def done(self) -> RequestTiming:
+        if not self.timing.ttfb_ms:
+            self.first_byte()
+        self.timing.total_ms = self._elapsed()
+        return self.timing
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+_sessions: Dict[Tuple[int, int], requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                pool_maxsize: int = DEFAULT_POOL_MAXSIZE) -> requests.Session:
+    """The process-wide keep-alive session for the given pool sizes."""
+    key = (pool_connections, pool_maxsize)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = TimedHTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[key] = session
+        return session
+
+
+def prewarm(session: requests.Session, url: str, connections: int = 1, timeout: float = 5.0) -> int:
+    """
+    Open `connections` pooled connections to `url`'s host ahead of use.
+
+    Sends HEAD requests in parallel; any response, even an error status,
+    leaves a warm connection behind. Returns how many succeeded.
+    """
+    opened = []
+
+    def warm():
+        try:
+            session.head(url, timeout=timeout, allow_redirects=False).close()
+            opened.append(True)
+        except requests.exceptions.RequestException:
+            pass
+
+    threads = [threading.Thread(target=warm, daemon=True) for _ in range(max(1, connections))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return len(opened)
@@ -0,0 +1,202 @@
+"""
+Offline extractive context compression.
+
+LocalCompressor keeps the sentences of a conversation block that matter most
+to the current query, scored with BM25 against the query terms, until a
+token budget is used up. Repeated turns and sentences are dropped and
+reasoning blobs are stripped first. Nothing leaves the machine, so a
+compression costs milliseconds instead of a network round trip.
+"""
+
+import json
+import re
+from typing import List, Optional, Tuple, Union
+
+from pulse.core.compression import SUMMARY_PREFIX, CompressionResult, Compressor
+from pulse.core.embeddings import NUMPY_AVAILABLE
+from pulse.core.tokens import estimate_tokens
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+# Keep ratio used for rate="auto"
+AUTO_RATE = 0.5
+
+_TURN_RE = re.compile(r"^(USER|ASSISTANT|SYSTEM):\s?", re.MULTILINE)
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+_WORD_RE = re.compile(r"\w+")
+_THINK_RE = re.compile(r"<(think|thinking|reasoning)>.*?</\1>", re.DOTALL | re.IGNORECASE)
+_REASONING_KEY_RE = re.compile(r'"?reasoning_details"?\s*[:=]\s*')
+
+_STOPWORDS = frozenset(
+    "a an and are as at be but by do does for from had has have how i if in is it its "
+    "me my of on or our so that the their them then there they this to was we what "
+    "when where which who why will with you your".split()
+)
+
+
+def _terms(text: str) -> List[str]:
+    return [w for w in _WORD_RE.findall(text.lower()) if w not in _STOPWORDS]
+
+
+def strip_reasoning(text: str) -> str:
+    """Remove <think>-style blocks and serialised `reasoning_details` payloads."""
+    text = _THINK_RE.sub("", text)
+    out, pos = [], 0
+    for match in _REASONING_KEY_RE.finditer(text):
+        if match.start() < pos:
+            continue
+        end = match.end()
+        try:
+            # Skip the JSON value that follows the key
+            _, length = json.JSONDecoder().raw_decode(text[end:])
+        except ValueError:
+            continue
+        out.append(text[pos:match.start()])
+        pos = end + length
+    out.append(text[pos:])
+    return "".join(out)
+
+
+class LocalCompressor(Compressor):
+    """
+    Extractive compressor scored with BM25 against the prompt.
+
+    `rate` is the fraction of tokens to keep ("auto" keeps AUTO_RATE), the
+    same knob as ScaleDown's `compression_rate`. Blocks under `min_tokens`
+    are only cleaned, not cut. Kept sentences are emitted in their original
+    order under their turn's role label.
+    """
+
+    def __init__(self, rate: Union[str, float] = "auto", min_tokens: int = 64,
+                 k1: float = 1.2, b: float = 0.75, recency_weight: float = 0.3):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for local compression. Run: pip install numpy")
+        self.rate = rate
+        self.min_tokens = min_tokens
+        self.k1 = k1
+        self.b = b
+        self.recency_weight = recency_weight
+
+    @property
+    def name(self) -> str:
+        return "local-bm25"
+
+    def keep_ratio(self) -> float:
+        if self.rate in (None, "", "auto"):
+            return AUTO_RATE
+        return min(1.0, max(0.05, float(self.rate)))
+
+    def compress(self, context: str, prompt: str) -> CompressionResult:
+        if context.startswith(SUMMARY_PREFIX):
+            # A previous local summary is itself labelled turns; re-score it flat
+            context = context[len(SUMMARY_PREFIX):]
+        turns = self._dedupe_turns(self._split_turns(strip_reasoning(context)))
+        units = self._dedupe_sentences(turns)
+        if not units:
+            return CompressionResult(content="")
+
+        costs = [estimate_tokens(text) for _, text in units]
+        total = sum(costs)
+        if total <= self.min_tokens:
+            return CompressionResult(content=self._render(turns, units, range(len(units))))
+
+        budget = max(1, int(total * self.keep_ratio()))
+        scores = self._score([text for _, text in units], prompt)
+        kept, used = [], 0
+        for i in np.argsort(-scores, kind="stable"):
+            if kept and used + costs[i] > budget:
+                continue
+            kept.append(int(i))
+            used += costs[i]
+        return CompressionResult(content=self._render(turns, units, sorted(kept)))
+
+    @staticmethod
+    def _split_turns(text: str) -> List[Tuple[str, str]]:
+        """Split a format_turns() block into (label, content) pairs."""
+        turns = []
+        matches = list(_TURN_RE.finditer(text))
+        if not matches or matches[0].start() > 0:
+            head = text[:matches[0].start()] if matches else text
+            if head.strip():
+                turns.append(("", head.strip()))
+        for n, match in enumerate(matches):
+            end = matches[n + 1].start() if n + 1 < len(matches) else len(text)
+            content = text[match.end():end].strip()
+            if content:
+                turns.append((match.group(1), content))
+        return turns
+
+    @staticmethod
+    def _dedupe_turns(turns: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """Drop turns repeated verbatim (modulo case and spacing), keeping the latest."""
+        seen = set()
+        kept = []
+        for label, content in reversed(turns):
+            key = (label, " ".join(_WORD_RE.findall(content.lower())))
+            if key in seen:
+                continue
+            seen.add(key)
+            kept.append((label, content))
+        kept.reverse()
+        return kept
+
+    @staticmethod
+    def _dedupe_sentences(turns: List[Tuple[str, str]]) -> List[Tuple[int, str]]:
+        """Sentences as (turn index, text), without repeats of earlier ones."""
+        seen = set()
+        units = []
+        for t, (_, content) in enumerate(turns):
+            for sentence in _SENTENCE_RE.split(content):
+                sentence = sentence.strip()
+                key = " ".join(_WORD_RE.findall(sentence.lower()))
+                if not key or key in seen:
+                    continue
+                seen.add(key)
+                units.append((t, sentence))
+        return units
+
+    def _score(self, sentences: List[str], prompt: str) -> "np.ndarray":
+        """BM25 of each sentence against the prompt, plus a small recency prior."""
+        n = len(sentences)
+        recency = np.linspace(0.0, 1.0, n, dtype=np.float32) if n > 1 else np.ones(1, dtype=np.float32)
+        query = list(dict.fromkeys(_terms(prompt)))
+        if not query:
+            return recency
+
+        index = {term: j for j, term in enumerate(query)}
+        tf = np.zeros((n, len(query)), dtype=np.float32)
+        lengths = np.empty(n, dtype=np.float32)
+        for i, sentence in enumerate(sentences):
+            words = _terms(sentence)
+            lengths[i] = len(words)
+            for word in words:
+                j = index.get(word)
+                if j is not None:
+                    tf[i, j] += 1.0
+
+        df = np.count_nonzero(tf, axis=0).astype(np.float32)
+        idf = np.log1p((n - df + 0.5) / (df + 0.5))
+        avg_len = max(float(lengths.mean()), 1.0)
+        norm = self.k1 * (1.0 - self.b + self.b * lengths / avg_len)
+        bm25 = (tf * (self.k1 + 1.0) / (tf + norm[:, None])) @ idf
+
+        peak = float(bm25.max())
+        if peak > 0:
+            bm25 /= peak
+        return bm25 + self.recency_weight * recency
+
+    @staticmethod
+    def _render(turns: List[Tuple[str, str]], units: List[Tuple[int, str]], keep) -> str:
+        lines: List[str] = []
+        current: Optional[int] = None
+        for i in keep:
+            t, sentence = units[i]
+            if t != current:
+                label = turns[t][0]
+                lines.append(f"{label}: {sentence}" if label else sentence)
+                current = t
+            else:
+                lines[-1] += " " + sentence
+        return "\n".join(lines)
+
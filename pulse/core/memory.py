@@ -3,14 +3,21 @@ Conversation memory management with local SQLite storage.
 Encryption support is included but optional if cryptography is not installed.
 """
 
+import atexit
+import hashlib
+import hmac
 import json
+import re
 import sqlite3
+import threading
 import time
+from collections import deque
 from dataclasses import dataclass, asdict
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
 
+from pulse.core.tokens import estimate_tokens
 from pulse.exceptions import StorageError
 
 try:
@@ -20,6 +27,11 @@ except ImportError:
     CRYPTO_AVAILABLE = False
 
 
+DEFAULT_SESSION = "default"
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
 @dataclass
 class Message:
     """Single message in a conversation."""
@@ -27,12 +39,17 @@ class Message:
     content: str
     timestamp: float = 0.0
     metadata: Dict[str, Any] = None
+    id: Optional[int] = None  # Row id, assigned once persisted
+    session_id: str = DEFAULT_SESSION
+    tokens: int = 0  # Estimated token count of content
 
     def __post_init__(self):
         if self.timestamp == 0.0:
             self.timestamp = time.time()
         if self.metadata is None:
             self.metadata = {}
+        if not self.tokens:
+            self.tokens = estimate_tokens(self.content)
 
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
@@ -42,21 +59,127 @@ class Message:
         return cls(**data)
 
 
+@dataclass
+class Summary:
+    """Rolling summary of a session's history, up to and including `through_id`."""
+    session_id: str
+    content: str
+    through_id: int
+    folds: int = 0  # Incremental folds since the last full re-base
+    updated: float = 0.0
+
+
 class Memory:
     """
     Persistent conversation memory backed by SQLite.
     Supports encryption for privacy if 'cryptography' package is installed.
+
+    Messages are partitioned into sessions (separate conversations such as
+    CLI, voice and web). Every method acts on `session`, or on the
+    Memory's default session when none is given.
+
+    Message content is indexed in an FTS5 table for ranked keyword search.
+    When content is encrypted at rest, the index holds keyed hashes
+    (HMAC-SHA256 under a key derived from the encryption key) of each word
+    instead of the words themselves. See search() for the tradeoffs.
+
+    Each thread gets its own long-lived connection running in WAL mode, so
+    readers (the UI) never block the writer (the voice loop) and we don't pay
+    connection setup on every call.
+
+    With write_behind=True, add() only queues the message; a background
+    writer persists queued messages in batches (one transaction per batch)
+    every `flush_interval` seconds or once `max_batch` are waiting. Reads
+    flush first, so callers always see their own writes.
     """
 
-    def __init__(self, db_path: str, encryption_key: Optional[str] = None):
+    # Applied once per connection. WAL lets readers and the writer proceed
+    # concurrently; synchronous=NORMAL is durable across application crashes
+    # in WAL mode and skips the per-commit fsync of the main database file.
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA cache_size=-8000",  # ~8 MB page cache per connection
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA busy_timeout=5000",
+    )
+
+    # SQL is kept constant so sqlite3's per-connection statement cache
+    # reuses the prepared statements.
+    _SQL_INSERT = (
+        "INSERT INTO messages (session_id, role, content, timestamp, metadata, tokens) "
+        "VALUES (?, ?, ?, ?, ?, ?)"
+    )
+    # Tail read: walks the (session_id, id) index backwards from the newest
+    # row, so it touches exactly `limit` rows no matter how large the table
+    # or how many other sessions there are.
+    _SQL_TAIL = (
+        "SELECT id, session_id, role, content, timestamp, metadata, tokens FROM messages "
+        "WHERE session_id = ? ORDER BY id DESC LIMIT ?"
+    )
+    _SQL_SINCE = (
+        "SELECT id, session_id, role, content, timestamp, metadata, tokens FROM messages "
+        "WHERE session_id = ? AND id > ? ORDER BY id ASC LIMIT ?"
+    )
+    _SQL_DROP_SESSION = "DELETE FROM messages WHERE session_id = ?"
+    _SQL_CLEAR = "DELETE FROM messages"
+    _SQL_FTS_INSERT = "INSERT INTO messages_fts (rowid, body) VALUES (?, ?)"
+    _SQL_FTS_DROP_SESSION = "DELETE FROM messages_fts WHERE rowid IN (SELECT id FROM messages WHERE session_id = ?)"
+    _SQL_FTS_CLEAR = "DELETE FROM messages_fts"
+    _SQL_SEARCH = (
+        "SELECT m.id, m.session_id, m.role, m.content, m.timestamp, m.metadata, m.tokens "
+        "FROM messages_fts JOIN messages m ON m.id = messages_fts.rowid "
+        "WHERE messages_fts MATCH ? ORDER BY rank LIMIT ?"
+    )
+    _SQL_SEARCH_SESSION = (
+        "SELECT m.id, m.session_id, m.role, m.content, m.timestamp, m.metadata, m.tokens "
+        "FROM messages_fts JOIN messages m ON m.id = messages_fts.rowid "
+        "WHERE messages_fts MATCH ? AND m.session_id = ? ORDER BY rank LIMIT ?"
+    )
+
+    def __init__(
+        self,
+        db_path: str,
+        encryption_key: Optional[str] = None,
+        write_behind: bool = False,
+        flush_interval: float = 0.05,
+        max_batch: int = 256,
+        session: str = DEFAULT_SESSION,
+    ):
         self.db_path = db_path
+        self.session = session
         self.cipher = None
+        self._index_key: Optional[bytes] = None
+        self.fts_enabled = False
+
+        # Thread-local connection pool
+        self._local = threading.local()
+        self._connections: List[Tuple[threading.Thread, sqlite3.Connection]] = []
+        self._pool_lock = threading.Lock()
+        # SQLite allows one writer at a time and its busy handler backs off
+        # by sleeping; threads of this process queue on a lock instead
+        self._write_lock = threading.Lock()
+
+        # Change counter for cheap "did anything change?" checks
+        self._version = 0
+        self._version_lock = threading.Lock()
+        # Callbacks run with each batch of newly stored messages
+        self._listeners: List[Callable[[List[Message]], None]] = []
+        # Callbacks run after a session is dropped (with its name) or memory is cleared (with None)
+        self._delete_listeners: List[Callable[[Optional[str]], None]] = []
         
         # Setup encryption if key provided and lib available
         if encryption_key and CRYPTO_AVAILABLE:
             try:
                 # Ensure key is valid base64 url-safe
                 self.cipher = Fernet(encryption_key.encode() if isinstance(encryption_key, str) else encryption_key)
+                # Separate key for the search index, derived from the
+                # encryption key so no extra secret has to be managed
+                self._index_key = hmac.new(
+                    encryption_key.encode() if isinstance(encryption_key, str) else encryption_key,
+                    b"pulse-fts-index",
+                    hashlib.sha256
+                ).digest()
             except Exception as e:
                 print(f"Warning: Invalid encryption key, disabling encryption. Error: {e}")
         elif encryption_key and not CRYPTO_AVAILABLE:
@@ -64,24 +187,186 @@ class Memory:
 
         self._init_db()
 
+        # Write-behind queue
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._pending = deque()
+        self._in_flight = 0
+        self._writer_error: Optional[Exception] = None
+        self._flush_requested = False
+        self._stopping = False
+        self._queue_cond = threading.Condition()
+        self._writer = None
+        if write_behind:
+            self._writer = threading.Thread(target=self._writer_loop, name="pulse-memory-writer", daemon=True)
+            self._writer.start()
+            # Durability: whatever is still queued is written at shutdown
+            atexit.register(self.close)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+
+        try:
+            conn = sqlite3.connect(
+                self.db_path,
+                cached_statements=64,
+                # Connections are only used by their own thread; this just lets
+                # close() and the dead-thread reaper below release them.
+                check_same_thread=False,
+            )
+            conn.row_factory = sqlite3.Row
+            for pragma in self.PRAGMAS:
+                conn.execute(pragma)
+        except sqlite3.Error as e:
+            raise StorageError(f"Failed to open database: {e}")
+
+        self._local.conn = conn
+        with self._pool_lock:
+            # Streamlit runs every rerun on a fresh thread, so reap the
+            # connections of threads that have since exited.
+            alive = []
+            for owner, pooled in self._connections:
+                if owner.is_alive():
+                    alive.append((owner, pooled))
+                else:
+                    pooled.close()
+            alive.append((threading.current_thread(), conn))
+            self._connections = alive
+        return conn
+
+    def close(self):
+        """
+        Flush queued writes, stop the background writer and close every
+        pooled connection. Memory reconnects lazily if used again.
+        """
+        if self._writer:
+            try:
+                self.flush()
+            except StorageError as e:
+                print(f"Warning: {e}")
+            with self._queue_cond:
+                self._stopping = True
+                self._queue_cond.notify_all()
+            self._writer.join()
+            self._writer = None
+            self.write_behind = False
+
+        with self._pool_lock:
+            connections, self._connections = self._connections, []
+            self._local = threading.local()
+        for _, conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
     def _init_db(self):
         """Initialize SQLite database schema."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
+            conn = self._connect()
+            with conn:
+                conn.execute("""
                     CREATE TABLE IF NOT EXISTS messages (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
                         role TEXT NOT NULL,
                         content TEXT NOT NULL,
                         timestamp REAL NOT NULL,
-                        metadata TEXT
+                        metadata TEXT,
+                        session_id TEXT NOT NULL DEFAULT 'default',
+                        tokens INTEGER
+                    )
+                """)
+                # Migrate databases created before sessions existed; their
+                # messages all belong to the default session.
+                columns = {row["name"] for row in conn.execute("PRAGMA table_info(messages)")}
+                if "session_id" not in columns:
+                    conn.execute("ALTER TABLE messages ADD COLUMN session_id TEXT NOT NULL DEFAULT 'default'")
+                # Older rows get their token count estimated when read
+                if "tokens" not in columns:
+                    conn.execute("ALTER TABLE messages ADD COLUMN tokens INTEGER")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_messages_session ON messages(session_id, id)")
+                conn.execute("CREATE TABLE IF NOT EXISTS memory_meta (key TEXT PRIMARY KEY, value TEXT)")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS summaries (
+                        session_id TEXT PRIMARY KEY,
+                        content TEXT NOT NULL,
+                        through_id INTEGER NOT NULL,
+                        folds INTEGER NOT NULL DEFAULT 0,
+                        updated REAL NOT NULL
                     )
                 """)
-                conn.commit()
         except sqlite3.Error as e:
             raise StorageError(f"Failed to initialize database: {e}")
 
+        self._init_fts()
+
+    def _init_fts(self):
+        """Create the full-text index and rebuild it if it is missing or stale."""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(body)")
+        except sqlite3.OperationalError as e:
+            print(f"Warning: Full-text search disabled, SQLite lacks FTS5 ({e}).")
+            return
+        self.fts_enabled = True
+
+        # The index is only valid for the key (or plaintext mode) it was built
+        # with. Rebuild when that changes or when it predates this schema.
+        mode = self._index_mode()
+        row = conn.execute("SELECT value FROM memory_meta WHERE key = 'fts_mode'").fetchone()
+        if row is None or row[0] != mode:
+            self._rebuild_fts(mode)
+
+    def _index_mode(self) -> str:
+        """Identifies how index text is produced, without revealing the key."""
+        if not self._index_key:
+            return "plain"
+        return "hmac:" + hmac.new(self._index_key, b"mode", hashlib.sha256).hexdigest()[:16]
+
+    def _rebuild_fts(self, mode: str, batch: int = 5000):
+        """Re-index every stored message."""
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(self._SQL_FTS_CLEAR)
+                last_id = 0
+                while True:
+                    rows = conn.execute(
+                        "SELECT id, content FROM messages WHERE id > ? ORDER BY id LIMIT ?", (last_id, batch)
+                    ).fetchall()
+                    if not rows:
+                        break
+                    conn.executemany(
+                        self._SQL_FTS_INSERT,
+                        [(row["id"], self._index_text(self._decrypt(row["content"]))) for row in rows]
+                    )
+                    last_id = rows[-1]["id"]
+                conn.execute("INSERT OR REPLACE INTO memory_meta (key, value) VALUES ('fts_mode', ?)", (mode,))
+        except sqlite3.Error as e:
+            raise StorageError(f"Failed to rebuild search index: {e}")
+
+    def _hash_token(self, token: str) -> str:
+        return hmac.new(self._index_key, token.encode(), hashlib.sha256).hexdigest()[:20]
+
+    def _index_text(self, text: str) -> str:
+        """Text stored in the FTS index: the content itself, or keyed token hashes."""
+        if not self._index_key:
+            return text
+        return " ".join(self._hash_token(token) for token in _TOKEN_RE.findall(text.lower()))
+
+    def _match_expression(self, query: str) -> str:
+        """Build an FTS5 MATCH expression requiring every query word."""
+        tokens = _TOKEN_RE.findall(query.lower())
+        if self._index_key:
+            tokens = [self._hash_token(token) for token in tokens]
+        # Quoting keeps user input from being parsed as FTS5 syntax
+        return " ".join(f'"{token}"' for token in tokens)
+
     def _encrypt(self, text: str) -> str:
         """Encrypt text if cipher is available."""
         if self.cipher:
@@ -97,65 +382,338 @@ class Memory:
                 return "[Decryption Failed]"
         return text
 
-    def add(self, role: str, content: str, metadata: Dict[str, Any] = None) -> Message:
-        """Add a message to memory."""
-        msg = Message(role=role, content=content, metadata=metadata)
-        
+    def add(self, role: str, content: str, metadata: Dict[str, Any] = None, session: Optional[str] = None) -> Message:
+        """
+        Add a message to memory.
+
+        In write-behind mode the message is queued and returned immediately;
+        its `id` is filled in once the background writer has stored it.
+        """
+        msg = Message(role=role, content=content, metadata=metadata, session_id=session or self.session)
+
+        if not self.write_behind:
+            self._write_batch([msg])
+            return msg
+
+        with self._queue_cond:
+            # Backpressure: don't let the queue grow without bound if the
+            # disk can't keep up.
+            while len(self._pending) >= self.max_batch * 16 and not self._stopping:
+                self._queue_cond.wait()
+            self._pending.append(msg)
+            if len(self._pending) >= self.max_batch:
+                self._queue_cond.notify_all()
+        return msg
+
+    def _write_batch(self, messages: List[Message]):
+        """Insert messages in a single transaction and assign their ids."""
+        rows = [
+            (msg.session_id, msg.role, self._encrypt(msg.content), msg.timestamp,
+             json.dumps(msg.metadata), msg.tokens)
+            for msg in messages
+        ]
         try:
-            encrypted_content = self._encrypt(msg.content)
-            
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "INSERT INTO messages (role, content, timestamp, metadata) VALUES (?, ?, ?, ?)",
-                    (
-                        msg.role, 
-                        encrypted_content, 
-                        msg.timestamp, 
-                        json.dumps(msg.metadata)
+            conn = self._connect()
+            with self._write_lock, conn:
+                conn.executemany(self._SQL_INSERT, rows)
+                # AUTOINCREMENT ids are consecutive within one write
+                # transaction, so the batch ends at last_insert_rowid().
+                last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                for offset, msg in enumerate(messages):
+                    msg.id = last_id - len(messages) + 1 + offset
+                # Keep the search index in the same transaction
+                if self.fts_enabled:
+                    conn.executemany(
+                        self._SQL_FTS_INSERT, [(msg.id, self._index_text(msg.content)) for msg in messages]
                     )
-                )
-                conn.commit()
-            return msg
         except sqlite3.Error as e:
             raise StorageError(f"Failed to save message: {e}")
 
-    def get_history(self, limit: int = 100) -> List[Message]:
-        """Retrieve recent conversation history."""
+        self._bump_version()
+        for listener in self._listeners:
+            try:
+                listener(messages)
+            except Exception as e:
+                print(f"Warning: Memory listener failed: {e}")
+
+    def add_listener(self, callback: Callable[[List[Message]], None]):
+        """
+        Register a callback invoked with every batch of newly stored messages,
+        after they are committed. In write-behind mode it runs on the writer
+        thread, off the request path.
+        """
+        self._listeners.append(callback)
+
+    def add_delete_listener(self, callback: Callable[[Optional[str]], None]):
+        """
+        Register a callback invoked after drop_session() with the session's
+        name, and after clear() with None.
+        """
+        self._delete_listeners.append(callback)
+
+    def _notify_delete(self, session: Optional[str]):
+        for listener in self._delete_listeners:
+            try:
+                listener(session)
+            except Exception as e:
+                print(f"Warning: Memory listener failed: {e}")
+
+    def _writer_loop(self):
+        """Background writer for write-behind mode."""
+        while True:
+            with self._queue_cond:
+                while not self._pending and not self._stopping:
+                    self._queue_cond.wait()
+                if not self._pending:
+                    return  # Stopping and fully drained
+                # Give the batch a moment to fill up unless someone is waiting on it
+                deadline = time.monotonic() + self.flush_interval
+                while (len(self._pending) < self.max_batch
+                       and not self._flush_requested and not self._stopping):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._queue_cond.wait(remaining)
+                batch = [self._pending.popleft() for _ in range(min(self.max_batch, len(self._pending)))]
+                self._in_flight = len(batch)
+                self._queue_cond.notify_all()  # Wake producers blocked on backpressure
+
+            try:
+                self._write_batch(batch)
+            except StorageError as e:
+                print(f"Warning: Write-behind flush failed, {len(batch)} messages lost. Error: {e}")
+                self._writer_error = e
+
+            with self._queue_cond:
+                self._in_flight = 0
+                if not self._pending:
+                    self._flush_requested = False
+                self._queue_cond.notify_all()
+
+    def flush(self):
+        """Block until every queued message has been written (write-behind mode)."""
+        if not self._writer or threading.current_thread() is self._writer:
+            return  # Nothing queued, or called from a listener on the writer itself
+        with self._queue_cond:
+            if self._pending or self._in_flight:
+                self._flush_requested = True
+                self._queue_cond.notify_all()
+                while self._pending or self._in_flight:
+                    self._queue_cond.wait()
+            error, self._writer_error = self._writer_error, None
+        if error:
+            raise error
+
+    def get_history(self, limit: int = 100, session: Optional[str] = None) -> List[Message]:
+        """
+        Retrieve the most recent `limit` messages of a session, oldest first.
+
+        Rows are read newest-first off the (session_id, id) index and
+        reversed, so the cost is O(limit) regardless of how much history is
+        stored.
+        """
+        self.flush()
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT role, content, timestamp, metadata FROM messages ORDER BY timestamp ASC LIMIT ?", 
-                    (limit,)
-                )
-                rows = cursor.fetchall()
-                
-                messages = []
-                for row in rows:
-                    content = self._decrypt(row['content'])
-                    metadata = json.loads(row['metadata']) if row['metadata'] else {}
-                    messages.append(Message(
-                        role=row['role'],
-                        content=content,
-                        timestamp=row['timestamp'],
-                        metadata=metadata
-                    ))
-                return messages
+            rows = self._connect().execute(self._SQL_TAIL, (session or self.session, limit)).fetchall()
+            rows.reverse()
+            return [self._row_to_message(row) for row in rows]
         except sqlite3.Error as e:
             raise StorageError(f"Failed to retrieve history: {e}")
 
-    def get_context_string(self, limit: int = 50) -> str:
+    def get_since(self, last_id: int, limit: int = 500, session: Optional[str] = None) -> List[Message]:
+        """
+        Retrieve a session's messages stored after `last_id`, oldest first.
+
+        Together with `version` this forms a change feed: remember the id of
+        the last message you have seen and fetch only what came after it.
+        """
+        self.flush()
+        try:
+            rows = self._connect().execute(
+                self._SQL_SINCE, (session or self.session, last_id or 0, limit)
+            ).fetchall()
+            return [self._row_to_message(row) for row in rows]
+        except sqlite3.Error as e:
+            raise StorageError(f"Failed to retrieve new messages: {e}")
+
+    def get_by_ids(self, ids: List[int], session: Optional[str] = None) -> List[Message]:
+        """
+        Fetch specific messages, in the order of `ids`. Ids that no longer
+        exist (or belong to another session, if one is given) are skipped.
+        """
+        if not ids:
+            return []
+        self.flush()
+        placeholders = ",".join("?" * len(ids))
+        sql = f"SELECT id, session_id, role, content, timestamp, metadata, tokens FROM messages WHERE id IN ({placeholders})"
+        params = list(ids)
+        if session:
+            sql += " AND session_id = ?"
+            params.append(session)
+        try:
+            rows = {row["id"]: row for row in self._connect().execute(sql, params)}
+            return [self._row_to_message(rows[i]) for i in ids if i in rows]
+        except sqlite3.Error as e:
+            raise StorageError(f"Failed to retrieve messages: {e}")
+
+    def iter_messages(self, after_id: int = 0, batch: int = 1000) -> Iterator[Message]:
+        """Iterate over every stored message with id > after_id, across all sessions."""
+        self.flush()
+        while True:
+            try:
+                rows = self._connect().execute(
+                    "SELECT id, session_id, role, content, timestamp, metadata, tokens FROM messages "
+                    "WHERE id > ? ORDER BY id LIMIT ?",
+                    (after_id, batch)
+                ).fetchall()
+            except sqlite3.Error as e:
+                raise StorageError(f"Failed to scan messages: {e}")
+            if not rows:
+                return
+            for row in rows:
+                yield self._row_to_message(row)
+            after_id = rows[-1]["id"]
+
+    def last_id(self) -> int:
+        """Largest message id ever assigned (0 for a new database). Ids are never reused."""
+        try:
+            row = self._connect().execute("SELECT seq FROM sqlite_sequence WHERE name = 'messages'").fetchone()
+        except sqlite3.Error as e:
+            raise StorageError(f"Failed to read the last message id: {e}")
+        return row[0] if row else 0
+
+    @property
+    def version(self) -> int:
+        """
+        Monotonically increasing counter, bumped on every write through this
+        Memory instance. Compare against a previously seen value to skip
+        reloading when nothing changed.
+        """
+        return self._version
+
+    def _bump_version(self):
+        with self._version_lock:
+            self._version += 1
+
+    def _row_to_message(self, row: sqlite3.Row) -> Message:
+        """Decode a stored row back into a Message."""
+        return Message(
+            role=row['role'],
+            content=self._decrypt(row['content']),
+            timestamp=row['timestamp'],
+            metadata=json.loads(row['metadata']) if row['metadata'] else {},
+            id=row['id'],
+            session_id=row['session_id'],
+            tokens=row['tokens'] or 0
+        )
+
+    def get_context_string(self, limit: int = 50, session: Optional[str] = None) -> str:
         """Get history formatted as a context string for LLM."""
-        msgs = self.get_history(limit)
+        msgs = self.get_history(limit, session)
         return "\n".join([f"{m.role.upper()}: {m.content}" for m in msgs])
 
+    def search(self, query: str, limit: int = 10, session: Optional[str] = None) -> List[Message]:
+        """
+        Ranked keyword search (BM25) over stored messages.
+
+        Every word of `query` must appear in a result. Unlike the other
+        methods, `session=None` searches all sessions.
+
+        With encryption enabled, words are matched through their keyed hashes:
+        the database never holds plaintext, but the index does reveal which
+        messages share a word and how often, and only whole-word matching is
+        possible (no prefix or fuzzy search).
+        """
+        if not self.fts_enabled:
+            raise StorageError("Full-text search is unavailable: SQLite was built without FTS5")
+
+        expression = self._match_expression(query)
+        if not expression:
+            return []
+
+        self.flush()
+        try:
+            conn = self._connect()
+            if session:
+                rows = conn.execute(self._SQL_SEARCH_SESSION, (expression, session, limit)).fetchall()
+            else:
+                rows = conn.execute(self._SQL_SEARCH, (expression, limit)).fetchall()
+            return [self._row_to_message(row) for row in rows]
+        except sqlite3.Error as e:
+            raise StorageError(f"Failed to search memory: {e}")
+
+    def get_summary(self, session: Optional[str] = None) -> Optional[Summary]:
+        """Load a session's rolling summary, if one has been saved."""
+        session = session or self.session
+        try:
+            row = self._connect().execute(
+                "SELECT content, through_id, folds, updated FROM summaries WHERE session_id = ?", (session,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            raise StorageError(f"Failed to load summary: {e}")
+        if row is None:
+            return None
+        return Summary(
+            session_id=session,
+            content=self._decrypt(row["content"]),
+            through_id=row["through_id"],
+            folds=row["folds"],
+            updated=row["updated"]
+        )
+
+    def save_summary(self, summary: Summary):
+        """Store (or replace) a session's rolling summary."""
+        summary.updated = time.time()
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO summaries (session_id, content, through_id, folds, updated) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (summary.session_id, self._encrypt(summary.content), summary.through_id,
+                     summary.folds, summary.updated)
+                )
+        except sqlite3.Error as e:
+            raise StorageError(f"Failed to save summary: {e}")
+
+    def list_sessions(self) -> List[str]:
+        """Names of all sessions that have stored messages."""
+        self.flush()
+        try:
+            # DISTINCT over the leading index column: an index-only scan
+            rows = self._connect().execute("SELECT DISTINCT session_id FROM messages").fetchall()
+            return [row[0] for row in rows]
+        except sqlite3.Error as e:
+            raise StorageError(f"Failed to list sessions: {e}")
+
+    def drop_session(self, session: Optional[str] = None):
+        """Delete one session's messages; other sessions are untouched."""
+        # Queued messages are written first, and the writer waits for the
+        # delete, so no batch can land after it and revive the session
+        self.flush()
+        try:
+            conn = self._connect()
+            with self._write_lock, conn:
+                if self.fts_enabled:
+                    conn.execute(self._SQL_FTS_DROP_SESSION, (session or self.session,))
+                conn.execute(self._SQL_DROP_SESSION, (session or self.session,))
+                conn.execute("DELETE FROM summaries WHERE session_id = ?", (session or self.session,))
+            self._bump_version()
+        except sqlite3.Error as e:
+            raise StorageError(f"Failed to drop session: {e}")
+        self._notify_delete(session or self.session)
+
     def clear(self):
-        """Clear all memory."""
+        """Clear all memory, across every session."""
+        self.flush()
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("DELETE FROM messages")
-                conn.commit()
+            conn = self._connect()
+            with self._write_lock, conn:
+                if self.fts_enabled:
+                    conn.execute(self._SQL_FTS_CLEAR)
+                conn.execute(self._SQL_CLEAR)
+                conn.execute("DELETE FROM summaries")
+            self._bump_version()
         except sqlite3.Error as e:
             raise StorageError(f"Failed to clear memory: {e}")
+        self._notify_delete(None)
@@ -0,0 +1,267 @@
+"""
+Model health registry: per-model error rate and latency, and circuit
+breakers that keep failing models out of the way.
+
+Each model tracks an exponentially weighted error rate (decaying while the
+model is not used) and time to first byte. After `failure_threshold`
+consecutive failures, a 404, or a Retry-After from the API, the model's
+circuit opens and it moves to the back of the fallback order until a
+cooldown (doubling on every re-open) has passed. Then the circuit is
+half-open: the next request is a probe, which closes the circuit on
+success or re-opens it on failure.
+
+State is kept in a small JSON file so a model that failed all day is not
+retried first after a restart.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+from pulse.exceptions import InferenceError
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+@dataclass
+class ModelHealth:
+    """Observed health of one model. Times are Unix timestamps."""
+    error_rate: float = 0.0  # EWMA of failures (1) and successes (0)
+    latency_ms: float = 0.0  # EWMA of time to first byte
+    consecutive_failures: int = 0
+    open_until: float = 0.0  # Circuit is open until then (0: closed)
+    cooldown_s: float = 0.0  # Length of the last open period
+    probe_started: float = 0.0  # When the half-open probe was handed out
+    updated: float = 0.0
+    requests: int = 0
+    failures: int = 0
+
+
+class ModelHealthRegistry:
+    """
+    Thread-safe health registry shared by the LLM clients.
+
+    `order(models)` sorts a fallback list by health (keeping the configured
+    order among equally healthy models); clients report every outcome with
+    `record_success` / `record_failure`.
+    """
+
+    def __init__(self, path: Optional[str] = None, alpha: float = 0.3,
+                 failure_threshold: int = 3, cooldown_s: float = 30.0, max_cooldown_s: float = 900.0,
+                 degraded_error_rate: float = 0.5, slow_ms: float = 15000.0,
+                 decay_half_life_s: float = 600.0, probe_timeout_s: float = 60.0,
+                 save_interval_s: float = 30.0):
+        self.path = path
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.cooldown_s = cooldown_s
+        self.max_cooldown_s = max_cooldown_s
+        self.degraded_error_rate = degraded_error_rate
+        self.slow_ms = slow_ms
+        self.decay_half_life_s = decay_half_life_s
+        self.probe_timeout_s = probe_timeout_s
+        self.save_interval_s = save_interval_s
+        self._models: Dict[str, ModelHealth] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_save = 0.0
+        if path:
+            self.load()
+            atexit.register(self.save)
+
+    # --- Queries ---
+
+    def get(self, model: str) -> ModelHealth:
+        """A snapshot of `model`'s health."""
+        with self._lock:
+            health = self._models.get(model) or ModelHealth()
+            return ModelHealth(**asdict(health))
+
+    def state(self, model: str, now: Optional[float] = None) -> str:
+        """CLOSED, OPEN or HALF_OPEN."""
+        with self._lock:
+            return self._state(self._models.get(model), now or time.time())
+
+    def _state(self, health: Optional[ModelHealth], now: float) -> str:
+        if health is None or not health.open_until:
+            return CLOSED
+        return OPEN if now < health.open_until else HALF_OPEN
+
+    def _error_rate(self, health: ModelHealth, now: float) -> float:
+        """Error rate decayed by the time since the model was last used."""
+        idle = max(0.0, now - health.updated)
+        return health.error_rate * 0.5 ** (idle / self.decay_half_life_s)
+
+    def order(self, models: List[str]) -> List[str]:
+        """
+        `models` sorted by health: healthy and half-open (probe) models in
+        their configured order, then degraded ones, then open circuits.
+
+        Open models stay in the list so a request is never refused outright.
+        A half-open model ranks as healthy until a request is actually sent
+        to it (`begin_attempt`); that request is the probe, and others treat
+        the model as open until it reports back (or times out).
+        """
+        now = time.time()
+        ranks = {}
+        with self._lock:
+            for model in models:
+                health = self._models.get(model)
+                state = self._state(health, now)
+                if state == CLOSED:
+                    degraded = health is not None and (
+                        self._error_rate(health, now) >= self.degraded_error_rate
+                        or health.latency_ms >= self.slow_ms
+                    )
+                    ranks[model] = 1 if degraded else 0
+                elif state == HALF_OPEN and now - health.probe_started > self.probe_timeout_s:
+                    ranks[model] = 0
+                else:
+                    ranks[model] = 2
+        return sorted(models, key=lambda m: ranks[m])
+
+    # --- Updates ---
+
+    def begin_attempt(self, model: str) -> Optional[float]:
+        """
+        Call as a request to `model` is sent. If its circuit is half-open the
+        request is the probe, and a token for `abandon_attempt` is returned.
+        """
+        now = time.time()
+        with self._lock:
+            health = self._models.get(model)
+            if self._state(health, now) == HALF_OPEN:
+                health.probe_started = now
+                return now
+        return None
+
+    def abandon_attempt(self, model: str, probe: Optional[float]):
+        """
+        Call when a request ends without an outcome (e.g. it lost a hedge),
+        with its `begin_attempt` token, to free the probe if it still holds it.
+        """
+        if probe is None:
+            return
+        with self._lock:
+            health = self._models.get(model)
+            if health is not None and health.probe_started == probe:
+                health.probe_started = 0.0
+
+    def _entry(self, model: str, now: float) -> ModelHealth:
+        health = self._models.get(model)
+        if health is None:
+            health = self._models[model] = ModelHealth(updated=now)
+        health.error_rate = self._error_rate(health, now)
+        health.updated = now
+        health.requests += 1
+        self._dirty = True
+        return health
+
+    def record_success(self, model: str, latency_ms: float):
+        now = time.time()
+        with self._lock:
+            health = self._entry(model, now)
+            closed = bool(health.open_until)
+            if closed:
+                # Probe succeeded: the model is back, forget its bad streak
+                health.open_until = health.cooldown_s = health.probe_started = 0.0
+                health.error_rate = 0.0
+            health.error_rate *= 1 - self.alpha
+            health.latency_ms = latency_ms if not health.latency_ms else (
+                self.alpha * latency_ms + (1 - self.alpha) * health.latency_ms
+            )
+            health.consecutive_failures = 0
+        self._maybe_save(urgent=closed)
+
+    def record_failure(self, model: str, error: Optional[InferenceError] = None):
+        now = time.time()
+        status = getattr(error, "status_code", None)
+        retry_after = getattr(error, "retry_after", None)
+        tripped = False
+        with self._lock:
+            health = self._entry(model, now)
+            health.failures += 1
+            health.error_rate = self.alpha + (1 - self.alpha) * health.error_rate
+            health.consecutive_failures += 1
+
+            if retry_after:
+                # The API said when to come back; that beats our own backoff
+                health.open_until = max(health.open_until, now + retry_after)
+                health.probe_started = 0.0
+                tripped = True
+            elif (health.open_until or status == 404
+                  or health.consecutive_failures >= self.failure_threshold):
+                # Tripped, or a failed half-open probe: back off for longer each time
+                health.cooldown_s = min(self.max_cooldown_s, health.cooldown_s * 2 or self.cooldown_s)
+                health.open_until = now + health.cooldown_s
+                health.probe_started = 0.0
+                tripped = True
+        self._maybe_save(urgent=tripped)
+
+    def reset(self, model: Optional[str] = None):
+        """Forget what was observed about `model` (every model by default)."""
+        with self._lock:
+            if model is None:
+                self._models.clear()
+            else:
+                self._models.pop(model, None)
+            self._dirty = True
+        self.save()
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Health of every known model, with its circuit state."""
+        now = time.time()
+        with self._lock:
+            return {
+                model: {**asdict(health), "state": self._state(health, now),
+                        "error_rate": round(self._error_rate(health, now), 4)}
+                for model, health in self._models.items()
+            }
+
+    # --- Persistence ---
+
+    def _maybe_save(self, urgent: bool = False):
+        """Save circuit changes right away, averages and counters every `save_interval_s`."""
+        if self.path and (urgent or time.time() - self._last_save >= self.save_interval_s):
+            self.save()
+
+    def save(self):
+        """Write the registry to its JSON file (atomically)."""
+        if not self.path or not self._dirty:
+            return
+        with self._lock:
+            data = {model: asdict(health) for model, health in self._models.items()}
+            self._dirty = False
+            self._last_save = time.time()
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "models": data}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ Could not save model health to {self.path}: {e}")
+
+    def load(self):
+        """Read the registry from its JSON file, if there is one."""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            models = {
+                model: ModelHealth(**{k: v for k, v in fields.items() if k in ModelHealth.__dataclass_fields__})
+                for model, fields in data.get("models", {}).items()
+            }
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            print(f"⚠️ Ignoring unreadable model health file {self.path}: {e}")
+            return
+        with self._lock:
+            self._models = models
+            for health in models.values():
+                health.probe_started = 0.0
+            self._last_save = time.time()
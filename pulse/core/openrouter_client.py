@@ -3,24 +3,78 @@ Client for OpenRouter API.
 """
 
 import json
+import queue
+import threading
+import time
 import requests
-from typing import List, Dict, Generator, Any
+from typing import List, Dict, Generator, Any, Optional, Tuple, Callable
 
+from pulse.core.http import (
+    DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE, PhaseTimer, RequestTiming, get_session,
+    parse_retry_after, prewarm
+)
+from pulse.core.model_health import ModelHealthRegistry
+from pulse.core.response_cache import ResponseCache
+from pulse.core.sse import has_value, iter_events, string_value
 from pulse.exceptions import InferenceError
 
 
+# Statuses worth trying the next model for
+RETRY_STATUS_CODES = {400, 402, 404, 408, 429, 500, 502, 503, 504}
+AUTH_STATUS_CODES = {401, 403}
+
+
+class _Attempt:
+    """One model's request within a hedged chat."""
+
+    def __init__(self, model: str):
+        self.model = model
+        self.started = time.perf_counter()
+        self.first_byte = threading.Event()  # Response headers are in
+        self.cancelled = threading.Event()  # Another model won; drop the response
+        self.timing: Optional[RequestTiming] = None
+        self.probe: Optional[float] = None  # Set if this is a half-open circuit's probe
+
+
 class OpenRouterClient:
     """
     Client for interacting with OpenRouter API.
     Handles authentication, model selection, and fallback logic.
+
+    Requests go through the shared keep-alive session (pulse.core.http);
+    `last_timing` holds the phase timings of the latest request.
+
+    Hedging: with `hedge_delay_ms` or `hedge_ttfb_ms` set, chat() does not
+    wait for a slow model to fail before trying the next one. The next
+    fallback is started in parallel once the newest request has run for
+    `hedge_delay_ms`, or has had no response headers for `hedge_ttfb_ms`;
+    the first success wins and the others are cancelled.
+
+    With a `health` registry, the fallback order follows each model's
+    observed health (see pulse.core.model_health) and every outcome is
+    reported back to it. With a `response_cache`, identical cacheable
+    requests are answered (or replayed, for streams) from it.
     """
     
     BASE_URL = "https://openrouter.ai/api/v1"
     
-    def __init__(self, api_key: str, default_model: str, fallback_models: List[str] = None):
+    def __init__(self, api_key: str, default_model: str, fallback_models: List[str] = None,
+                 base_url: Optional[str] = None, pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize: int = DEFAULT_POOL_MAXSIZE, timeout: float = 60,
+                 hedge_delay_ms: float = 0.0, hedge_ttfb_ms: float = 0.0,
+                 health: Optional[ModelHealthRegistry] = None,
+                 response_cache: Optional[ResponseCache] = None):
         self.api_key = api_key
         self.default_model = default_model
         self.fallback_models = fallback_models or []
+        self.base_url = (base_url or self.BASE_URL).rstrip("/")
+        self.timeout = timeout
+        self.hedge_delay_ms = hedge_delay_ms
+        self.hedge_ttfb_ms = hedge_ttfb_ms
+        self.health = health
+        self.response_cache = response_cache
+        self.session = get_session(pool_connections, pool_maxsize)
+        self.last_timing: Optional[RequestTiming] = None
         
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
@@ -29,47 +83,52 @@ class OpenRouterClient:
             "X-Title": "Pulse AI Ecosystem"
         }
 
+    def prewarm(self, connections: int = 1) -> int:
+        """Open pooled connections to the API host before the first request."""
+        return prewarm(self.session, self.base_url, connections)
+
     def chat(self, messages: List[Dict[str, str]], model: str = None, **kwargs) -> Dict[str, Any]:
         """
         Send a chat completion request with robust fallback.
         """
-        # 1. Try specifically requested model first
         target_model = model or self.default_model
-        models_to_try = [target_model]
-        
-        # 2. Append fallback models (avoiding duplicates)
-        for fb in self.fallback_models:
-            if fb != target_model:
-                models_to_try.append(fb)
+        cache_key = self._cache_key(target_model, messages, kwargs)
+        cached = self._cache_lookup(cache_key)
+        if cached is not None:
+            return cached
+
+        models_to_try = self._models_to_try(target_model)
 
         print(f"DEBUG: Attempting models: {models_to_try}")
 
+        if self._hedging and len(models_to_try) > 1:
+            result = self._hedged_chat(models_to_try, messages, **kwargs)
+            if cache_key:
+                self.response_cache.put(cache_key, result)
+            return result
+
         last_error = None
         for m in models_to_try:
             try:
                 # If we are retrying, print a friendly message
-                if m != target_model:
+                if m != models_to_try[0]:
                     print(f"⚠️ Primary model rate-limited/failed. Retrying with: {m}...")
                 
-                return self._make_request(m, messages, **kwargs)
+                attempt = _Attempt(m)
+                result = self._make_request(m, messages, attempt=attempt, **kwargs)
+                # This request's own timing: last_timing may already be another thread's
+                self._record(m, timing=attempt.timing)
+                self.last_timing = attempt.timing
+                if cache_key:
+                    self.response_cache.put(cache_key, result)
+                return result
                 
             except InferenceError as e:
                 last_error = e
-                error_str = str(e).lower()
+                self._record(m, error=e)
                 print(f"❌ Error with model {m}: {e}")
                 
-                # Dynamic Self-Healing:
-                # Retry on:
-                # 1. 429 Rate Limits (temporarily busy)
-                # 2. 400/404 Invalid Model (model deprecated or ID changed)
-                # 3. 5xx Server Errors (upstream outage)
-                should_retry = False
-                for indicator in ["429", "rate limit", "temporarily", "400", "404", "not a valid model", "not found"]:
-                    if indicator in error_str:
-                        should_retry = True
-                        break
-                
-                if should_retry:
+                if self._should_retry(e):
                     continue  # Try next model
                 else:
                     raise e  # Re-raise other errors (e.g. auth, context length)
@@ -77,150 +136,342 @@ class OpenRouterClient:
         # If we exhausted all options
         raise InferenceError(f"All models failed. Last error: {last_error}")
 
-    def _make_request(self, model: str, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
-        """Internal method to execute the API call."""
+    def _hedged_chat(self, models: List[str], messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
+        """
+        chat() with the fallbacks raced against slow models.
+
+        Each request runs on its own daemon thread. A cancelled request is
+        dropped as soon as its headers arrive; one still waiting for them
+        finishes in the background and is discarded.
+        """
+        results = queue.Queue()
+        waiting = list(models)
+        running: List[_Attempt] = []
+        last_error = None
+
+        def launch() -> _Attempt:
+            attempt = _Attempt(waiting.pop(0))
+            running.append(attempt)
+
+            def run():
+                try:
+                    result = self._make_request(attempt.model, messages, attempt=attempt, **kwargs)
+                    results.put((attempt, result, None))
+                except InferenceError as e:
+                    results.put((attempt, None, e))
+
+            threading.Thread(target=run, name=f"pulse-hedge-{attempt.model}", daemon=True).start()
+            return attempt
+
+        newest = launch()
+        try:
+            while running:
+                wait = self._hedge_wait(newest) if waiting else None
+                if wait is not None and wait <= 0:
+                    print(f"⏱️ {newest.model} is slow. Racing it with: {waiting[0]}...")
+                    newest = launch()
+                    continue
+                try:
+                    attempt, result, error = results.get(timeout=wait)
+                except queue.Empty:
+                    continue
+                running.remove(attempt)
+                self._record(attempt.model, timing=attempt.timing, error=error)
+                if error is None:
+                    self.last_timing = attempt.timing
+                    return result
+
+                last_error = error
+                print(f"❌ Error with model {attempt.model}: {error}")
+                if not self._should_retry(error):
+                    raise error
+                if waiting and not running:
+                    print(f"⚠️ Primary model rate-limited/failed. Retrying with: {waiting[0]}...")
+                    newest = launch()
+        finally:
+            for attempt in running:
+                attempt.cancelled.set()
+                self._abandon(attempt)
+
+        raise InferenceError(f"All models failed. Last error: {last_error}")
+
+    @property
+    def _hedging(self) -> bool:
+        return bool(self.hedge_delay_ms or self.hedge_ttfb_ms)
+
+    def _hedge_wait(self, attempt: _Attempt) -> Optional[float]:
+        """Seconds until the next model should be raced against `attempt` (None: not at all)."""
+        deadlines = []
+        if self.hedge_delay_ms:
+            deadlines.append(self.hedge_delay_ms)
+        if self.hedge_ttfb_ms and not attempt.first_byte.is_set():
+            deadlines.append(self.hedge_ttfb_ms)
+        if not deadlines:
+            return None
+        elapsed_ms = (time.perf_counter() - attempt.started) * 1000
+        return (min(deadlines) - elapsed_ms) / 1000
+
+    def _models_to_try(self, target_model: str) -> List[str]:
+        """
+        The requested model first, then the fallbacks (avoiding duplicates),
+        reordered by the health registry if there is one.
+        """
+        models = [target_model] + [fb for fb in self.fallback_models if fb != target_model]
+        return self.health.order(models) if self.health else models
+
+    def _cache_key(self, model: str, messages: List[Dict[str, str]], params: Dict[str, Any]) -> Optional[str]:
+        """Response cache key of a request (None: not cached)."""
+        if self.response_cache is None:
+            return None
+        return self.response_cache.key(model, messages, params)
+
+    def _cache_lookup(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """The cached result for `key`, if any. A hit made no request, so it has no timing."""
+        if self.response_cache is None:
+            return None
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            self.last_timing = None
+        return cached
+
+    def _begin(self, model: str, attempt: Optional[_Attempt] = None):
+        """Tell the health registry a request to `model` is being sent."""
+        if self.health is not None:
+            probe = self.health.begin_attempt(model)
+            if attempt is not None:
+                attempt.probe = probe
+
+    def _abandon(self, attempt: _Attempt):
+        """Tell the health registry `attempt` ended without an outcome."""
+        if self.health is not None:
+            self.health.abandon_attempt(attempt.model, attempt.probe)
+
+    def _record(self, model: str, timing: Optional[RequestTiming] = None,
+                error: Optional[InferenceError] = None):
+        """Report a request's outcome to the health registry."""
+        if self.health is None:
+            return
+        if error is None:
+            self.health.record_success(model, timing.ttfb_ms if timing else 0.0)
+        elif error.status_code not in AUTH_STATUS_CODES:  # Bad keys are not the model's fault
+            self.health.record_failure(model, error)
+
+    @staticmethod
+    def _should_retry(error: InferenceError) -> bool:
+        """
+        Dynamic Self-Healing: whether the next model should be tried.
+
+        Retry on:
+        1. 429 Rate Limits (temporarily busy)
+        2. 400/404 Invalid Model (model deprecated or ID changed)
+        3. 402 (out of credits for a paid model) and 5xx provider errors
+        Other errors (e.g. auth) would fail on every model. Errors without a
+        status code (network, parsing) are judged by their message.
+        """
+        if error.status_code is not None:
+            return error.status_code in RETRY_STATUS_CODES
+        error_str = str(error).lower()
+        return any(
+            indicator in error_str
+            for indicator in ["429", "rate limit", "temporarily", "400", "404", "not a valid model", "not found"]
+        )
+
+    @staticmethod
+    def _build_payload(model: str, messages: List[Dict[str, str]], stream: bool = False, **kwargs) -> Dict[str, Any]:
         payload = {
             "model": model,
             "messages": messages,
         }
-        
+        if stream:
+            payload["stream"] = True
         # Add optional parameters like 'reasoning', 'temperature', etc.
-        for key, value in kwargs.items():
-            payload[key] = value
+        payload.update(kwargs)
+        return payload
+
+    @staticmethod
+    def _api_error(status_code: int, text: str, headers: Optional[Any] = None) -> InferenceError:
+        """InferenceError for a non-200 response, with the API's message if it sent one."""
+        retry_after = parse_retry_after(headers.get("Retry-After")) if headers is not None else None
+        try:
+            error_msg = json.loads(text).get('error', {}).get('message', text)
+            return InferenceError(f"API Error {status_code}: {error_msg}", status_code, retry_after)
+        except (json.JSONDecodeError, AttributeError):
+            return InferenceError(f"HTTP Error {status_code}: {text}", status_code, retry_after)
+
+    @staticmethod
+    def _parse_completion(data: Dict[str, Any], model: str) -> Dict[str, Any]:
+        if "choices" not in data or not data["choices"]:
+            raise InferenceError("Invalid API response: no choices found")
+            
+        choice = data["choices"][0]
+        message = choice.get("message", {})
+        return {
+            "content": message.get("content", ""),
+            "model": data.get("model", model),
+            "usage": data.get("usage", {}),
+            "reasoning_details": message.get("reasoning_details")
+        }
+
+    @staticmethod
+    def _parse_stream_data(data_str: str) -> Tuple[Optional[str], bool]:
+        """Content carried by one SSE event's data (or None), and whether it was [DONE]."""
+        if data_str == "[DONE]":
+            return None, True
+        # Role-only, empty and usage deltas are skipped without decoding,
+        # and a plain content delta is read without decoding the rest
+        if not has_value(data_str, '"content"'):
+            return None, False
+        found, content = string_value(data_str, '"content"')
+        if found:
+            return content or None, False
+        try:
+            data = json.loads(data_str)
+        except json.JSONDecodeError:
+            return None, False
+        if "choices" in data and data["choices"]:
+            delta = data["choices"][0].get("delta", {})
+            return delta.get("content") or None, False
+        return None, False
+
+    def _make_request(self, model: str, messages: List[Dict[str, str]],
+                      attempt: Optional[_Attempt] = None, **kwargs) -> Dict[str, Any]:
+        """Internal method to execute the API call (`attempt` when hedged)."""
+        self._begin(model, attempt)
+        payload = self._build_payload(model, messages, **kwargs)
         
         try:
-            response = requests.post(
-                f"{self.BASE_URL}/chat/completions",
+            timer = PhaseTimer()
+            response = self.session.post(
+                f"{self.base_url}/chat/completions",
                 headers=self.headers,
                 json=payload,
-                timeout=60
+                stream=True,  # Separates the header wait from the body read
+                timeout=self.timeout
             )
+            timer.first_byte()
+            if attempt is not None:
+                attempt.first_byte.set()
+                if attempt.cancelled.is_set():
+                    response.close()
+                    raise InferenceError(f"Request for model {model} cancelled")
             
             # Check for error responses that are valid JSON but contain error info
             if response.status_code != 200:
-                try:
-                    error_data = response.json()
-                    error_msg = error_data.get('error', {}).get('message', response.text)
-                    raise InferenceError(f"API Error {response.status_code}: {error_msg}")
-                except json.JSONDecodeError:
-                    raise InferenceError(f"HTTP Error {response.status_code}: {response.text}")
+                raise self._api_error(response.status_code, response.text, response.headers)
             
             data = response.json()
+            timing = timer.done()
+            if attempt is None:
+                self.last_timing = timing
+            else:
+                attempt.timing = timing
             
-            if "choices" not in data or not data["choices"]:
-                raise InferenceError("Invalid API response: no choices found")
-                
-            choice = data["choices"][0]
-            message = choice.get("message", {})
-            content = message.get("content", "")
-            reasoning_details = message.get("reasoning_details")
-            
-            return {
-                "content": content,
-                "model": data.get("model", model),
-                "usage": data.get("usage", {}),
-                "reasoning_details": reasoning_details
-            }
+            result = self._parse_completion(data, model)
+            result["timing"] = timing.to_dict()
+            return result
             
         except requests.exceptions.Timeout:
              raise InferenceError(f"Request timed out for model {model}")
         except requests.exceptions.RequestException as e:
             raise InferenceError(f"Network error: {str(e)}")
 
-    def stream(self, messages: List[Dict[str, str]], model: str = None, **kwargs) -> Generator[str, None, None]:
+    def stream(self, messages: List[Dict[str, str]], model: str = None,
+               on_timing: Optional[Callable[[Optional[RequestTiming]], None]] = None,
+               **kwargs) -> Generator[str, None, None]:
         """
         Stream chat completion chunks with robust fallback.
+
+        `on_timing` is called with this stream's timing once it is read to
+        the end (None when it was served from the response cache).
         """
         target_model = model or self.default_model
-        models_to_try = [target_model]
-        
-        # Append fallback models
-        for fb in self.fallback_models:
-            if fb != target_model:
-                models_to_try.append(fb)
+        cache_key = self._cache_key(target_model, messages, kwargs)
+        cached = self._cache_lookup(cache_key)
+        if cached is not None:
+            yield from self.response_cache.chunks(cached)
+            if on_timing is not None:
+                on_timing(None)
+            return
+
+        models_to_try = self._models_to_try(target_model)
         
         last_error = None
         
         for m in models_to_try:
             try:
-                if m != target_model:
+                if m != models_to_try[0]:
                      # Yield a system notice if we are switching models mid-stream context
                      # (Though we can't easily yield a 'system notice' as text content without confusing the user, 
                      # we'll just log it for now)
                      print(f"⚠️ Streaming fallback: switching to {m}...")
 
                 # Create the generator
-                stream_generator = self._make_stream_request(m, messages, **kwargs)
+                attempt = _Attempt(m)
+                stream_generator = self._make_stream_request(m, messages, attempt=attempt, **kwargs)
                 
                 # Yield from the generator
                 # If this raises an exception immediately, we catch it below.
                 # If it raises halfway through, the stream breaks (hard to recover mid-stream), 
                 # but at least initial connection is protected.
-                yield from stream_generator
+                chunks = []
+                for chunk in stream_generator:
+                    chunks.append(chunk)
+                    yield chunk
+                self._record(m, timing=attempt.timing)
+                if on_timing is not None:
+                    on_timing(attempt.timing)
+                if cache_key:
+                    # Only streams read to the end get here
+                    self.response_cache.put(cache_key, {"content": "".join(chunks), "model": m}, chunks)
                 return
 
+            except GeneratorExit:
+                self._abandon(attempt)  # Closed by the consumer: no outcome to report
+                raise
+
             except InferenceError as e:
                 last_error = e
-                error_str = str(e).lower()
+                self._record(m, error=e)
                 
-                # Dynamic Self-Healing for Streams:
-                # Catch 429 (Rate Limit), 400 (Invalid Model), 404 (Not Found)
-                should_retry = False
-                for indicator in ["429", "rate limit", "temporarily", "400", "404", "not a valid model", "not found"]:
-                    if indicator in error_str:
-                        should_retry = True
-                        break
-
-                if should_retry:
+                # Dynamic Self-Healing for Streams
+                if self._should_retry(e):
                     continue
                 else:
                     raise e
                     
         raise InferenceError(f"All streaming models failed. Last error: {last_error}")
 
-    def _make_stream_request(self, model: str, messages: List[Dict[str, str]], **kwargs) -> Generator[str, None, None]:
-        """Internal method for streaming request."""
-        payload = {
-            "model": model,
-            "messages": messages,
-            "stream": True,
-            **kwargs
-        }
+    def _make_stream_request(self, model: str, messages: List[Dict[str, str]],
+                             attempt: Optional[_Attempt] = None, **kwargs) -> Generator[str, None, None]:
+        """Internal method for streaming request (`attempt` receives its timing)."""
+        self._begin(model, attempt)
+        payload = self._build_payload(model, messages, stream=True, **kwargs)
         
+        timer = PhaseTimer()
         try:
-            response = requests.post(
-                f"{self.BASE_URL}/chat/completions",
+            with self.session.post(
+                f"{self.base_url}/chat/completions",
                 headers=self.headers,
                 json=payload,
                 stream=True,
-                timeout=60
-            )
-            
-            if response.status_code != 200:
-                # Try to get error text
-                try:
-                    error_json = response.json()
-                    error_msg = error_json.get('error', {}).get('message', response.text)
-                except:
-                    error_msg = response.text
-                raise InferenceError(f"API Error {response.status_code}: {error_msg}")
+                timeout=self.timeout
+            ) as response:
+                timer.first_byte()
+                
+                if response.status_code != 200:
+                    raise self._api_error(response.status_code, response.text, response.headers)
                 
-            for line in response.iter_lines():
-                if line:
-                    line = line.decode('utf-8')
-                    if line.startswith("data: "):
-                        data_str = line[6:]
-                        if data_str == "[DONE]":
-                            break
-                        try:
-                            data = json.loads(data_str)
-                            if "choices" in data and data["choices"]:
-                                delta = data["choices"][0].get("delta", {})
-                                content = delta.get("content", "")
-                                if content:
-                                    yield content
-                        except json.JSONDecodeError:
-                            continue
+                done = False
+                for event in iter_events(response.raw):
+                    # Keep reading past [DONE] so the connection goes back to the pool
+                    if not done:
+                        content, done = self._parse_stream_data(event.data)
+                        if content:
+                            yield content
                             
         except requests.exceptions.RequestException as e:
             raise InferenceError(f"Stream network error: {str(e)}")
+        finally:
+            self.last_timing = timer.done()
+            if attempt is not None:
+                attempt.timing = self.last_timing
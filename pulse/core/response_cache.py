@@ -0,0 +1,88 @@
+"""
+Response cache for LLM requests.
+
+Identical requests (same model, messages and parameters) are answered
+from a TieredCache instead of the API. Cached streams are replayed chunk
+by chunk, so a consumer of `stream()` sees the same kind of generator
+either way.
+
+Only deterministic requests (temperature 0) are cached by default; with
+sampling, a repeated request is expected to get a different answer, so
+caching those must be asked for with `any_temperature`. Brain sends no
+temperature unless `llm_temperature` is configured, so by default its
+turns are not cached.
+"""
+
+import hashlib
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+from pulse.core.cache import TieredCache
+
+# Replay chunks for entries stored from chat(): a word and its trailing space
+_CHUNK_RE = re.compile(r"\S+\s*|\s+")
+
+
+def split_chunks(text: str) -> List[str]:
+    """Stream-like chunks of a complete text: each word with its trailing space."""
+    return _CHUNK_RE.findall(text)
+
+
+class ResponseCache:
+    """Caches chat completions keyed by a canonical hash of the request."""
+
+    def __init__(self, cache: TieredCache, any_temperature: bool = False):
+        self.cache = cache
+        self.any_temperature = any_temperature
+
+    def cacheable(self, params: Dict[str, Any]) -> bool:
+        """Whether a request with `params` may be answered from the cache."""
+        if self.any_temperature:
+            return True
+        # No temperature means the provider's default, which samples
+        try:
+            return params.get("temperature") is not None and float(params["temperature"]) == 0.0
+        except (TypeError, ValueError):
+            return False
+
+    def key(self, model: str, messages: List[Dict[str, str]], params: Dict[str, Any]) -> Optional[str]:
+        """Cache key of a request, or None if it must not be cached."""
+        if not self.cacheable(params):
+            return None
+        canonical = json.dumps(
+            {"model": model, "messages": messages, "params": params},
+            sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """The cached result for `key` (marked `cached`), if any."""
+        if key is None:
+            return None
+        value = self.cache.get(key)
+        if value is None:
+            return None
+        try:
+            entry = json.loads(value)
+        except ValueError:
+            return None
+        entry["cached"] = True
+        return entry
+
+    def put(self, key: Optional[str], result: Dict[str, Any], chunks: Optional[List[str]] = None):
+        """Store a successful result; `chunks` keeps a stream's chunking for replay."""
+        if key is None or not result.get("content"):
+            return
+        entry = {name: result.get(name) for name in ("content", "model", "usage", "reasoning_details")}
+        if chunks:
+            entry["chunks"] = chunks
+        self.cache.set(key, json.dumps(entry))
+
+    @staticmethod
+    def chunks(entry: Dict[str, Any]) -> List[str]:
+        """Chunks to replay a cached entry as a stream."""
+        return entry.get("chunks") or split_chunks(entry.get("content") or "")
+
+    def stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
@@ -0,0 +1,251 @@
+"""
+Semantic response cache: answers near-duplicate queries without the LLM.
+
+Past user queries are embedded into a bounded in-memory index, together
+with the answer they got. A new query whose embedding is within
+`threshold` cosine similarity of a cached one, asked under the same
+context fingerprint (model, system prompt and the last few turns), is
+answered from the cache. "what time is it", "What's the time now?" and
+STT variations of either all land on the same entry.
+
+Only exchanges that are safe to reuse are stored: short, self-contained
+queries (not one or two words, no follow-up words like "that", "again"
+or "another", no "summarize" or "what do you mean") whose answer did
+not lean on recalled conversation. Entries expire after `ttl`
+seconds; when the index is full the least recently used one is evicted.
+"""
+
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from pulse.core.embeddings import Embedder, NUMPY_AVAILABLE
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+_WORD_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+_CONTRACTIONS = {
+    "what's": "what is", "whats": "what is", "where's": "where is", "who's": "who is",
+    "how's": "how is", "when's": "when is", "it's": "it is", "that's": "that is",
+    "there's": "there is", "i'm": "i am", "you're": "you are", "can't": "can not",
+    "won't": "will not", "don't": "do not", "doesn't": "does not", "isn't": "is not",
+    "aren't": "are not", "didn't": "did not", "shouldn't": "should not", "wouldn't": "would not",
+}
+
+# Words that carry no meaning for matching. Question words and negations
+# are deliberately absent: "when" vs "where" or "not" must not match.
+_STOPWORDS = {
+    "a", "an", "the", "is", "are", "was", "were", "be", "am", "do", "does", "did",
+    "to", "of", "in", "on", "for", "at", "by", "with", "me", "my", "i", "you", "your",
+    "can", "could", "would", "will", "please", "now", "right", "currently", "just",
+    "tell", "give", "hey", "hi", "ok", "okay", "so", "um", "uh", "well", "pulse", "it",
+}
+
+# Follow-ups that only make sense against the conversation so far
+_CONTEXT_WORDS = {
+    "that", "this", "these", "those", "them", "they", "he", "she", "him", "her", "his",
+    "again", "another", "more", "else", "previous", "earlier", "above", "same", "continue",
+    "also", "too", "instead", "then", "it",
+}
+# "it" is a follow-up in "translate it" but not in "what time is it"
+_DUMMY_IT_RE = re.compile(r"\b(is it|it is)\b")
+
+# Requests about the previous answer: "summarize", "translate to french", "what do you mean"
+_FOLLOW_UP_RE = re.compile(
+    r"^(please )?(summari[sz]e|explain|elaborate|expand|rephrase|simplify|shorten|translate|repeat)"
+    r"( (to|in|into) [a-z]+)?( please)?$"
+    r"|\byou mean\b|^go on\b|^keep going\b"
+)
+
+# Answers that point back into the conversation
+_CONVERSATIONAL_ANSWER_RE = re.compile(
+    r"\b(as (i|we) (said|mentioned|discussed)|you (said|mentioned|told me)|earlier|previously)\b", re.I
+)
+
+
+def _words(text: str) -> List[str]:
+    words = []
+    for word in _WORD_RE.findall(text.lower().replace("’", "'")):
+        words.extend(_CONTRACTIONS.get(word, word).split())
+    return words
+
+
+def normalize_query(text: str) -> List[str]:
+    """Content words of a query: lower-cased, contractions expanded, stopwords dropped."""
+    return [w for w in _words(text) if w not in _STOPWORDS]
+
+
+def reusable_query(text: str, max_words: int = 24, min_words: int = 3) -> bool:
+    """
+    Whether a query stands on its own, so its answer can be reused. Very
+    short queries ("why?", "yes", "is it safe?") rarely do.
+    """
+    words = _words(text)
+    if len(words) < min_words or len(words) > max_words or len(normalize_query(text)) < 2:
+        return False
+    if _FOLLOW_UP_RE.search(" ".join(words)):
+        return False
+    words = _DUMMY_IT_RE.sub(" ", " ".join(words)).split()
+    return not any(w in _CONTEXT_WORDS for w in words)
+
+
+def reusable_answer(text: str) -> bool:
+    """Whether an answer is free of references to the conversation."""
+    return bool(text.strip()) and not _CONVERSATIONAL_ANSWER_RE.search(text)
+
+
+@dataclass
+class SemanticHit:
+    """A cached answer served for a new query."""
+    query: str  # The cached query that matched
+    response: str
+    similarity: float
+    age_s: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"query": self.query, "similarity": round(self.similarity, 4), "age_s": round(self.age_s, 1)}
+
+
+class SemanticCache:
+    """
+    Bounded in-memory index of (query embedding, fingerprint, answer).
+
+    Lookups score every slot with one matrix-vector product. Thread-safe.
+    """
+
+    def __init__(self, embedder: Embedder, capacity: int = 512, threshold: float = 0.9,
+                 ttl: Optional[float] = 3600.0, max_query_words: int = 24):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for the semantic cache. Run: pip install numpy")
+        self.embedder = embedder
+        self.capacity = capacity
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_query_words = max_query_words
+        self._lock = threading.Lock()
+        self._vectors = np.zeros((capacity, embedder.dim), dtype=np.float32)
+        self._fingerprints = np.zeros(capacity, dtype=np.int64)
+        self._expires = np.zeros(capacity, dtype=np.float64)  # 0: empty slot
+        self._last_used = np.zeros(capacity, dtype=np.float64)
+        self._queries: List[Optional[str]] = [None] * capacity
+        self._responses: List[Optional[str]] = [None] * capacity
+        self._created = np.zeros(capacity, dtype=np.float64)
+        self.lookups = 0
+        self.hits = 0
+        self.skipped = 0  # Lookups of queries that are not reusable
+        self.stores = 0
+        self.rejected = 0  # Exchanges not stored as unsafe to reuse
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _fingerprint_id(fingerprint: str) -> int:
+        return int.from_bytes(bytes.fromhex(fingerprint[:16]), "big", signed=True)
+
+    def _embed(self, query: str) -> Optional["np.ndarray"]:
+        words = normalize_query(query)
+        if not words:
+            return None
+        return self.embedder.embed([" ".join(words)])[0]
+
+    def _live(self, now: float) -> "np.ndarray":
+        """Mask of occupied, unexpired slots (expired ones are freed on the way)."""
+        occupied = self._expires > 0
+        expired = occupied & (self._expires < now)
+        if expired.any():
+            self.expirations += int(expired.sum())
+            self._expires[expired] = 0
+            for slot in np.flatnonzero(expired):
+                self._queries[slot] = self._responses[slot] = None
+        return occupied & ~expired
+
+    def _best(self, vector: "np.ndarray", fingerprint_id: int, now: float):
+        live = self._live(now) & (self._fingerprints == fingerprint_id)
+        if not live.any():
+            return None, 0.0
+        scores = np.where(live, self._vectors @ vector, -1.0)
+        slot = int(np.argmax(scores))
+        return slot, float(scores[slot])
+
+    def lookup(self, query: str, fingerprint: str) -> Optional[SemanticHit]:
+        """The cached answer to a query similar enough to `query`, if any."""
+        if not reusable_query(query, self.max_query_words):
+            with self._lock:
+                self.skipped += 1
+            return None
+        vector = self._embed(query)
+        now = time.time()
+        with self._lock:
+            self.lookups += 1
+            if vector is None:
+                return None
+            slot, similarity = self._best(vector, self._fingerprint_id(fingerprint), now)
+            if slot is None or similarity < self.threshold:
+                return None
+            self.hits += 1
+            self._last_used[slot] = now
+            return SemanticHit(
+                query=self._queries[slot], response=self._responses[slot],
+                similarity=similarity, age_s=float(now - self._created[slot])
+            )
+
+    def store(self, query: str, response: str, fingerprint: str, reusable: bool = True) -> bool:
+        """
+        Cache an exchange if it is safe to reuse; returns whether it was
+        stored. Pass `reusable=False` when the caller knows it is not (it
+        still counts as rejected).
+        """
+        vector = self._embed(query) if reusable and reusable_query(query, self.max_query_words) else None
+        if vector is None or not reusable_answer(response):
+            with self._lock:
+                self.rejected += 1
+            return False
+
+        fingerprint_id = self._fingerprint_id(fingerprint)
+        now = time.time()
+        with self._lock:
+            slot, similarity = self._best(vector, fingerprint_id, now)
+            if slot is None or similarity < self.threshold:
+                # New entry: a free slot, else the least recently used one
+                live = self._live(now)
+                slot = int(np.argmin(np.where(live, self._last_used, -np.inf)))
+                if live[slot]:
+                    self.evictions += 1
+            self._vectors[slot] = vector
+            self._fingerprints[slot] = fingerprint_id
+            self._expires[slot] = now + self.ttl if self.ttl else np.inf
+            self._last_used[slot] = self._created[slot] = now
+            self._queries[slot] = query
+            self._responses[slot] = response
+            self.stores += 1
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._expires[:] = 0
+            self._queries = [None] * self.capacity
+            self._responses = [None] * self.capacity
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int((self._expires > 0).sum())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "misses": self.lookups - self.hits,
+                "hit_rate": self.hits / self.lookups if self.lookups else 0.0,
+                "skipped": self.skipped,
+                "stores": self.stores,
+                "rejected": self.rejected,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": int((self._expires > 0).sum()),
+                "capacity": self.capacity,
+            }
@@ -0,0 +1,313 @@
+"""
+Semantic long-term memory: embedding index over stored messages.
+
+Vectors live in append-only, memory-mapped float32 matrices on disk, one
+per session, in a directory next to the message database. Recall is one
+vectorised dot product over the session's newest rows instead of a
+Python loop, and other sessions' history costs it nothing.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from pulse.core.embeddings import Embedder, NUMPY_AVAILABLE
+from pulse.core.memory import Memory, Message
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+
+class VectorIndex:
+    """
+    Append-only on-disk vector store.
+
+    Files (for base path P):
+        P.f32   row-major float32 matrix, one unit vector per row
+        P.ids   int64 message id for each row
+        P.json  dimensionality and embedder name, to detect stale files
+
+    Rows are appended in place, and searches map the files read-only, so
+    the index is never loaded into Python objects.
+    """
+
+    def __init__(self, path: str, dim: int, embedder_name: str = ""):
+        self.path = path
+        self.dim = dim
+        self._vectors_path = path + ".f32"
+        self._ids_path = path + ".ids"
+        self._meta_path = path + ".json"
+        self._lock = threading.Lock()
+        self._cache: Optional[Tuple[int, "np.ndarray", "np.ndarray"]] = None
+
+        meta = {"dim": dim, "embedder": embedder_name}
+        if self._read_meta() != meta:
+            # Different dimensionality or embedder: old vectors are useless
+            self._reset(meta)
+
+    def _read_meta(self) -> Optional[dict]:
+        try:
+            with open(self._meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _reset(self, meta: dict):
+        for path in (self._vectors_path, self._ids_path):
+            if os.path.exists(path):
+                os.remove(path)
+        with open(self._meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        self._cache = None
+
+    def __len__(self) -> int:
+        # A crash between the two appends can leave one file a row ahead
+        try:
+            vectors = os.path.getsize(self._vectors_path) // (4 * self.dim)
+            ids = os.path.getsize(self._ids_path) // 8
+        except OSError:
+            return 0
+        return min(vectors, ids)
+
+    @property
+    def last_id(self) -> int:
+        """Largest message id indexed so far (0 when empty)."""
+        count = len(self)
+        if not count:
+            return 0
+        with open(self._ids_path, "rb") as f:
+            f.seek((count - 1) * 8)
+            return int(np.frombuffer(f.read(8), dtype=np.int64)[0])
+
+    def append(self, ids: List[int], vectors: "np.ndarray"):
+        """Append rows. `ids` must be larger than every id already stored."""
+        if not ids:
+            return
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        with self._lock:
+            count = len(self)
+            # Drop a torn trailing row before appending
+            for path, width in ((self._vectors_path, 4 * self.dim), (self._ids_path, 8)):
+                if os.path.exists(path) and os.path.getsize(path) != count * width:
+                    with open(path, "r+b") as f:
+                        f.truncate(count * width)
+            with open(self._vectors_path, "ab") as f:
+                f.write(vectors.tobytes())
+            with open(self._ids_path, "ab") as f:
+                f.write(np.asarray(ids, dtype=np.int64).tobytes())
+
+    def _mapped(self) -> Tuple[int, "np.ndarray", "np.ndarray"]:
+        """Memory-map the current files, reusing the mapping if nothing changed."""
+        count = len(self)
+        if self._cache and self._cache[0] == count:
+            return self._cache
+        if not count:
+            return 0, np.empty((0, self.dim), dtype=np.float32), np.empty(0, dtype=np.int64)
+        vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(count, self.dim))
+        ids = np.memmap(self._ids_path, dtype=np.int64, mode="r", shape=(count,))
+        self._cache = (count, vectors, ids)
+        return self._cache
+
+    def remove(self):
+        """Delete the index files."""
+        with self._lock:
+            for path in (self._vectors_path, self._ids_path, self._meta_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._cache = None
+
+    def search(self, query: "np.ndarray", k: int, before_id: Optional[int] = None,
+               max_rows: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        Top-k rows by cosine similarity to a unit query vector.
+
+        Args:
+            before_id: Only consider messages with a smaller id.
+            max_rows: Only scan this many of the newest (remaining) rows,
+                so the cost stops growing with the index.
+
+        Returns:
+            (message id, score) pairs, best first.
+        """
+        count, vectors, ids = self._mapped()
+        if not count or k <= 0:
+            return []
+        if before_id is not None:
+            # Ids are appended in increasing order, so this is a prefix
+            count = int(np.searchsorted(ids, before_id, side="left"))
+            if not count:
+                return []
+        start = max(0, count - max_rows) if max_rows else 0
+        vectors, ids = vectors[start:count], ids[start:count]
+        count -= start
+
+        scores = vectors @ np.asarray(query, dtype=np.float32)
+        k = min(k, count)
+        top = np.argpartition(scores, -k)[-k:]
+        top = top[np.argsort(scores[top])[::-1]]
+        return [(int(ids[i]), float(scores[i])) for i in top]
+
+
+def _session_key(session: str) -> str:
+    """File name for a session's index (session names may hold any characters)."""
+    return hashlib.sha256(session.encode("utf-8")).hexdigest()[:32]
+
+
+class SemanticMemory:
+    """
+    Keeps one VectorIndex per session in step with Memory and recalls
+    relevant older turns.
+
+    The indexes catch up from the database by message id, so they never
+    miss or duplicate a message no matter which thread stored it. They sync
+    after every stored batch (via a Memory listener), once in the
+    background at startup to backfill existing history, and before a
+    recall that needs messages they don't have yet. Dropping a session or
+    clearing Memory deletes the matching indexes; if the database was
+    replaced (the indexes are ahead of it), they are rebuilt.
+
+    Recall scans at most `max_rows` of the session's newest indexed turns.
+
+    Note: vectors are not encrypted. They are hashed features, not text,
+    but they do reveal which messages are similar to each other.
+    """
+
+    def __init__(self, memory: Memory, embedder: Embedder, path: Optional[str] = None,
+                 max_rows: Optional[int] = 20000):
+        self.memory = memory
+        self.embedder = embedder
+        self.path = path or memory.db_path + ".vectors"
+        self.max_rows = max_rows
+        self._indexes: Dict[str, VectorIndex] = {}
+        self._indexes_lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._open()
+
+        # Non-blocking from the listener: a sync holding the lock may be
+        # waiting for the write-behind writer to flush, i.e. for this call
+        memory.add_listener(lambda messages: self.sync(blocking=False))
+        memory.add_delete_listener(self._on_delete)
+        threading.Thread(target=self.sync, name="pulse-semantic-backfill", daemon=True).start()
+
+    def _open(self):
+        """Load the indexing progress, starting over if the embedder changed."""
+        meta = {"dim": self.embedder.dim, "embedder": self.embedder.name}
+        meta_path = os.path.join(self.path, "index.json")
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                current = json.load(f)
+        except (OSError, ValueError):
+            current = None
+        if current != meta:
+            shutil.rmtree(self.path, ignore_errors=True)
+            os.makedirs(self.path, exist_ok=True)
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+        # Single-file index of earlier versions, superseded by the per-session ones
+        for ext in (".f32", ".ids", ".json"):
+            if os.path.exists(self.path + ext):
+                os.remove(self.path + ext)
+
+        # Each index holds only ids in order, and every message above the
+        # largest id indexed belongs to no index yet, so that id is where
+        # syncing resumes (also after a session's index is deleted)
+        self.last_id = 0
+        for name in os.listdir(self.path):
+            if name.endswith(".ids"):
+                index = VectorIndex(os.path.join(self.path, name[:-4]), self.embedder.dim, self.embedder.name)
+                self.last_id = max(self.last_id, index.last_id)
+
+    def _index(self, session: str, create: bool = True) -> Optional[VectorIndex]:
+        key = _session_key(session)
+        with self._indexes_lock:
+            index = self._indexes.get(key)
+            if index is None:
+                path = os.path.join(self.path, key)
+                if not create and not os.path.exists(path + ".ids"):
+                    return None
+                index = self._indexes[key] = VectorIndex(path, self.embedder.dim, self.embedder.name)
+            return index
+
+    def _on_delete(self, session: Optional[str]):
+        with self._sync_lock:
+            if session is None:
+                self._reset()
+                return
+            index = self._index(session, create=False)
+            if index is not None:
+                index.remove()
+                with self._indexes_lock:
+                    self._indexes.pop(_session_key(session), None)
+
+    def _reset(self):
+        """Delete every index; the next sync rebuilds them from the database."""
+        with self._indexes_lock:
+            self._indexes = {}
+        shutil.rmtree(self.path, ignore_errors=True)
+        self._open()
+
+    def sync(self, batch: int = 1000, blocking: bool = True):
+        """
+        Embed and index every message newer than the indexes.
+
+        With blocking=False, returns at once if another sync is running;
+        skipped messages are picked up by the next sync (recall always
+        catches up first).
+        """
+        if not self._sync_lock.acquire(blocking):
+            return
+        try:
+            if self.last_id > self.memory.last_id():
+                # Indexed ids the database never assigned: it was replaced
+                print("Warning: Semantic index is ahead of the database, rebuilding it.")
+                self._reset()
+            pending: List[Message] = []
+            for msg in self.memory.iter_messages(after_id=self.last_id, batch=batch):
+                pending.append(msg)
+                if len(pending) >= batch:
+                    self._append(pending)
+                    pending = []
+            self._append(pending)
+        finally:
+            self._sync_lock.release()
+
+    def _append(self, messages: List[Message]):
+        if not messages:
+            return
+        vectors = self.embedder.embed([m.content for m in messages])
+        by_session: Dict[str, List[int]] = {}
+        for row, msg in enumerate(messages):
+            by_session.setdefault(msg.session_id, []).append(row)
+        for session, rows in by_session.items():
+            self._index(session).append([messages[r].id for r in rows], vectors[rows])
+        self.last_id = messages[-1].id
+
+    def recall(self, query: str, k: int = 3, session: Optional[str] = None,
+               before_id: Optional[int] = None, min_score: float = 0.0) -> List[Message]:
+        """
+        Older messages of a session most similar to `query`, oldest first.
+
+        Args:
+            session: The session to recall from (Memory's default if None).
+            before_id: Only consider messages older than this id (e.g. the
+                oldest message already in the context window).
+            min_score: Minimum cosine similarity.
+        """
+        if not query.strip():
+            return []
+        # Ids are indexed in order, so if the indexes reach before_id there
+        # is nothing to catch up on (and no reason to queue behind a sync)
+        if before_id is None or self.last_id < before_id - 1:
+            self.sync()
+        index = self._index(session or self.memory.session, create=False)
+        if index is None:
+            return []
+        query_vector = self.embedder.embed([query])[0]
+        # Over-fetch a little: rows deleted since they were indexed are dropped below
+        hits = index.search(query_vector, k * 2, before_id=before_id, max_rows=self.max_rows)
+        hit_ids = [i for i, score in hits if score >= min_score]
+        found = self.memory.get_by_ids(hit_ids, session=session)[:k]
+        return sorted(found, key=lambda m: m.id)
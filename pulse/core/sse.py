@@ -0,0 +1,179 @@
+"""
+Incremental Server-Sent Events parser for the streaming LLM clients.
+
+Bytes go in as they arrive from the socket, complete events come out:
+multi-line `data:` fields are joined, `event:`/`id:`/`retry:` are
+tracked, and `:` comment lines (keep-alives such as OpenRouter's
+": OPENROUTER PROCESSING") are skipped. Lines are split on bytes and
+decoded once per event, so a multi-byte character split across reads is
+safe.
+"""
+
+from json.decoder import scanstring
+from typing import Any, Iterator, List, Optional, Tuple
+
+import requests
+from urllib3.exceptions import DecodeError, ProtocolError, ReadTimeoutError
+
+# Bytes asked of the socket per read. Reads return as soon as anything has
+# arrived, so this only caps how much is parsed in one go.
+SSE_READ_SIZE = 1024
+
+
+class SSEEvent:
+    """One dispatched event. A plain slotted class: one is built per token."""
+    __slots__ = ("data", "event", "id", "retry")
+
+    def __init__(self, data: str, event: str = "message", id: Optional[str] = None,
+                 retry: Optional[int] = None):
+        self.data = data
+        self.event = event
+        self.id = id
+        self.retry = retry
+
+    def __repr__(self) -> str:
+        return f"SSEEvent(data={self.data!r}, event={self.event!r}, id={self.id!r}, retry={self.retry!r})"
+
+
+class SSEParser:
+    """Feed it bytes with `feed()`; it returns the events completed so far."""
+
+    def __init__(self):
+        self._buffer = b""
+        self._data: List[bytes] = []
+        self._event = b""
+        self._retry: Optional[int] = None
+        self.last_event_id: Optional[str] = None
+        self.comments = 0
+
+    def feed(self, chunk: bytes) -> List[SSEEvent]:
+        buffer = self._buffer + chunk if self._buffer else chunk
+        if b"\r" in buffer:
+            # CRLF and lone CR end lines too; hold back a trailing CR in
+            # case its LF is in the next chunk
+            held = buffer.endswith(b"\r")
+            if held:
+                buffer = buffer[:-1]
+            buffer = buffer.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+            if held:
+                buffer += b"\r"
+        lines = buffer.split(b"\n")
+        self._buffer = lines.pop()
+
+        events = []
+        data = self._data
+        for line in lines:
+            if line.startswith(b"data: "):  # The common case, first
+                data.append(line[6:])
+            elif not line:
+                if data:
+                    events.append(self._dispatch())
+                    data = self._data
+                else:
+                    self._event = b""
+            elif line[0] == 58:  # b":" comment / keep-alive
+                self.comments += 1
+            else:
+                self._field(line)
+        return events
+
+    def _field(self, line: bytes):
+        name, sep, value = line.partition(b":")
+        if sep and value[:1] == b" ":
+            value = value[1:]
+        if name == b"data":
+            self._data.append(value)
+        elif name == b"event":
+            self._event = value
+        elif name == b"id":
+            if b"\0" not in value:
+                self.last_event_id = value.decode("utf-8", "replace")
+        elif name == b"retry":
+            if value.isdigit():
+                self._retry = int(value)
+
+    def _dispatch(self) -> SSEEvent:
+        data = self._data[0] if len(self._data) == 1 else b"\n".join(self._data)
+        event = SSEEvent(
+            data.decode("utf-8", "replace"),
+            self._event.decode("utf-8", "replace") if self._event else "message",
+            self.last_event_id,
+            self._retry,
+        )
+        self._data = []
+        self._event = b""
+        return event
+
+    def close(self) -> List[SSEEvent]:
+        """Events still pending at the end of the stream (which lacked a final blank line)."""
+        events = self.feed(b"\n\n") if self._buffer or self._data else []
+        self._buffer = b""
+        return events
+
+
+def iter_raw(raw: Any, chunk_size: int = SSE_READ_SIZE) -> Iterator[bytes]:
+    """
+    Bytes of a urllib3 response as soon as they arrive.
+
+    `read1` returns whatever is available instead of waiting for
+    `chunk_size` bytes, which a plain `read` does on responses that are not
+    chunk-encoded.
+    """
+    read1 = getattr(raw, "read1", None)
+    try:
+        if read1 is None:  # urllib3 < 2
+            yield from raw.stream(chunk_size, decode_content=True)
+            return
+        while True:
+            data = read1(chunk_size, decode_content=True)
+            if not data:
+                return
+            yield data
+    # Surface errors the way requests' own iterators do
+    except ProtocolError as e:
+        raise requests.exceptions.ChunkedEncodingError(e)
+    except DecodeError as e:
+        raise requests.exceptions.ContentDecodingError(e)
+    except ReadTimeoutError as e:
+        raise requests.exceptions.ConnectionError(e)
+
+
+def has_value(data: str, key: str) -> bool:
+    """
+    Cheap test that JSON text `data` has `key` (quoted, e.g. '"content"')
+    with a value other than "" or null, so decoding it is worthwhile.
+    """
+    start = 0
+    while True:
+        i = data.find(key, start)
+        if i < 0:
+            return False
+        start = i + len(key)
+        value = data[start:start + 8].lstrip(": ")
+        if not value.startswith(('""', "null")):
+            return True
+
+
+def string_value(data: str, key: str) -> Tuple[bool, Optional[str]]:
+    """
+    `key`'s string value in compact JSON text `data`, without decoding the
+    rest: (True, value) when `key` occurs exactly once and is followed by a
+    string, else (False, None) and the caller falls back to json.loads.
+    """
+    marker = key + ':"'
+    i = data.find(marker)
+    if i < 0 or data.find(key, i + len(marker)) >= 0:
+        return False, None
+    try:
+        value, _ = scanstring(data, i + len(marker))
+    except ValueError:
+        return False, None
+    return True, value
+
+
+def iter_events(raw: Any, chunk_size: int = SSE_READ_SIZE) -> Iterator[SSEEvent]:
+    """SSE events of a streamed urllib3 response."""
+    parser = SSEParser()
+    for chunk in iter_raw(raw, chunk_size):
+        yield from parser.feed(chunk)
+    yield from parser.close()
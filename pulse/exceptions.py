@@ -2,6 +2,8 @@
 Custom exceptions for Pulse Ecosystem.
 """
 
+from typing import Optional
+
 
 class PulseError(Exception):
     """Base exception for all Pulse errors."""
@@ -19,8 +21,18 @@ class ContextOptimizationError(PulseError):
 
 
 class InferenceError(PulseError):
-    """Raised when OpenRouter inference fails."""
-    pass
+    """
+    Raised when OpenRouter inference fails.
+
+    `status_code` is the HTTP status of the failed request and `retry_after`
+    the number of seconds the API asked us to wait, when known.
+    """
+
+    def __init__(self, message: str = "", status_code: Optional[int] = None,
+                 retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
 
 
 class VoiceError(PulseError):
@@ -11,6 +11,8 @@ def main():
     parser = argparse.ArgumentParser(description="Pulse AI - Personal Assistant")
     parser.add_argument("--mode", choices=["chat", "voice"], default="chat", help="Interaction mode")
     parser.add_argument("--model", type=str, help="Override default LLM model")
+    parser.add_argument("--session", type=str,
+                        help="Conversation session to use (default: 'cli' for chat, 'voice' for voice)")
     args = parser.parse_args()
 
     # Load config
@@ -18,9 +20,12 @@ def main():
     if args.model:
         config.default_model = args.model
 
+    # Keep CLI and voice conversations out of each other's context
+    session = args.session or ("voice" if args.mode == "voice" else "cli")
+
     # Initialize Brain
     try:
-        brain = Brain(config)
+        brain = Brain(config, session=session)
     except Exception as e:
         print(f"Failed to initialize Pulse: {e}")
         return
@@ -0,0 +1,124 @@
+"""
+Barge-in check with recorded audio instead of a microphone.
+
+VoiceLoop answers a question against the local stub server with a silent
+stand-in TTS engine, while a WAV file is replayed in real time as the
+microphone. By default two fixtures are generated: room noise with the
+user starting to talk `--speech-at` seconds in, and room noise alone.
+Reports how long after the user started talking the TTS was cancelled,
+how much of the response was saved, and that noise alone does not
+interrupt.
+
+Usage:
+    python -m pulse.tools.bench_barge_in --speech-at 1.5
+    python -m pulse.tools.bench_barge_in --wav recording.wav
+"""
+
+import argparse
+import math
+import os
+import random
+import tempfile
+import time
+import wave
+from array import array
+from contextlib import redirect_stdout
+from io import StringIO
+from typing import Optional
+
+from pulse.config import PulseConfig
+from pulse.core.brain import Brain
+from pulse.tools.bench_voice_stream import REPLY
+from pulse.tools.stub_llm_server import StubLLMServer
+from pulse.voice.audio import WavFileSource
+from pulse.voice.tts import StubTTS
+from pulse.voice.voice_loop import VoiceLoop
+
+SAMPLE_RATE = 16000
+
+
+def write_fixture(path: str, duration_s: float, speech_at: Optional[float] = None,
+                  noise_rms: float = 150.0, speech_rms: float = 4000.0, seed: int = 7):
+    """Room noise, with voiced speech-like sound (pitch harmonics, syllable rhythm) from `speech_at`."""
+    rng = random.Random(seed)
+    samples = array("h")
+    for n in range(int(duration_s * SAMPLE_RATE)):
+        t = n / SAMPLE_RATE
+        value = rng.gauss(0.0, noise_rms)
+        if speech_at is not None and t >= speech_at:
+            pitch = 140 + 30 * math.sin(2 * math.pi * 0.7 * t)
+            voiced = sum(math.sin(2 * math.pi * pitch * k * t) / k for k in range(1, 6))
+            syllables = 0.55 + 0.45 * math.sin(2 * math.pi * 4 * t)  # ~4 syllables a second
+            value += speech_rms * 0.8 * voiced * syllables
+        samples.append(max(-32768, min(32767, int(value))))
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(samples.tobytes())
+
+
+def run_case(loop: VoiceLoop, wav_path: str, speech_at: Optional[float], word_ms: float):
+    loop.audio_source = WavFileSource(wav_path, realtime=True)
+    loop.tts = StubTTS(word_ms=word_ms).start()
+    start = time.perf_counter()
+    with redirect_stdout(StringIO()):
+        loop._respond("How does the watering schedule work?")
+    total = time.perf_counter() - start
+    said = len(loop.tts.said)
+    loop.tts.close()
+    saved = len(loop.brain.memory.get_history(limit=1)[0].content.split())
+
+    name = os.path.basename(wav_path)
+    spoke = f"spoke {said} segments, {saved} words saved, turn took {total:.1f} s"
+    if not loop.barged_in:
+        print(f"  {name}: no barge-in; {spoke}")
+        return
+    monitor = loop.monitor
+    if speech_at is None:
+        heard = f"{monitor.onset_offset_s:.2f} s into the capture"
+    else:
+        # The capture starts with the first spoken sentence; the TTS is cancelled on detection
+        detect_ms = (monitor.onset_at - (loop.audio_source._started + speech_at)) * 1000
+        heard = f"TTS cancelled {detect_ms:.0f} ms after the user started talking"
+    print(f"  {name}: barge-in, {heard}; {spoke}")
+
+
+def run(wav: Optional[str], speech_at: float, word_ms: float):
+    server = StubLLMServer(latency_ms=200, chunk_delay_ms=30, reply=REPLY * 2).start()
+    with tempfile.TemporaryDirectory() as tmp:
+        config = PulseConfig(
+            db_path=os.path.join(tmp, "bench.db"),
+            openrouter_base_url=server.url,
+            fallback_models=[],
+            memory_write_behind=False,
+            compressor_backend="local",
+            enable_semantic_cache=False,
+            tts_engine="stub",
+        )
+        try:
+            with redirect_stdout(StringIO()):
+                brain = Brain(config)
+                loop = VoiceLoop(brain, config, audio_source=None)
+            loop.running = True
+            print(f"{word_ms:.0f} ms per spoken word, {len(REPLY.split()) * 2}-word reply:")
+            if wav:
+                run_case(loop, wav, None, word_ms)
+            else:
+                talking = os.path.join(tmp, "user_talks.wav")
+                noise = os.path.join(tmp, "room_noise.wav")
+                write_fixture(talking, speech_at + 2.0, speech_at=speech_at)
+                write_fixture(noise, 30.0)
+                run_case(loop, talking, speech_at, word_ms)
+                run_case(loop, noise, None, word_ms)
+        finally:
+            server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check barge-in with recorded audio")
+    parser.add_argument("--wav", help="16-bit PCM WAV to replay as the microphone")
+    parser.add_argument("--speech-at", type=float, default=1.5, help="When the generated user speech starts (s)")
+    parser.add_argument("--word-ms", type=float, default=150.0)
+    args = parser.parse_args()
+    run(args.wav, args.speech_at, args.word_ms)
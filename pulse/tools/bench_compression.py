@@ -0,0 +1,81 @@
+"""
+Benchmark for context compression backends.
+
+Compresses synthetic older-history blocks of increasing size with the local
+extractive compressor and, when SCALEDOWN_API_KEY is set and the scaledown
+package is installed, the remote ScaleDown API. Reports the kept fraction
+of (estimated) tokens and per-call latency.
+
+Usage:
+    python -m pulse.tools.bench_compression --turns 8 16 32 --rate auto
+"""
+
+import argparse
+import os
+import random
+import time
+
+from pulse.core.compression import SCALEDOWN_AVAILABLE, ScaleDownBackend, format_turns
+from pulse.core.local_compressor import LocalCompressor
+from pulse.core.memory import Message
+from pulse.core.tokens import estimate_tokens
+
+_TOPICS = ["the quarterly budget", "the team offsite", "the database migration", "the voice assistant",
+           "the hiring plan", "the release schedule", "the customer escalation", "the cloud bill"]
+_USER = ["What did we decide about {t}?", "Can you remind me of the open questions on {t}?",
+         "I think {t} needs another pass. Thoughts?", "Summarise where we are with {t}."]
+_ASSISTANT = ["We agreed to revisit {t} next week. The owner is Sam. The main risk is timing.",
+              "For {t}, two options remain. Option A is cheaper. Option B ships sooner.",
+              "Noted. I will track {t} and flag anything that slips. Nothing else changed.",
+              "The latest on {t}: the draft is done, review is pending, and costs are on target."]
+
+
+def _conversation(turns: int, seed: int = 0):
+    rng = random.Random(seed)
+    messages = []
+    for i in range(turns):
+        topic = rng.choice(_TOPICS)
+        templates = _USER if i % 2 == 0 else _ASSISTANT
+        role = "user" if i % 2 == 0 else "assistant"
+        messages.append(Message(role=role, content=rng.choice(templates).format(t=topic), id=i + 1))
+    return messages
+
+
+def _timed(compressor, context: str, prompt: str, repeat: int):
+    samples = []
+    content = ""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        content = compressor.compress(context=context, prompt=prompt).content
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return content, samples[len(samples) // 2]
+
+
+def run(turn_counts, rate: str, repeat: int):
+    backends = [("local", LocalCompressor(rate=rate))]
+    api_key = os.environ.get("SCALEDOWN_API_KEY")
+    if api_key and SCALEDOWN_AVAILABLE:
+        backends.append(("scaledown", ScaleDownBackend(api_key, rate=rate)))
+    else:
+        print("ScaleDown not configured (set SCALEDOWN_API_KEY and install scaledown); local only.")
+
+    prompt = "What did we decide about the quarterly budget?"
+    print(f"{'backend':>10} {'turns':>6} {'tokens':>7} {'kept':>6} {'p50 ms':>8}")
+    for turns in turn_counts:
+        context = format_turns(_conversation(turns))
+        before = estimate_tokens(context)
+        for name, compressor in backends:
+            # One remote call per size is enough to see the round trip
+            content, p50 = _timed(compressor, context, prompt, repeat if name == "local" else 1)
+            kept = estimate_tokens(content) / before if before else 1.0
+            print(f"{name:>10} {turns:>6} {before:>7} {kept:>6.0%} {p50:>8.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark context compression backends")
+    parser.add_argument("--turns", type=int, nargs="+", default=[8, 16, 32, 64])
+    parser.add_argument("--rate", default="auto", help="Fraction of tokens to keep, or 'auto'")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    run(args.turns, args.rate, args.repeat)
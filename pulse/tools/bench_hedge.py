@@ -0,0 +1,69 @@
+"""
+Benchmark for hedged requests in OpenRouterClient.chat.
+
+Runs chat requests against the local stub server with a primary model that
+is slow or fails slowly, sequential fallback vs hedged, and reports the
+latency percentiles and how many requests the server had to answer.
+
+Usage:
+    python -m pulse.tools.bench_hedge --requests 20 --hedge-ttfb-ms 250
+"""
+
+import argparse
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+
+from pulse.core.openrouter_client import OpenRouterClient
+from pulse.tools.stub_llm_server import StubLLMServer
+
+MESSAGES = [{"role": "user", "content": "Hello there"}]
+PRIMARY, FALLBACK = "stub/primary", "stub/fallback"
+
+
+def _percentile(values, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def _measure(server: StubLLMServer, count: int, **hedge) -> None:
+    client = OpenRouterClient("stub-key", PRIMARY, [FALLBACK], base_url=server.url, **hedge)
+    client.prewarm(2)
+    before = server.requests
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        with redirect_stdout(StringIO()):  # The client narrates every fallback
+            client.chat(MESSAGES)
+        latencies.append((time.perf_counter() - start) * 1000)
+    label = "hedged" if hedge else "sequential"
+    print(f"  {label:<12} p50 {_percentile(latencies, 0.5):>8.1f} ms  p99 {_percentile(latencies, 0.99):>8.1f} ms"
+          f"  {(server.requests - before) / count:.2f} requests/chat")
+
+
+def run(count: int, primary_ms: float, fallback_ms: float, hedge_ttfb_ms: float):
+    scenarios = [
+        ("primary healthy", {PRIMARY: fallback_ms}, {}),
+        ("primary slow", {PRIMARY: primary_ms}, {}),
+        ("primary fails slowly (429)", {PRIMARY: primary_ms}, {PRIMARY: 429}),
+    ]
+    for name, latencies, errors in scenarios:
+        server = StubLLMServer(
+            latency_ms=fallback_ms, model_latency_ms=latencies, model_errors=errors
+        ).start()
+        try:
+            print(f"{name}: primary {latencies[PRIMARY]:.0f} ms, fallback {fallback_ms:.0f} ms")
+            _measure(server, count)
+            _measure(server, count, hedge_ttfb_ms=hedge_ttfb_ms)
+        finally:
+            server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark hedged vs sequential model fallback")
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--primary-ms", type=float, default=1500.0, help="Latency of the slow primary")
+    parser.add_argument("--fallback-ms", type=float, default=100.0, help="Latency of the fallback")
+    parser.add_argument("--hedge-ttfb-ms", type=float, default=250.0)
+    args = parser.parse_args()
+    run(args.requests, args.primary_ms, args.fallback_ms, args.hedge_ttfb_ms)
@@ -0,0 +1,83 @@
+"""
+Benchmark for LLM client connection handling.
+
+Runs chat and stream requests against the local stub server twice: with a
+fresh connection per request (what bare `requests.post` did) and with the
+shared keep-alive pool, pre-warmed. The stub's per-connection delay stands
+in for the TCP+TLS handshake to a remote API; it is paid after the
+connection is accepted, so it shows up in ttfb rather than connect.
+
+Usage:
+    python -m pulse.tools.bench_http --requests 50 --connect-delay-ms 80
+"""
+
+import argparse
+import statistics
+
+import requests
+
+from pulse.core.gemini_client import GeminiClient
+from pulse.core.http import TimedHTTPAdapter
+from pulse.core.openrouter_client import OpenRouterClient
+from pulse.tools.stub_llm_server import StubLLMServer
+
+MESSAGES = [{"role": "user", "content": "Hello there"}]
+
+
+def _fresh_session() -> requests.Session:
+    session = requests.Session()
+    session.mount("http://", TimedHTTPAdapter())
+    return session
+
+
+def _measure(client, call, count: int, fresh: bool):
+    timings = []
+    for _ in range(count):
+        if fresh:
+            client.session = _fresh_session()
+        call()
+        timings.append(client.last_timing)
+        if fresh:
+            client.session.close()
+    return timings
+
+
+def _row(label: str, timings):
+    median = lambda values: statistics.median(values) if values else 0.0
+    reused = sum(t.reused for t in timings)
+    print(f"{label:<24} {median([t.connect_ms for t in timings]):>10.2f} "
+          f"{median([t.ttfb_ms for t in timings]):>9.2f} {median([t.total_ms for t in timings]):>9.2f} "
+          f"{reused:>4}/{len(timings)}")
+
+
+def run(count: int, connect_delay_ms: float, latency_ms: float):
+    server = StubLLMServer(connect_delay_ms=connect_delay_ms, latency_ms=latency_ms).start()
+    try:
+        openrouter = OpenRouterClient("stub-key", "stub-model", base_url=server.url)
+        gemini = GeminiClient("stub-key", "gemini-stub", base_url=server.url)
+        cases = [
+            ("openrouter chat", openrouter, lambda: openrouter.chat(MESSAGES)),
+            ("openrouter stream", openrouter, lambda: list(openrouter.stream(MESSAGES))),
+            ("gemini chat", gemini, lambda: gemini.chat(MESSAGES)),
+            ("gemini stream", gemini, lambda: list(gemini.stream(MESSAGES))),
+        ]
+        print(f"{'p50 ms':<24} {'connect':>10} {'ttfb':>9} {'total':>9} {'reused':>9}")
+        for name, client, call in cases:
+            pooled_session = client.session
+            _row(f"{name} (fresh)", _measure(client, call, count, fresh=True))
+            client.session = pooled_session
+            client.prewarm()
+            _row(f"{name} (pooled)", _measure(client, call, count, fresh=False))
+        print(f"Server saw {server.connections} connections for {server.requests} requests")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark pooled vs per-request HTTP connections")
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--connect-delay-ms", type=float, default=80.0,
+                        help="Simulated handshake cost per new connection")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Simulated server think time")
+    args = parser.parse_args()
+    run(args.requests, args.connect_delay_ms, args.latency_ms)
@@ -0,0 +1,242 @@
+"""
+Benchmark for pulse.core.memory.Memory.
+
+Compares the original connect-per-call access pattern against the pooled,
+WAL-mode Memory implementation, and checks that history reads and context
+preparation stay flat as the message table grows. Semantic recall, which
+scans up to `semantic_max_rows` turns, is reported in its own column.
+
+Usage:
+    python -m pulse.tools.bench_memory --ops 2000
+    python -m pulse.tools.bench_memory --scale 10000 100000 1000000
+    python -m pulse.tools.bench_memory --latency --ops 5000
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from pulse.core.memory import Memory
+
+
+class LegacyMemory:
+    """The pre-pooling access pattern: a fresh connection for every call."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS messages (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    role TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    timestamp REAL NOT NULL,
+                    metadata TEXT
+                )
+            """)
+            conn.commit()
+
+    def add(self, role: str, content: str):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                "INSERT INTO messages (role, content, timestamp, metadata) VALUES (?, ?, ?, ?)",
+                (role, content, time.time(), json.dumps({}))
+            )
+            conn.commit()
+
+    def get_history(self, limit: int = 100):
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute(
+                "SELECT role, content, timestamp, metadata FROM messages ORDER BY timestamp ASC LIMIT ?",
+                (limit,)
+            ).fetchall()
+
+
+def _ops_per_sec(count: int, fn) -> float:
+    start = time.perf_counter()
+    for i in range(count):
+        fn(i)
+    return count / (time.perf_counter() - start)
+
+
+def _mixed(mem, ops: int) -> float:
+    """One writer thread (voice loop) and one reader thread (UI) in parallel."""
+    done = [0, 0]
+
+    def writer():
+        for i in range(ops):
+            mem.add("user", f"message {i}")
+        done[0] = ops
+
+    def reader():
+        for _ in range(ops):
+            mem.get_history(limit=50)
+        done[1] = ops
+
+    threads = [threading.Thread(target=writer), threading.Thread(target=reader)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return sum(done) / (time.perf_counter() - start)
+
+
+def _populate(mem: Memory, total: int, batch: int = 50000):
+    """Bulk-insert synthetic turns straight through Memory's connection."""
+    conn = mem._connect()
+    now = time.time()
+    inserted = conn.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+    while inserted < total:
+        n = min(batch, total - inserted)
+        rows = [
+            (mem.session,
+             "user" if (inserted + i) % 2 == 0 else "assistant",
+             f"synthetic message {inserted + i} " + "lorem ipsum " * 8,
+             now + inserted + i,
+             "{}",
+             30)
+            for i in range(n)
+        ]
+        with conn:
+            conn.executemany(Memory._SQL_INSERT, rows)
+            if mem.fts_enabled:
+                last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                conn.executemany(
+                    Memory._SQL_FTS_INSERT,
+                    [(last_id - n + 1 + i, mem._index_text(row[2])) for i, row in enumerate(rows)]
+                )
+        inserted += n
+
+
+def _median_ms(fn, repeat: int = 50) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def _make_brain(db_path: str):
+    """
+    Build an offline Brain over `db_path`, or None if deps are missing.
+    Semantic recall is off, so context time is the history read and
+    packing alone; recall is measured on its own.
+    """
+    try:
+        from pulse.config import PulseConfig
+        from pulse.core.brain import Brain
+    except ImportError as e:
+        print(f"(Skipping Brain._prepare_context: {e})")
+        return None
+    config = PulseConfig(
+        db_path=db_path, scaledown_api_key="", openrouter_api_key="bench",
+        enable_semantic_memory=False, http_prewarm=False
+    )
+    return Brain(config)
+
+
+def _make_recall(mem: Memory):
+    """A SemanticMemory over `mem` with the default config, or None without numpy."""
+    from pulse.config import PulseConfig
+    from pulse.core.embeddings import HashingEmbedder, NUMPY_AVAILABLE
+    from pulse.core.semantic_memory import SemanticMemory
+    if not NUMPY_AVAILABLE:
+        print("(Skipping semantic recall: numpy not installed)")
+        return None
+    config = PulseConfig()
+    return SemanticMemory(mem, HashingEmbedder(config.embedding_dim), max_rows=config.semantic_max_rows)
+
+
+def run_scale(sizes):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "scale.db")
+        mem = Memory(db_path)
+        legacy = LegacyMemory(db_path)
+        brain = _make_brain(db_path)
+        recall = _make_recall(mem)
+
+        print(f"{'rows':>9} {'tail(20) ms':>12} {'tail(50) ms':>12} {'context ms':>11} "
+              f"{'recall ms':>10} {'search ms':>10} {'legacy(50) ms':>14}")
+        for size in sorted(sizes):
+            _populate(mem, size)
+            tail20 = _median_ms(lambda: mem.get_history(limit=20))
+            tail50 = _median_ms(lambda: mem.get_history(limit=50))
+            context = _median_ms(brain._prepare_context) if brain else float("nan")
+            if recall:
+                recall.sync()  # Index the new rows outside the timing
+                before_id = mem.get_history(limit=20)[0].id
+                recalled = _median_ms(lambda: recall.recall("synthetic message 4242", k=3, before_id=before_id))
+            else:
+                recalled = float("nan")
+            search = _median_ms(lambda: mem.search("synthetic message 4242", limit=10)) if mem.fts_enabled else float("nan")
+            legacy50 = _median_ms(lambda: legacy.get_history(limit=50), repeat=5)
+            print(f"{size:>9} {tail20:>12.3f} {tail50:>12.3f} {context:>11.3f} {recalled:>10.3f} "
+                  f"{search:>10.3f} {legacy50:>14.3f}")
+        mem.close()
+
+
+def _percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run_latency(ops: int):
+    """p50/p99 latency of Memory.add in synchronous and write-behind mode."""
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'mode':<13} {'p50 us':>9} {'p99 us':>9} {'max us':>10} {'total s':>9}")
+        for name, write_behind in (("sync", False), ("write-behind", True)):
+            mem = Memory(os.path.join(tmp, f"{name}.db"), write_behind=write_behind)
+            samples = []
+            start = time.perf_counter()
+            for i in range(ops):
+                t0 = time.perf_counter()
+                mem.add("user", f"message {i}", {"source": "bench"})
+                samples.append((time.perf_counter() - t0) * 1e6)
+            mem.flush()  # Include the time to make everything durable
+            total = time.perf_counter() - start
+            mem.close()
+            print(f"{name:<13} {_percentile(samples, 50):>9.1f} {_percentile(samples, 99):>9.1f} "
+                  f"{max(samples):>10.1f} {total:>9.3f}")
+
+
+def run(ops: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for name, factory in (
+            ("legacy", lambda p: LegacyMemory(p)),
+            ("pooled", lambda p: Memory(p)),
+        ):
+            mem = factory(os.path.join(tmp, f"{name}.db"))
+            add = _ops_per_sec(ops, lambda i: mem.add("user", f"message {i}"))
+            read = _ops_per_sec(ops, lambda i: mem.get_history(limit=50))
+            mixed = _mixed(mem, ops)
+            if hasattr(mem, "close"):
+                mem.close()
+            results[name] = (add, read, mixed)
+
+    print(f"{'mode':<8} {'add ops/s':>12} {'read ops/s':>12} {'mixed ops/s':>12}")
+    for name, (add, read, mixed) in results.items():
+        print(f"{name:<8} {add:>12.0f} {read:>12.0f} {mixed:>12.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Pulse memory storage")
+    parser.add_argument("--ops", type=int, default=2000, help="Operations per phase")
+    parser.add_argument("--scale", type=int, nargs="+", metavar="ROWS",
+                        help="Measure history reads at these table sizes instead")
+    parser.add_argument("--latency", action="store_true",
+                        help="Measure add() latency percentiles with and without write-behind")
+    args = parser.parse_args()
+    if args.scale:
+        run_scale(args.scale)
+    elif args.latency:
+        run_latency(args.ops)
+    else:
+        run(args.ops)
@@ -0,0 +1,72 @@
+"""
+Benchmark for semantic memory recall.
+
+Fills a VectorIndex with random unit vectors and measures top-k retrieval
+latency, plus HashingEmbedder throughput.
+
+Usage:
+    python -m pulse.tools.bench_semantic --sizes 100000 1000000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from pulse.core.embeddings import HashingEmbedder
+from pulse.core.semantic_memory import VectorIndex
+
+
+def _fill(index: VectorIndex, total: int, chunk: int = 100000, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    start_id = index.last_id + 1
+    remaining = total - len(index)
+    while remaining > 0:
+        n = min(chunk, remaining)
+        vectors = rng.standard_normal((n, index.dim), dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        index.append(list(range(start_id, start_id + n)), vectors)
+        start_id += n
+        remaining -= n
+
+
+def _timings_ms(fn, repeat: int):
+    fn()  # Warm the page cache
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2], samples[int(len(samples) * 0.99)]
+
+
+def run(sizes, dim: int, k: int, repeat: int):
+    embedder = HashingEmbedder(dim)
+    texts = [f"turn {i}: what did we decide about the quarterly budget and the offsite?" for i in range(2000)]
+    start = time.perf_counter()
+    embedder.embed(texts)
+    rate = len(texts) / (time.perf_counter() - start)
+    print(f"HashingEmbedder(dim={dim}): {rate:,.0f} texts/s")
+
+    query = embedder.embed(["quarterly budget offsite"])[0]
+    with tempfile.TemporaryDirectory() as tmp:
+        index = VectorIndex(os.path.join(tmp, "bench.vectors"), dim, embedder.name)
+        print(f"{'vectors':>10} {'size MB':>9} {'p50 ms':>8} {'p99 ms':>8}")
+        for size in sorted(sizes):
+            _fill(index, size)
+            p50, p99 = _timings_ms(lambda: index.search(query, k), repeat)
+            size_mb = size * dim * 4 / 1e6
+            print(f"{size:>10} {size_mb:>9.0f} {p50:>8.2f} {p99:>8.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark semantic memory retrieval")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--k", type=int, default=12, help="Candidates fetched per query")
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+    run(args.sizes, args.dim, args.k, args.repeat)
@@ -0,0 +1,161 @@
+"""
+Micro-benchmark for SSE stream parsing.
+
+1. Parse cost: replays recorded streams (OpenRouter-style frames with
+   keep-alive comments, role/finish/usage frames, and a reasoning model's
+   stream where most deltas carry no content) through the old line-based
+   path (split lines, decode, json.loads every data line) and through
+   SSEParser with the cheap content pre-check.
+2. Time to first token against the local stub server when the stream is
+   close-delimited rather than chunk-encoded: `iter_lines()` reads 512-byte
+   blocks and waits for them to fill, `iter_events()` returns what arrived.
+
+Usage:
+    python -m pulse.tools.bench_sse --tokens 2000 --rounds 20
+    python -m pulse.tools.bench_sse --file recorded_stream.txt
+"""
+
+import argparse
+import json
+import time
+
+import requests
+
+from pulse.core.openrouter_client import OpenRouterClient
+from pulse.core.sse import SSEParser, iter_events
+from pulse.tools.stub_llm_server import StubLLMServer
+
+READ_SIZE = 512  # requests' iter_lines default
+
+
+def _frame(delta: dict, finish: str = None) -> dict:
+    return {
+        "id": "gen-1736962042-abcdefghijklmnop", "provider": "Stub", "model": "stub/model:free",
+        "object": "chat.completion.chunk", "created": 1736962042,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish,
+                     "native_finish_reason": finish, "logprobs": None}],
+    }
+
+
+def record_stream(tokens: int, reasoning: bool = False) -> bytes:
+    """A stream as OpenRouter sends it, one token per frame."""
+    events = [": OPENROUTER PROCESSING", ": OPENROUTER PROCESSING"]
+    frames = [_frame({"role": "assistant", "content": ""})]
+    if reasoning:
+        # Reasoning models stream their thinking with empty content first
+        frames += [_frame({"role": "assistant", "content": "", "reasoning": f"step {i} "}) for i in range(tokens)]
+    frames += [_frame({"role": "assistant", "content": f"word{i} "}) for i in range(tokens)]
+    frames.append(_frame({"role": "assistant", "content": ""}, finish="stop"))
+    usage = _frame({"role": "assistant", "content": ""}, finish="stop")
+    usage["usage"] = {"prompt_tokens": 42, "completion_tokens": tokens, "total_tokens": tokens + 42}
+    frames.append(usage)
+    events += [f"data: {json.dumps(frame, separators=(',', ':'))}" for frame in frames]
+    events.append("data: [DONE]")
+    return ("\n\n".join(events) + "\n\n").encode("utf-8")
+
+
+def _chunks(stream: bytes, size: int):
+    return [stream[i:i + size] for i in range(0, len(stream), size)]
+
+
+def _legacy(chunks) -> int:
+    """The old path: requests-style line splitting, then decode and json.loads per line."""
+    content, pending = 0, b""
+    for chunk in chunks:
+        lines = (pending + chunk).splitlines()
+        pending = lines.pop() if lines and not chunk.endswith(b"\n") else b""
+        for line in lines:
+            if not line:
+                continue
+            text = line.decode("utf-8")
+            if not text.startswith("data: ") or text[6:] == "[DONE]":
+                continue
+            try:
+                data = json.loads(text[6:])
+            except json.JSONDecodeError:
+                continue
+            if data.get("choices") and data["choices"][0].get("delta", {}).get("content"):
+                content += 1
+    return content
+
+
+def _incremental(chunks) -> int:
+    content, parser = 0, SSEParser()
+    for chunk in chunks:
+        for event in parser.feed(chunk):
+            text, _ = OpenRouterClient._parse_stream_data(event.data)
+            if text:
+                content += 1
+    return content
+
+
+def _time(fn, chunks, rounds: int):
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = fn(chunks)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def bench_parse(name: str, stream: bytes, rounds: int):
+    frames = stream.count(b"\n\n")
+    chunks = _chunks(stream, READ_SIZE)
+    legacy, n_legacy = _time(_legacy, chunks, rounds)
+    fast, n_fast = _time(_incremental, chunks, rounds)
+    assert n_legacy == n_fast, (n_legacy, n_fast)
+    print(f"{name}: {frames} events, {len(stream) / 1024:.0f} KiB, {n_fast} content deltas")
+    print(f"  line-based   {legacy * 1e6 / frames:6.2f} us/event")
+    print(f"  incremental  {fast * 1e6 / frames:6.2f} us/event  ({legacy / fast:.1f}x)")
+
+
+def bench_ttft(chunk_delay_ms: float, requests_count: int):
+    server = StubLLMServer(chunk_delay_ms=chunk_delay_ms, chunked=False).start()
+    payload = {"model": "stub", "messages": [{"role": "user", "content": "hi"}], "stream": True}
+
+    def first_token(read_events) -> float:
+        start = time.perf_counter()
+        with requests.post(f"{server.url}/chat/completions", json=payload, stream=True) as response:
+            for data in read_events(response):
+                text, _ = OpenRouterClient._parse_stream_data(data)
+                if text:
+                    elapsed = (time.perf_counter() - start) * 1000
+                    break
+            for _ in read_events(response):
+                pass
+        return elapsed
+
+    def by_lines(response):
+        for line in response.iter_lines():
+            if line.startswith(b"data: "):
+                yield line[6:].decode("utf-8")
+
+    def by_events(response):
+        for event in iter_events(response.raw):
+            yield event.data
+
+    try:
+        print(f"Time to first token, close-delimited stream, {chunk_delay_ms:.0f} ms between tokens:")
+        for name, reader in (("iter_lines", by_lines), ("iter_events", by_events)):
+            samples = sorted(first_token(reader) for _ in range(requests_count))
+            print(f"  {name:<12} p50 {samples[len(samples) // 2]:7.1f} ms")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark SSE parsing and time to first token")
+    parser.add_argument("--tokens", type=int, default=2000, help="Content tokens per recorded stream")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--file", help="Raw recorded stream (the response body bytes) to parse instead")
+    parser.add_argument("--chunk-delay-ms", type=float, default=30.0)
+    parser.add_argument("--requests", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, "rb") as f:
+            bench_parse(args.file, f.read(), args.rounds)
+    else:
+        bench_parse("content stream", record_stream(args.tokens), args.rounds)
+        bench_parse("reasoning stream", record_stream(args.tokens, reasoning=True), args.rounds)
+    bench_ttft(args.chunk_delay_ms, args.requests)
@@ -0,0 +1,112 @@
+"""
+Benchmark for local Whisper transcription over a directory of WAV files.
+
+Loads the model once (as VoiceLoop does at start-up) and transcribes
+every *.wav in the directory with it, reporting the load time and, per
+file, the transcription time and real-time factor (processing time per
+second of audio). If a file has a transcript next to it (same name,
+.txt), the word error rate is reported too.
+
+`--reload N` also transcribes the first N files the old way, loading the
+model for each call, to show what keeping it resident saves.
+
+Usage:
+    python -m pulse.tools.bench_stt --dir recordings/
+    python -m pulse.tools.bench_stt --dir recordings/ --model small --reload 3
+"""
+
+import argparse
+import glob
+import os
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+from typing import List, Optional
+
+from pulse.voice.audio import WavFileSource
+from pulse.voice.stt import WhisperSTT
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word-level edit distance over the reference length (case and punctuation ignored)."""
+    def words(text: str) -> List[str]:
+        return "".join(c if c.isalnum() or c.isspace() else " " for c in text.lower()).split()
+
+    ref, hyp = words(reference), words(hypothesis)
+    if not ref:
+        return float(bool(hyp))
+    row = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        previous, row[0] = row[0], i
+        for j, h in enumerate(hyp, 1):
+            previous, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, previous + (r != h))
+    return row[-1] / len(ref)
+
+
+def _reference(path: str) -> Optional[str]:
+    txt = os.path.splitext(path)[0] + ".txt"
+    if not os.path.exists(txt):
+        return None
+    with open(txt, encoding="utf-8") as f:
+        return f.read()
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run(directory: str, model_size: str, device: Optional[str], language: Optional[str], reload_count: int):
+    paths = sorted(glob.glob(os.path.join(directory, "*.wav")))
+    if not paths:
+        raise SystemExit(f"No .wav files in {directory}")
+    sources = [WavFileSource(path) for path in paths]
+
+    stt = WhisperSTT(model_size=model_size, device=device, language=language)
+    with redirect_stdout(StringIO()):
+        stt.warm_up(background=False)
+    print(f"Whisper '{model_size}': loaded in {stt.load_ms:.0f} ms, warm-up decode {stt.warmup_ms:.0f} ms")
+    print(f"{len(paths)} files:")
+
+    times, errors = [], []
+    for source in sources:
+        text = stt.transcribe_pcm(source.pcm, source.sample_rate)
+        times.append(stt.last_transcribe_ms)
+        line = (f"  {os.path.basename(source.path)}: {stt.last_audio_s:.1f} s audio, "
+                f"{stt.last_transcribe_ms:.0f} ms (RTF {stt.last_transcribe_ms / 1000 / stt.last_audio_s:.2f})")
+        reference = _reference(source.path)
+        if reference is not None:
+            errors.append(word_error_rate(reference, text))
+            line += f", WER {errors[-1]:.0%}"
+        print(f"{line}  {text!r}")
+
+    stats = stt.stats()
+    print(f"Resident model: p50 {_percentile(times, 0.5):.0f} ms, p95 {_percentile(times, 0.95):.0f} ms per utterance, "
+          f"RTF {stats['real_time_factor']:.2f}")
+    if errors:
+        print(f"WER {sum(errors) / len(errors):.1%} over {len(errors)} transcribed references")
+
+    if reload_count:
+        reloaded = []
+        for source in sources[:reload_count]:
+            fresh = WhisperSTT(model_size=model_size, device=device, language=language)
+            start = time.perf_counter()
+            with redirect_stdout(StringIO()):
+                fresh.transcribe_pcm(source.pcm, source.sample_rate)
+            reloaded.append((time.perf_counter() - start) * 1000)
+            del fresh
+        resident = sum(times[:reload_count]) / len(reloaded)
+        print(f"Loading per call: {sum(reloaded) / len(reloaded):.0f} ms per utterance "
+              f"vs {resident:.0f} ms resident (first {len(reloaded)} files)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Whisper transcription over WAV files")
+    parser.add_argument("--dir", required=True, help="Directory of 16-bit PCM WAV files (optional .txt transcripts)")
+    parser.add_argument("--model", default="base", help="Whisper model size")
+    parser.add_argument("--device", help="cuda or cpu (default: Whisper's choice)")
+    parser.add_argument("--language", default="english", help="Whisper language, or 'auto' to detect it per file")
+    parser.add_argument("--reload", type=int, default=0, help="Also time this many files with per-call loading")
+    args = parser.parse_args()
+    language = None if args.language == "auto" else args.language
+    run(args.dir, args.model, args.device, language, args.reload)
@@ -0,0 +1,139 @@
+"""
+Benchmark for the persistent TTS workers.
+
+1. Overhead of `speak(blocking=False)`: the time the caller spends handing
+   an utterance to the worker.
+2. Time from `speak()` to the end of a short utterance for a speech
+   process started per utterance (as SystemTTS used to spawn PowerShell)
+   vs one long-lived process. The stand-in process pays `--startup-ms` of
+   start-up (PowerShell loading System.Speech) and `--word-ms` per word;
+   with `--engine system` or `--engine espeak` the real engine is timed
+   instead.
+3. How fast `cancel()` silences a long utterance.
+
+Usage:
+    python -m pulse.tools.bench_tts --utterances 20 --startup-ms 400
+    python -m pulse.tools.bench_tts --engine espeak
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+from typing import List
+
+from pulse.voice.tts import EspeakTTS, StubTTS, SystemTTS, _ProcessTTS
+
+SENTENCE = "The system checks soil moisture every morning at six."
+
+# A speech process stand-in: start-up cost, then a line in, a line out per utterance
+_FAKE_SPEAKER = (
+    "import sys, time\n"
+    "time.sleep({startup} / 1000)\n"
+    "print('ready', flush=True)\n"
+    "for line in sys.stdin:\n"
+    "    time.sleep(len(line.split()) * {word} / 1000)\n"
+    "    print('done', flush=True)\n"
+)
+
+
+class _FakeProcessTTS(_ProcessTTS):
+    ready_line = "ready"
+
+    def __init__(self, startup_ms: float, word_ms: float):
+        super().__init__()
+        self.script = _FAKE_SPEAKER.format(startup=startup_ms, word=word_ms)
+
+    def _command(self) -> List[str]:
+        return [sys.executable, "-c", self.script]
+
+
+def _percentile(samples, q: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+def bench_enqueue(count: int):
+    tts = StubTTS(word_ms=0.0, max_pending=count + 1).start()
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        tts.speak(SENTENCE, blocking=False)
+        samples.append((time.perf_counter() - start) * 1e6)
+    tts.wait()
+    tts.close()
+    print(f"speak(blocking=False): p50 {_percentile(samples, 0.5):6.1f} us  p99 {_percentile(samples, 0.99):6.1f} us")
+
+
+def bench_per_utterance(command: List[str], text: str, count: int) -> List[float]:
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        subprocess.run(command, input=text + "\n", text=True, stdout=subprocess.DEVNULL, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def bench_persistent(tts, count: int) -> List[float]:
+    tts.start()
+    tts.speak("Ready.")  # Let the worker finish starting
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        tts.speak(SENTENCE)
+        samples.append((time.perf_counter() - start) * 1000)
+    tts.close()
+    return samples
+
+
+def bench_cancel(tts, words: int = 200) -> float:
+    tts.start()
+    tts.speak("Ready.")
+    utterance = tts.speak(" ".join(["word"] * words), blocking=False)
+    while utterance.started is None:
+        time.sleep(0.001)
+    time.sleep(0.05)
+    start = time.perf_counter()
+    tts.cancel()
+    utterance.wait()
+    elapsed = (time.perf_counter() - start) * 1000
+    tts.close()
+    return elapsed
+
+
+def run(engine: str, count: int, startup_ms: float, word_ms: float):
+    bench_enqueue(count * 50)
+
+    if engine == "system":
+        make = SystemTTS
+        # The old path: a fresh PowerShell with Add-Type per utterance
+        old_command = ["powershell", "-Command",
+                       "Add-Type -AssemblyName System.Speech; "
+                       f"(New-Object System.Speech.Synthesis.SpeechSynthesizer).Speak(\"{SENTENCE}\")"]
+        per_utterance = bench_per_utterance(old_command, "", count)
+    elif engine == "espeak":
+        make = EspeakTTS
+    else:
+        def make():
+            return _FakeProcessTTS(startup_ms, word_ms)
+        per_utterance = bench_per_utterance(
+            [sys.executable, "-c", _FAKE_SPEAKER.format(startup=startup_ms, word=word_ms)], SENTENCE, count
+        )
+        print(f"Stand-in speech process: {startup_ms:.0f} ms start-up, {word_ms:.0f} ms per word")
+
+    print(f"Short utterance ({len(SENTENCE.split())} words), speak() to done:")
+    if engine != "espeak":
+        print(f"  process per utterance  p50 {_percentile(per_utterance, 0.5):7.1f} ms")
+    persistent = bench_persistent(make(), count)
+    print(f"  persistent worker      p50 {_percentile(persistent, 0.5):7.1f} ms")
+    print(f"cancel() of a long utterance: {bench_cancel(make()):.1f} ms to silence")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the persistent TTS workers")
+    parser.add_argument("--engine", choices=["stand-in", "system", "espeak"], default="stand-in")
+    parser.add_argument("--utterances", type=int, default=20)
+    parser.add_argument("--startup-ms", type=float, default=400.0)
+    parser.add_argument("--word-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    run(args.engine, args.utterances, args.startup_ms, args.word_ms)
@@ -0,0 +1,109 @@
+"""
+Benchmark for streaming voice responses.
+
+Answers the same commands through VoiceLoop against the local stub server,
+once think-then-speak and once speaking sentence by sentence while the
+response streams, with a stand-in TTS engine that takes a fixed time per
+word. Reports when the first word is heard and when the turn is done,
+and checks that every turn was saved to memory.
+
+Usage:
+    python -m pulse.tools.bench_voice_stream --turns 5 --chunk-delay-ms 40 --word-ms 150
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+
+from pulse.config import PulseConfig
+from pulse.core.brain import Brain
+from pulse.tools.stub_llm_server import StubLLMServer
+from pulse.voice.tts import StubTTS
+from pulse.voice.voice_loop import VoiceLoop
+
+REPLY = (
+    "Sure, here is a quick overview of how the garden watering schedule works. "
+    "The system checks soil moisture every morning at six. "
+    "If the reading is below the threshold, it waters each zone for about ten minutes. "
+    "Zones with more sun get a longer cycle, roughly fifteen minutes on hot days. "
+    "You can change any of this from the settings page, or just ask me to adjust it."
+)
+
+
+class TimedTTS(StubTTS):
+    """Speaks nothing; takes `word_ms` per word and records when speech started."""
+
+    def __init__(self, word_ms: float):
+        super().__init__(word_ms)
+        self.first_spoken = None
+
+    def _say(self, text: str):
+        if self.first_spoken is None:
+            self.first_spoken = time.perf_counter()
+        super()._say(text)
+
+
+def _percentile(samples, q: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+def _measure(loop: VoiceLoop, streaming: bool, turns: int, word_ms: float):
+    loop.config.stream_voice = streaming
+    first, total, calls = [], [], 0
+    for n in range(turns):
+        loop.tts = TimedTTS(word_ms)
+        start = time.perf_counter()
+        with redirect_stdout(StringIO()):
+            if streaming:
+                loop._respond(f"Question {n}: how does the watering schedule work?")
+            else:
+                loop.tts.speak(loop.brain.think(f"Question {n}: how does the watering schedule work?"))
+        total.append((time.perf_counter() - start) * 1000)
+        first.append((loop.tts.first_spoken - start) * 1000)
+        calls += loop.tts.spoken
+        loop.tts.close()
+    label = "streaming" if streaming else "think, then speak"
+    print(f"  {label:<18} first word p50 {_percentile(first, 0.5):7.0f} ms"
+          f"  turn p50 {_percentile(total, 0.5):7.0f} ms  {calls / turns:.1f} TTS calls/turn")
+
+
+def run(turns: int, chunk_delay_ms: float, latency_ms: float, word_ms: float):
+    server = StubLLMServer(latency_ms=latency_ms, chunk_delay_ms=chunk_delay_ms, reply=REPLY).start()
+    with tempfile.TemporaryDirectory() as tmp:
+        config = PulseConfig(
+            db_path=os.path.join(tmp, "bench.db"),
+            openrouter_base_url=server.url,
+            fallback_models=[],
+            memory_write_behind=False,
+            compressor_backend="local",
+            enable_semantic_cache=False,  # Every turn must reach the stub
+            tts_engine="stub",
+        )
+        try:
+            with redirect_stdout(StringIO()):
+                brain = Brain(config)
+                loop = VoiceLoop(brain, config)
+            loop.running = True
+            words = len(REPLY.split())
+            print(f"{words}-word reply, {latency_ms:.0f} ms to first token, {chunk_delay_ms:.0f} ms per token, "
+                  f"{word_ms:.0f} ms per spoken word:")
+            _measure(loop, False, turns, word_ms)
+            _measure(loop, True, turns, word_ms)
+            saved = sum(1 for m in brain.memory.get_history(limit=4 * turns) if m.role == "assistant")
+            print(f"  assistant turns saved: {saved}/{2 * turns}")
+        finally:
+            server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark streaming voice responses")
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--chunk-delay-ms", type=float, default=40.0)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--word-ms", type=float, default=150.0)
+    args = parser.parse_args()
+    run(args.turns, args.chunk_delay_ms, args.latency_ms, args.word_ms)
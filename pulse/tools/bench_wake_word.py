@@ -0,0 +1,172 @@
+"""
+Benchmark for the offline wake-word detector.
+
+Enrolls a wake word from a few clips, then streams a long recording
+through WakeWordDetector in 30 ms frames and reports detections, misses,
+false alarms, detection latency (end of the spoken word to detection) and
+CPU use as a share of one core at real time.
+
+Without arguments the audio is synthesised: words are voiced sounds
+following formant trajectories (so MFCCs see them the way they see
+vowels), spoken by "speakers" with different pitch, tempo and vocal
+tract length, over room noise. The stream holds the wake word and
+distractor words at known times. Real recordings can be used instead:
+
+    python -m pulse.tools.bench_wake_word
+    python -m pulse.tools.bench_wake_word --enroll p1.wav p2.wav p3.wav \\
+        --stream session.wav --at 3.2 11.8 20.5
+"""
+
+import argparse
+import random
+import time
+from typing import List, Tuple
+
+import numpy as np
+
+from pulse.voice.audio import WavFileSource
+from pulse.voice.wake_word import SAMPLE_RATE, WakeWordDetector, enroll
+
+# Formant (F1, F2) keypoints of the synthetic words, and a trailing hiss for "s"
+WORDS = {
+    "pulse": ([(300, 900), (620, 1150), (480, 1250), (450, 1650)], True),
+    "hello": ([(500, 1900), (520, 1800), (450, 1000), (420, 900)], False),
+    "weather": ([(300, 700), (650, 1750), (520, 1500), (480, 1300)], False),
+    "please": ([(350, 1200), (300, 2300), (280, 2400), (280, 2350)], True),
+    "bottle": ([(400, 800), (700, 1100), (550, 1000), (400, 1000)], False),
+}
+FRAME_MS = 30
+
+
+def synth_word(word: str, rng: random.Random, pitch: float, tempo: float, tract: float,
+               level: float = 4000.0) -> np.ndarray:
+    """A voiced rendering of `word` by a speaker with the given pitch, tempo and vocal-tract scale."""
+    keypoints, hiss = WORDS[word]
+    duration = 0.5 * tempo
+    n = int(duration * SAMPLE_RATE)
+    t = np.arange(n) / SAMPLE_RATE
+    where = np.linspace(0, 1, len(keypoints))
+    f1 = np.interp(t / duration, where, [k[0] for k in keypoints]) * tract
+    f2 = np.interp(t / duration, where, [k[1] for k in keypoints]) * tract
+    f0 = pitch * (1.0 + 0.08 * np.sin(2 * np.pi * 1.5 * t / duration))
+    phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+    signal = np.zeros(n)
+    for k in range(1, int(4000 / pitch)):
+        freq = k * f0
+        gain = np.exp(-((freq - f1) / 90.0) ** 2) + 0.7 * np.exp(-((freq - f2) / 120.0) ** 2) + 0.02
+        signal += gain * np.sin(k * phase)
+    envelope = np.minimum(1.0, np.minimum(t / 0.04, (duration - t) / 0.06))
+    signal = signal / (np.abs(signal).max() + 1e-9) * envelope
+    if hiss:
+        tail = int(0.15 * tempo * SAMPLE_RATE)
+        noise = np.random.default_rng(rng.randrange(1 << 30)).normal(0, 1, tail)
+        hiss_sound = np.diff(noise, prepend=0) * 0.2 * np.minimum(1, np.arange(tail)[::-1] / 400)
+        signal = np.concatenate([signal, hiss_sound])
+    return signal * level
+
+
+def random_speaker(rng: random.Random) -> dict:
+    return {"pitch": rng.uniform(95, 230), "tempo": rng.uniform(0.8, 1.25), "tract": rng.uniform(0.9, 1.1)}
+
+
+def room_noise(seconds: float, rng: random.Random, level: float = 120.0) -> np.ndarray:
+    noise = np.random.default_rng(rng.randrange(1 << 30)).normal(0, level, int(seconds * SAMPLE_RATE))
+    hum = 0.5 * level * np.sin(2 * np.pi * 50 * np.arange(len(noise)) / SAMPLE_RATE)
+    return noise + hum
+
+
+def _in_noise(clip: np.ndarray, rng: random.Random, pad_s: float = 0.3) -> np.ndarray:
+    """`clip` over room noise, with `pad_s` of noise alone on either side."""
+    audio = room_noise(len(clip) / SAMPLE_RATE + 2 * pad_s, rng)
+    start = int(pad_s * SAMPLE_RATE)
+    audio[start:start + len(clip)] += clip
+    return audio
+
+
+def synth_stream(rng: random.Random, wake_word: str, count: int, distractors: int,
+                 seconds_per_word: float = 3.0) -> Tuple[np.ndarray, List[float], List[str]]:
+    """Noise with `count` wake words and `distractors` other words; returns audio and wake-word end times."""
+    words = [wake_word] * count + [rng.choice([w for w in WORDS if w != wake_word]) for _ in range(distractors)]
+    rng.shuffle(words)
+    audio = room_noise(len(words) * seconds_per_word + 1.0, rng)
+    ends = []
+    for i, word in enumerate(words):
+        clip = synth_word(word, rng, level=rng.uniform(2500, 6000), **random_speaker(rng))
+        start = int((i * seconds_per_word + rng.uniform(0.5, 1.5)) * SAMPLE_RATE)
+        audio[start:start + len(clip)] += clip
+        if word == wake_word:
+            ends.append((start + len(clip)) / SAMPLE_RATE)
+    return audio, ends, words
+
+
+def _pcm(audio: np.ndarray) -> np.ndarray:
+    return np.clip(audio, -32768, 32767).astype(np.int16)
+
+
+def run_stream(detector: WakeWordDetector, samples: np.ndarray, ends: List[float], tolerance_s: float = 0.6):
+    frame = SAMPLE_RATE * FRAME_MS // 1000
+    detector.reset()
+    hits = []
+    cpu = time.process_time()
+    wall = time.perf_counter()
+    for start in range(0, len(samples) - frame + 1, frame):
+        hit = detector.process(samples[start:start + frame])
+        if hit is not None:
+            hits.append(hit)
+    cpu = time.process_time() - cpu
+    wall = time.perf_counter() - wall
+    seconds = len(samples) / SAMPLE_RATE
+
+    latencies, false_alarms, found = [], 0, set()
+    for hit in hits:
+        match = next((i for i, end in enumerate(ends) if -0.3 <= hit.at_s - end <= tolerance_s), None)
+        if match is None:
+            false_alarms += 1
+        elif match not in found:
+            found.add(match)
+            latencies.append((hit.at_s - ends[match]) * 1000)
+    print(f"{seconds:.0f} s of audio, {len(ends)} wake words:")
+    print(f"  detected {len(found)}/{len(ends)}, false alarms {false_alarms} "
+          f"({false_alarms / seconds * 3600:.0f}/hour)")
+    if latencies:
+        latencies.sort()
+        print(f"  latency after the word ends: p50 {latencies[len(latencies) // 2]:.0f} ms, "
+              f"max {latencies[-1]:.0f} ms (negative: before the word has fully ended)")
+    print(f"  CPU {cpu / seconds * 100:.2f}% of one core ({seconds / wall:.0f}x real time), "
+          f"{len(detector.bank.rows)} template frames")
+    print("  network requests: 0 (the Google path sends one per 3 s listen)")
+
+
+def run_synthetic(seed: int, enroll_count: int, count: int, distractors: int):
+    rng = random.Random(seed)
+    clips = [_pcm(_in_noise(synth_word("pulse", rng, **random_speaker(rng)), rng)) for _ in range(enroll_count)]
+    templates, threshold = enroll(clips)
+    print(f"Enrolled 'pulse' from {len(templates)} synthetic speakers, threshold {threshold:.3f}")
+    detector = WakeWordDetector({"pulse": templates}, {"pulse": threshold})
+    audio, ends, _ = synth_stream(rng, "pulse", count, distractors)
+    run_stream(detector, _pcm(audio), ends)
+
+
+def run_files(enroll_paths: List[str], stream_path: str, ends: List[float], word: str):
+    clips = [WavFileSource(path).pcm for path in enroll_paths]
+    templates, threshold = enroll(clips)
+    print(f"Enrolled '{word}' from {len(templates)} recordings, threshold {threshold:.3f}")
+    detector = WakeWordDetector({word: templates}, {word: threshold})
+    run_stream(detector, np.frombuffer(WavFileSource(stream_path).pcm, dtype=np.int16), ends)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark offline wake-word detection")
+    parser.add_argument("--seed", type=int, default=3)
+    parser.add_argument("--enroll-count", type=int, default=3, help="Synthetic enrollment speakers")
+    parser.add_argument("--wake-words", type=int, default=20, help="Wake words in the synthetic stream")
+    parser.add_argument("--distractors", type=int, default=40, help="Other words in the synthetic stream")
+    parser.add_argument("--enroll", nargs="+", help="WAV recordings of the wake word")
+    parser.add_argument("--stream", help="WAV recording to detect in (16 kHz, 16-bit)")
+    parser.add_argument("--at", nargs="*", type=float, default=[], help="Where the wake word ends in --stream (s)")
+    parser.add_argument("--word", default="pulse")
+    args = parser.parse_args()
+    if args.enroll and args.stream:
+        run_files(args.enroll, args.stream, args.at, args.word)
+    else:
+        run_synthetic(args.seed, args.enroll_count, args.wake_words, args.distractors)
@@ -0,0 +1,79 @@
+"""
+Enroll a wake word for offline detection.
+
+Records the word a few times from the microphone (or takes WAV files),
+builds the DTW templates and threshold, and adds them to the templates
+file VoiceLoop loads (`wake_word_templates`, ~/.pulse/wake_words.npz by
+default). Re-enrolling a word replaces it.
+
+Usage:
+    python -m pulse.tools.enroll_wake_word --word pulse --record 4
+    python -m pulse.tools.enroll_wake_word --word pulse --wav p1.wav p2.wav p3.wav
+    python -m pulse.tools.enroll_wake_word --remove hello
+"""
+
+import argparse
+import os
+import time
+
+from pulse.config import PulseConfig
+from pulse.voice.audio import MicrophoneSource, WavFileSource
+from pulse.voice.wake_word import SAMPLE_RATE, enroll, load_templates, save_templates
+
+
+def record_clips(count: int, seconds: float):
+    mic = MicrophoneSource(sample_rate=SAMPLE_RATE)
+    clips = []
+    try:
+        for i in range(count):
+            input(f"[{i + 1}/{count}] Press Enter, then say the word...")
+            frames = []
+            with mic:
+                end = time.monotonic() + seconds
+                while time.monotonic() < end:
+                    frames.append(mic.read_frame())
+            clips.append(b"".join(frames))
+    finally:
+        mic.terminate()
+    return clips
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Enroll a wake word for offline detection")
+    parser.add_argument("--word", help="The wake word to enroll")
+    parser.add_argument("--wav", nargs="+", help="Recordings of the word (16 kHz, 16-bit mono WAV)")
+    parser.add_argument("--record", type=int, default=0, help="Record this many takes from the microphone")
+    parser.add_argument("--seconds", type=float, default=2.0, help="Length of each recorded take")
+    parser.add_argument("--remove", help="Remove an enrolled word")
+    parser.add_argument("--path", help="Templates file (default: the config's wake_word_templates)")
+    args = parser.parse_args()
+
+    path = args.path or PulseConfig.from_env().wake_word_templates
+    templates, thresholds = load_templates(path) if os.path.exists(path) else ({}, {})
+
+    if args.remove:
+        templates.pop(args.remove, None)
+        thresholds.pop(args.remove, None)
+    else:
+        if not args.word or not (args.wav or args.record):
+            parser.error("--word and either --wav or --record are required")
+        if args.wav:
+            sources = [WavFileSource(p) for p in args.wav]
+            for source in sources:
+                if source.sample_rate != SAMPLE_RATE:
+                    parser.error(f"{source.path} is {source.sample_rate} Hz; record at {SAMPLE_RATE} Hz")
+            clips = [source.pcm for source in sources]
+        else:
+            clips = record_clips(args.record, args.seconds)
+        clips_templates, threshold = enroll(clips)
+        templates[args.word] = clips_templates
+        thresholds[args.word] = threshold
+        print(f"Enrolled '{args.word}' from {len(clips_templates)} takes, threshold {threshold:.3f}")
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    save_templates(path, templates, thresholds)
+    print(f"Wake words in {path}: {', '.join(templates) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,8 +9,8 @@ from pulse.core.memory import Memory
 
 def export_to_jsonl(db_path: str, output_file: str):
     """
-    Export conversation history to JSONL format.
-    Format: {"role": "user", "content": "..."}
+    Export conversation history of every session to JSONL format.
+    Format: {"role": "user", "content": "...", "session": "..."}
     """
     print(f"Exporting memory from {db_path} to {output_file}...")
     
@@ -19,21 +19,21 @@ def export_to_jsonl(db_path: str, output_file: str):
     config = PulseConfig.from_env()
     mem = Memory(db_path, config.encryption_key)
     
-    # Get all history
-    # We increase limit to get everything
-    messages = mem.get_history(limit=10000)
-    
     count = 0
     with open(output_file, 'w', encoding='utf-8') as f:
-        for msg in messages:
-            record = {
-                "role": msg.role,
-                "content": msg.content,
-                "timestamp": msg.timestamp,
-                "metadata": msg.metadata
-            }
-            f.write(json.dumps(record) + "\n")
-            count += 1
+        for session in mem.list_sessions():
+            # Get all history of the session
+            # We increase limit to get everything
+            for msg in mem.get_history(limit=10000, session=session):
+                record = {
+                    "role": msg.role,
+                    "content": msg.content,
+                    "timestamp": msg.timestamp,
+                    "metadata": msg.metadata,
+                    "session": session
+                }
+                f.write(json.dumps(record) + "\n")
+                count += 1
             
     print(f"✅ Successfully exported {count} messages to {output_file}")
 
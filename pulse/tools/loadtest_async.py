@@ -0,0 +1,114 @@
+"""
+Load test for AsyncBrain against the local stub server.
+
+Runs many conversations at once, each a few streamed turns with its own
+session, and reports throughput and time-to-first-token / turn latency.
+`--threads N` runs the same load through the blocking Brain on N threads
+for comparison.
+
+Usage:
+    python -m pulse.tools.loadtest_async --sessions 500 --turns 3
+    python -m pulse.tools.loadtest_async --sessions 500 --turns 3 --threads 32
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pulse.config import PulseConfig
+from pulse.core.async_brain import AsyncBrain
+from pulse.core.brain import Brain
+from pulse.tools.stub_llm_server import StubLLMServer
+
+
+def _config(db_path: str, base_url: str) -> PulseConfig:
+    return PulseConfig(
+        db_path=db_path,
+        openrouter_base_url=base_url,
+        fallback_models=[],
+        memory_write_behind=False,
+        http_prewarm=False,
+        compressor_backend="local",
+    )
+
+
+def _percentile(samples, q: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))] if samples else 0.0
+
+
+async def _run_async(config: PulseConfig, sessions: int, turns: int):
+    brain = AsyncBrain(config)
+    ttft, latency = [], []
+
+    async def conversation(n: int):
+        for t in range(turns):
+            start = time.perf_counter()
+            first = None
+            async for _ in brain.stream_thought(f"Session {n}, question {t}: how is the plan going?",
+                                                session=f"load-{n}"):
+                if first is None:
+                    first = time.perf_counter()
+            ttft.append((first - start) * 1000)
+            latency.append((time.perf_counter() - start) * 1000)
+
+    try:
+        await asyncio.gather(*(conversation(n) for n in range(sessions)))
+    finally:
+        await brain.aclose()
+    return ttft, latency
+
+
+def _run_threads(config: PulseConfig, sessions: int, turns: int, threads: int):
+    brain = Brain(config)
+    ttft, latency = [], []
+
+    def conversation(n: int):
+        for t in range(turns):
+            start = time.perf_counter()
+            first = None
+            for _ in brain.stream_thought(f"Session {n}, question {t}: how is the plan going?",
+                                          session=f"load-{n}"):
+                if first is None:
+                    first = time.perf_counter()
+            ttft.append((first - start) * 1000)
+            latency.append((time.perf_counter() - start) * 1000)
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(conversation, range(sessions)))
+    brain.memory.close()
+    return ttft, latency
+
+
+def run(sessions: int, turns: int, latency_ms: float, chunk_delay_ms: float, threads: int):
+    server = StubLLMServer(latency_ms=latency_ms, chunk_delay_ms=chunk_delay_ms).start()
+    with tempfile.TemporaryDirectory() as tmp:
+        config = _config(os.path.join(tmp, "load.db"), server.url)
+        start = time.perf_counter()
+        if threads:
+            mode = f"Brain on {threads} threads"
+            ttft, latency = _run_threads(config, sessions, turns, threads)
+        else:
+            mode = "AsyncBrain"
+            ttft, latency = asyncio.run(_run_async(config, sessions, turns))
+        wall = time.perf_counter() - start
+    server.stop()
+
+    print(f"{mode}: {sessions} sessions x {turns} turns, server latency {latency_ms:.0f} ms")
+    print(f"  wall {wall:.2f} s, {len(latency) / wall:,.0f} turns/s, {server.connections} connections")
+    print(f"  ttft  p50 {_percentile(ttft, 0.5):8.1f} ms  p99 {_percentile(ttft, 0.99):8.1f} ms")
+    print(f"  turn  p50 {_percentile(latency, 0.5):8.1f} ms  p99 {_percentile(latency, 0.99):8.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent-session load test against a stub LLM server")
+    parser.add_argument("--sessions", type=int, default=300)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="Stub time to first byte")
+    parser.add_argument("--chunk-delay-ms", type=float, default=5.0)
+    parser.add_argument("--threads", type=int, default=0, help="Use the blocking Brain on N threads instead")
+    args = parser.parse_args()
+    run(args.sessions, args.turns, args.latency_ms, args.chunk_delay_ms, args.threads)
@@ -0,0 +1,182 @@
+"""
+Local stand-in for the OpenRouter and Gemini REST APIs.
+
+Answers chat completions (plain and SSE-streamed) with canned text, with
+configurable delays so client-side latency work can be measured offline:
+`connect_delay_ms` is paid once per new connection (a stand-in for the
+TCP+TLS handshake to a remote API), `latency_ms` before the response
+headers of every request, and `chunk_delay_ms` between streamed chunks
+(a plain response waits as long as its stream would have).
+`model_latency_ms` and `model_errors` override the latency of, or make
+fail with an HTTP status, individual models. With `chunked=False` streams
+are sent close-delimited, as some proxies do, instead of chunk-encoded.
+
+Usage:
+    python -m pulse.tools.stub_llm_server --port 8089 --connect-delay-ms 80
+    OPENROUTER_BASE_URL=http://127.0.0.1:8089/api/v1 python -m pulse.main --mode cli
+"""
+
+import argparse
+import json
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+REPLY = "This is a canned reply from the local stub server. It has a few sentences. Nothing more."
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; don't let Nagle hold the body back
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        stub = self.server.stub
+        with stub.lock:
+            stub.connections += 1
+        if stub.connect_delay_ms:
+            time.sleep(stub.connect_delay_ms / 1000.0)
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        stub = self.server.stub
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            payload = {}
+        model = payload.get("model", "stub-model")
+        with stub.lock:
+            stub.requests += 1
+        latency_ms = stub.model_latency_ms.get(model, stub.latency_ms)
+        if latency_ms:
+            time.sleep(latency_ms / 1000.0)
+
+        words = stub.reply.split(" ")
+        chunks = [w + (" " if i < len(words) - 1 else "") for i, w in enumerate(words)]
+        if model in stub.model_errors:
+            status = stub.model_errors[model]
+            self._send_json({"error": {"message": f"Stub error for {model}"}}, status=status)
+        elif self.path.endswith("/chat/completions"):
+            if payload.get("stream"):
+                events = [{"choices": [{"delta": {"content": c}}], "model": model} for c in chunks]
+                self._send_sse([json.dumps(e) for e in events] + ["[DONE]"])
+            else:
+                self._generate(len(chunks))
+                self._send_json({
+                    "model": model,
+                    "choices": [{"message": {"role": "assistant", "content": stub.reply}}],
+                    "usage": {"prompt_tokens": 1, "completion_tokens": len(chunks)},
+                })
+        elif ":streamGenerateContent" in self.path:
+            events = [{"candidates": [{"content": {"parts": [{"text": c}]}}]} for c in chunks]
+            self._send_sse([json.dumps(e) for e in events])
+        elif ":generateContent" in self.path:
+            self._generate(len(chunks))
+            self._send_json({"candidates": [{"content": {"parts": [{"text": stub.reply}]}}]})
+        else:
+            self._send_json({"error": {"message": f"Unknown path {self.path}"}}, status=404)
+
+    def _generate(self, tokens: int):
+        """A complete response takes as long to generate as the stream of it."""
+        if self.server.stub.chunk_delay_ms and tokens > 1:
+            time.sleep((tokens - 1) * self.server.stub.chunk_delay_ms / 1000.0)
+
+    def _send_json(self, body, status: int = 200):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_sse(self, events):
+        stub = self.server.stub
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        if stub.chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+        else:
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        self.end_headers()
+        for i, event in enumerate(events):
+            if i and stub.chunk_delay_ms:
+                time.sleep(stub.chunk_delay_ms / 1000.0)
+            data = f"data: {event}\n\n".encode("utf-8")
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data) if stub.chunked else data)
+            self.wfile.flush()
+        if stub.chunked:
+            self.wfile.write(b"0\r\n\r\n")
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # Load tests open hundreds of connections at once
+
+    def handle_error(self, request, client_address):
+        # Clients hanging up mid-response (cancelled hedges) are expected
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class StubLLMServer:
+    """Threaded stub server; `start()` it and point a client's base_url at `url`."""
+
+    def __init__(self, port: int = 0, connect_delay_ms: float = 0.0, latency_ms: float = 0.0,
+                 chunk_delay_ms: float = 0.0, reply: str = REPLY,
+                 model_latency_ms: Optional[Dict[str, float]] = None,
+                 model_errors: Optional[Dict[str, int]] = None, chunked: bool = True):
+        self.connect_delay_ms = connect_delay_ms
+        self.latency_ms = latency_ms
+        self.chunk_delay_ms = chunk_delay_ms
+        self.model_latency_ms = model_latency_ms or {}
+        self.model_errors = model_errors or {}
+        self.chunked = chunked
+        self.reply = reply
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self._server = _Server(("127.0.0.1", port), _Handler)
+        self._server.stub = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/v1"
+
+    def start(self) -> "StubLLMServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-llm", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stub of the OpenRouter/Gemini APIs")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--connect-delay-ms", type=float, default=0.0)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--chunk-delay-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    server = StubLLMServer(args.port, args.connect_delay_ms, args.latency_ms, args.chunk_delay_ms).start()
+    print(f"Stub LLM server on {server.url}")
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
@@ -2,12 +2,17 @@
 Voice interaction capabilities for Pulse.
 """
 
+from pulse.voice.audio import AudioSource, WavFileSource, MicrophoneSource
 from pulse.voice.stt import STTEngine, WhisperSTT
-from pulse.voice.tts import TTSEngine, Pyttsx3TTS, ElevenLabsTTS
+from pulse.voice.tts import TTSEngine, QueuedTTS, Pyttsx3TTS, ElevenLabsTTS, SystemTTS, EspeakTTS, StubTTS
+from pulse.voice.vad import EnergyVAD, BargeInMonitor
+from pulse.voice.wake_word import WakeWordDetector
 from pulse.voice.voice_loop import VoiceLoop
 
 __all__ = [
+    "AudioSource", "WavFileSource", "MicrophoneSource",
     "STTEngine", "WhisperSTT", 
-    "TTSEngine", "Pyttsx3TTS", "ElevenLabsTTS",
+    "TTSEngine", "QueuedTTS", "Pyttsx3TTS", "ElevenLabsTTS", "SystemTTS", "EspeakTTS", "StubTTS",
+    "EnergyVAD", "BargeInMonitor", "WakeWordDetector",
     "VoiceLoop"
 ]
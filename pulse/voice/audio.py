@@ -0,0 +1,147 @@
+"""
+Audio capture sources.
+
+A source yields fixed-size frames of 16-bit mono PCM. MicrophoneSource
+reads the default input device through PyAudio; WavFileSource replays a
+recording (optionally at real-time pace), so everything that listens can
+be exercised with audio fixtures instead of a microphone.
+"""
+
+import time
+import wave
+from abc import ABC, abstractmethod
+from array import array
+from typing import Optional
+
+from pulse.exceptions import VoiceError
+
+
+class AudioSource(ABC):
+    """Frames of 16-bit mono PCM, `frame_ms` long each."""
+
+    sample_rate: int = 16000
+    frame_ms: int = 30
+
+    @property
+    def frame_samples(self) -> int:
+        return self.sample_rate * self.frame_ms // 1000
+
+    def open(self):
+        """Start capturing (sources may be opened and closed repeatedly)."""
+        pass
+
+    @abstractmethod
+    def read_frame(self) -> Optional[bytes]:
+        """The next frame, blocking until it is available; None at the end of the audio."""
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class WavFileSource(AudioSource):
+    """
+    Replays a 16-bit PCM WAV file. With `realtime` frames come at the pace
+    they were recorded, like a live microphone; each `open()` rewinds.
+    """
+
+    def __init__(self, path: str, frame_ms: int = 30, realtime: bool = False):
+        self.path = path
+        self.frame_ms = frame_ms
+        self.realtime = realtime
+        with wave.open(path, "rb") as wav:
+            if wav.getsampwidth() != 2:
+                raise VoiceError(f"{path}: only 16-bit PCM WAV files are supported")
+            self.sample_rate = wav.getframerate()
+            channels = wav.getnchannels()
+            pcm = wav.readframes(wav.getnframes())
+        if channels > 1:
+            samples = array("h", pcm)
+            samples = array("h", (sum(samples[i:i + channels]) // channels
+                                  for i in range(0, len(samples), channels)))
+            pcm = samples.tobytes()
+        self.pcm = pcm
+        self._offset = 0
+        self._started = 0.0
+        self._frames = 0
+
+    @property
+    def duration_s(self) -> float:
+        return len(self.pcm) / 2 / self.sample_rate
+
+    def open(self):
+        self._offset = 0
+        self._frames = 0
+        self._started = time.perf_counter()
+
+    def read_frame(self) -> Optional[bytes]:
+        size = self.frame_samples * 2
+        if self._offset + size > len(self.pcm):
+            return None
+        if self.realtime:
+            due = self._started + self._frames * self.frame_ms / 1000
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        frame = self.pcm[self._offset:self._offset + size]
+        self._offset += size
+        self._frames += 1
+        return frame
+
+
+class MicrophoneSource(AudioSource):
+    """
+    The default (or `device_index`) input device through PyAudio. The
+    PyAudio instance is kept between captures, only the stream is reopened.
+    """
+
+    def __init__(self, sample_rate: int = 16000, frame_ms: int = 30, device_index: Optional[int] = None):
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.device_index = device_index
+        self._pyaudio = None
+        self._audio = None
+        self._stream = None
+
+    def open(self):
+        if self._stream is not None:
+            return
+        if self._audio is None:
+            try:
+                import pyaudio
+            except ImportError:
+                raise VoiceError("PyAudio is not installed. Run: pip install pyaudio")
+            self._pyaudio = pyaudio
+            self._audio = pyaudio.PyAudio()
+        try:
+            self._stream = self._audio.open(
+                format=self._pyaudio.paInt16, channels=1, rate=self.sample_rate, input=True,
+                frames_per_buffer=self.frame_samples, input_device_index=self.device_index
+            )
+        except OSError as e:
+            raise VoiceError(f"Microphone access failed: {e}")
+
+    def read_frame(self) -> Optional[bytes]:
+        if self._stream is None:
+            return None
+        return self._stream.read(self.frame_samples, exception_on_overflow=False)
+
+    def close(self):
+        stream, self._stream = self._stream, None
+        if stream is not None:
+            stream.stop_stream()
+            stream.close()
+
+    def terminate(self):
+        """Release PyAudio itself."""
+        self.close()
+        if self._audio is not None:
+            self._audio.terminate()
+            self._audio = None
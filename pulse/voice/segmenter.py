@@ -0,0 +1,112 @@
+"""
+Incremental sentence splitter for speaking streamed responses.
+
+LLM chunks go in as they arrive, speakable segments come out as soon as
+they are complete: sentences, list items and lines, and for the first
+segment (or a run-on one) a clause, so speech can start before the first
+full stop has been generated. A boundary is only taken once the
+whitespace after it has arrived, so "3.14" or "e.g. this" never split
+mid-stream.
+"""
+
+import re
+from typing import List
+
+# Sentence ends (with closing quotes/brackets), clause breaks, and line breaks
+_BOUNDARY_RE = re.compile(r"[.!?…]+[\"'”’)\]]*(?=\s)|[,;:—](?=\s)|\n")
+
+_ABBREVIATIONS = {
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "approx", "fig", "no", "vol",
+    "e.g", "i.e", "a.m", "p.m", "u.s",
+}
+
+# Markdown that should not be read out: emphasis, headings, code ticks, bullets
+_MARKUP_RE = re.compile(r"[*`#]+|^\s*(?:[-•>]|\d+[.)])\s+", re.M)
+_SPACE_RE = re.compile(r"\s+")
+
+
+def speakable(text: str) -> str:
+    """`text` with markdown stripped and whitespace collapsed; "" if nothing is left to say."""
+    text = _SPACE_RE.sub(" ", _MARKUP_RE.sub(" ", text)).strip()
+    return text if any(c.isalnum() for c in text) else ""
+
+
+class SentenceSplitter:
+    """
+    Feed it response chunks with `feed()`; it returns the segments
+    completed so far. `flush()` returns the rest at the end of the stream.
+
+    The first segment is cut at the first clause break after
+    `first_clause_chars`; later ones at sentence ends once they are at
+    least `min_chars` long (short sentences are merged, each TTS call has
+    a start-up cost), at clause breaks past `max_chars`, and at a space
+    past twice that when there is no punctuation at all.
+    """
+
+    def __init__(self, first_clause_chars: int = 30, min_chars: int = 40, max_chars: int = 200):
+        self.first_clause_chars = first_clause_chars
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self._buffer = ""
+        self._scan = 0  # Where to look for the next boundary
+        self.segments = 0
+
+    def feed(self, chunk: str) -> List[str]:
+        self._buffer += chunk
+        segments = []
+        while True:
+            cut = self._next_cut()
+            if cut is None:
+                return segments
+            text = speakable(self._buffer[:cut])
+            self._buffer = self._buffer[cut:]
+            self._scan = 0
+            if text:
+                segments.append(text)
+                self.segments += 1
+
+    def flush(self) -> List[str]:
+        text = speakable(self._buffer)
+        self._buffer = ""
+        self._scan = 0
+        if not text:
+            return []
+        self.segments += 1
+        return [text]
+
+    def _next_cut(self):
+        """End of the next complete segment in the buffer, or None."""
+        buffer = self._buffer
+        first = self.segments == 0
+        for match in _BOUNDARY_RE.finditer(buffer, self._scan):
+            end = match.end()
+            mark = match.group()
+            length = len(buffer[:end].strip())
+            if mark == "\n":
+                if length:
+                    return end
+            elif mark[0] in ",;:—":
+                if length >= (self.first_clause_chars if first else self.max_chars):
+                    return end
+            elif not self._abbreviation(buffer, match.start()):
+                if first or length >= self.min_chars:
+                    return end
+            self._scan = end
+        if len(buffer) > 2 * self.max_chars:
+            space = buffer.rfind(" ", 0, 2 * self.max_chars)
+            if space > 0:
+                return space
+        return None
+
+    @staticmethod
+    def _abbreviation(buffer: str, dot: int) -> bool:
+        """Whether the full stop at `dot` ends an abbreviation, an initial or a list number."""
+        if buffer[dot] != ".":
+            return False
+        word = buffer[:dot].rsplit(None, 1)[-1].lower() if buffer[:dot].strip() else ""
+        word = word.lstrip("(\"'“‘")
+        if word in _ABBREVIATIONS or (len(word) == 1 and word.isalpha()):
+            return True
+        # "1. First step": a list number at the start of a line
+        line = buffer[:dot].rsplit("\n", 1)[-1].strip()
+        return line.isdigit()
@@ -3,11 +3,14 @@ Speech-to-Text (STT) implementation.
 """
 
 import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from pulse.exceptions import VoiceError
 
+WHISPER_SAMPLE_RATE = 16000
+
 
 class STTEngine(ABC):
     """Abstract base class for STT engines."""
@@ -26,12 +29,29 @@ class STTEngine(ABC):
 class WhisperSTT(STTEngine):
     """
     Local STT using OpenAI's Whisper model.
+
+    The model is loaded once and stays resident; every transcription
+    reuses it. `warm_up()` loads it on a background thread so start-up is
+    not blocked; a transcription that arrives first waits for it.
     """
     
-    def __init__(self, model_size: str = "base"):
+    def __init__(self, model_size: str = "base", device: Optional[str] = None,
+                 language: Optional[str] = "english"):
         self.model_size = model_size
+        self.device = device
+        self.language = language  # None: detect per utterance (unreliable on short commands)
         self._model = None
-        self._lock = threading.Lock()
+        self._lock = threading.Lock()  # Guards loading, and the model (not thread-safe) while in use
+        self._warmup_thread: Optional[threading.Thread] = None
+
+        # Timings, see stats()
+        self.load_ms: Optional[float] = None
+        self.warmup_ms: Optional[float] = None
+        self.last_transcribe_ms: Optional[float] = None
+        self.last_audio_s: Optional[float] = None
+        self.transcriptions = 0
+        self.total_transcribe_ms = 0.0
+        self.total_audio_s = 0.0
         
         # Lazy loading of heavy dependencies
         self._speech_recognition = None
@@ -58,6 +78,100 @@ class WhisperSTT(STTEngine):
         except OSError as e:
             raise VoiceError(f"Microphone access failed: {e}. Is PyAudio installed?")
 
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    def warm_up(self, background: bool = True):
+        """Load the model now, by default on a background thread."""
+        if self._model is not None or self._warmup_thread is not None:
+            return
+        if not background:
+            self.load()
+            return
+
+        def load_quietly():
+            try:
+                self.load()
+            except Exception as e:
+                print(f"Whisper warm-up failed: {e}")
+
+        self._warmup_thread = threading.Thread(target=load_quietly, name="pulse-whisper-warmup", daemon=True)
+        self._warmup_thread.start()
+
+    def load(self):
+        """The resident model, loading it on first use."""
+        with self._lock:
+            if self._model is not None:
+                return self._model
+            try:
+                import numpy as np
+                import whisper
+            except ImportError:
+                raise VoiceError("openai-whisper is not installed. Run: pip install openai-whisper")
+
+            start = time.perf_counter()
+            model = whisper.load_model(self.model_size, device=self.device)
+            self.load_ms = (time.perf_counter() - start) * 1000
+            # One short decode, so the first real utterance does not pay for kernel set-up
+            start = time.perf_counter()
+            model.transcribe(np.zeros(WHISPER_SAMPLE_RATE, dtype=np.float32), **self._options(model))
+            self.warmup_ms = (time.perf_counter() - start) * 1000
+            self._model = model
+            print(f"Whisper '{self.model_size}' loaded in {self.load_ms:.0f} ms (warm-up {self.warmup_ms:.0f} ms)")
+            return model
+
+    def _options(self, model) -> Dict[str, Any]:
+        device = getattr(model, "device", None)
+        options = {
+            "fp16": getattr(device, "type", "cpu") == "cuda",  # fp16 is not supported on CPU
+            "condition_on_previous_text": False,  # Utterances are independent
+        }
+        if self.language:
+            options["language"] = self.language
+        return options
+
+    def transcribe(self, samples) -> str:
+        """Transcribe float32 mono samples at 16 kHz with the resident model."""
+        model = self.load()
+        start = time.perf_counter()
+        with self._lock:
+            result = model.transcribe(samples, **self._options(model))
+        elapsed = (time.perf_counter() - start) * 1000
+        audio_s = len(samples) / WHISPER_SAMPLE_RATE
+        self.last_transcribe_ms = elapsed
+        self.last_audio_s = audio_s
+        self.transcriptions += 1
+        self.total_transcribe_ms += elapsed
+        self.total_audio_s += audio_s
+        return result.get("text", "").strip()
+
+    def transcribe_pcm(self, pcm: bytes, sample_rate: int = WHISPER_SAMPLE_RATE) -> str:
+        """Transcribe 16-bit mono PCM (resampled to 16 kHz if need be)."""
+        import numpy as np
+        samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+        if sample_rate != WHISPER_SAMPLE_RATE and len(samples):
+            count = int(len(samples) * WHISPER_SAMPLE_RATE / sample_rate)
+            samples = np.interp(
+                np.arange(count) * sample_rate / WHISPER_SAMPLE_RATE, np.arange(len(samples)), samples
+            ).astype(np.float32)
+        return self.transcribe(samples)
+
+    def stats(self) -> Dict[str, Any]:
+        """Load time and transcription times, in ms."""
+        return {
+            "model": self.model_size,
+            "loaded": self.loaded,
+            "load_ms": self.load_ms,
+            "warmup_ms": self.warmup_ms,
+            "transcriptions": self.transcriptions,
+            "last_transcribe_ms": self.last_transcribe_ms,
+            "last_audio_s": self.last_audio_s,
+            "mean_transcribe_ms": self.total_transcribe_ms / self.transcriptions if self.transcriptions else None,
+            # Processing time per second of audio
+            "real_time_factor": self.total_transcribe_ms / 1000 / self.total_audio_s if self.total_audio_s else None,
+        }
+
     def listen(self, timeout: int = 10) -> str:
         """Capture audio and transcribe using Whisper."""
         self._ensure_initialized()
@@ -69,13 +183,10 @@ class WhisperSTT(STTEngine):
                 audio = self._recognizer.listen(source, timeout=timeout, phrase_time_limit=10)
             
             print("Transcribing...")
-            # Use recognize_whisper (requires openai-whisper package installed)
-            text = self._recognizer.recognize_whisper(
-                audio, 
-                model=self.model_size,
-                language="english"
-            )
-            return text.strip()
+            # The resident model, rather than recognize_whisper (which may load it per call)
+            text = self.transcribe_pcm(audio.get_raw_data(convert_rate=WHISPER_SAMPLE_RATE, convert_width=2))
+            print(f"Transcribed {self.last_audio_s:.1f} s of audio in {self.last_transcribe_ms:.0f} ms")
+            return text
             
         except self._speech_recognition.WaitTimeoutError:
             return ""
@@ -1,128 +1,459 @@
 """
 Text-to-Speech (TTS) implementation.
+
+Engines speak on one long-lived worker thread each. `speak()` only queues
+the text (microseconds) unless asked to block; `cancel()` stops the
+current utterance and drops the queued ones; a full queue makes `speak()`
+wait, so a fast producer cannot run far ahead of the speaker. Whatever
+the engine needs (a COM engine, a PowerShell process, an HTTP session)
+is created once, on the worker thread, and reused.
 """
 
+import base64
+import queue
+import shutil
+import subprocess
+import threading
+import time
 from abc import ABC, abstractmethod
+from typing import List, Optional
+
 from pulse.exceptions import VoiceError, ConfigurationError
 
 
 class TTSEngine(ABC):
     """Abstract base class for TTS engines."""
-    
+
     @abstractmethod
     def speak(self, text: str, blocking: bool = True):
         """Convert text to speech."""
         pass
 
+    def cancel(self):
+        """Stop speaking now and drop anything queued."""
+        pass
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued has been spoken; False on timeout."""
+        return True
+
+    def close(self):
+        """Release the engine's worker and resources."""
+        pass
+
+
+class Utterance:
+    """One queued piece of text; `wait()` for it to be spoken or cancelled."""
+
+    def __init__(self, text: str, generation: int):
+        self.text = text
+        self.generation = generation
+        self.queued = time.perf_counter()
+        self.started: Optional[float] = None
+        self.cancelled = False
+        self.error: Optional[Exception] = None
+        self.done = threading.Event()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self.done.wait(timeout)
+
+    @property
+    def queue_delay_ms(self) -> Optional[float]:
+        """How long it waited before speech started."""
+        return (self.started - self.queued) * 1000 if self.started is not None else None
+
+
+_CLOSE = object()
+
+
+class QueuedTTS(TTSEngine):
+    """
+    Base for engines with a persistent worker. Subclasses implement
+    `_say()` (speak one utterance, blocking) and, where the backend allows,
+    `_stop()` (interrupt it from another thread); `_open()`/`_shutdown()`
+    run on the worker thread around its lifetime.
+    """
+
+    def __init__(self, max_pending: int = 8):
+        self.max_pending = max_pending
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self._generation = 0  # Bumped by cancel(); older utterances are dropped
+        self._pending = 0
+        self._idle = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.current: Optional[Utterance] = None
+        self.spoken = 0
+        self.cancelled = 0
+
+    def start(self):
+        """Start the worker now instead of on the first `speak()` (hides the engine's start-up)."""
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=f"pulse-tts-{type(self).__name__}",
+                                                daemon=True)
+                self._thread.start()
+        return self
+
+    def speak(self, text: str, blocking: bool = True) -> Utterance:
+        """Queue `text`; waits while `max_pending` utterances are already queued."""
+        utterance = Utterance(text, self._generation)
+        if self._thread is None:
+            self.start()
+        with self._idle:
+            self._pending += 1
+        self._queue.put(utterance)
+        if blocking:
+            utterance.wait()
+        return utterance
+
+    def cancel(self):
+        self._generation += 1
+        while True:
+            try:
+                utterance = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if utterance is not _CLOSE:
+                self._finish(utterance, cancelled=True)
+        current = self.current
+        if current is not None and not current.done.is_set():
+            current.cancelled = True
+            try:
+                self._stop()
+            except Exception as e:
+                print(f"TTS stop failed: {e}")
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    @property
+    def busy(self) -> bool:
+        """Whether anything is being spoken or queued."""
+        return self._pending > 0
+
+    def close(self):
+        self.cancel()
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._queue.put(_CLOSE)
+            thread.join(timeout=5)
+        self._thread = None
+
+    def _finish(self, utterance: Utterance, cancelled: bool = False):
+        if cancelled:
+            utterance.cancelled = True
+        if utterance.cancelled:
+            self.cancelled += 1
+        else:
+            self.spoken += 1
+        utterance.done.set()
+        with self._idle:
+            self._pending -= 1
+            self._idle.notify_all()
+
+    def _run(self):
+        try:
+            self._open()
+        except Exception as e:
+            print(f"TTS engine failed to start: {e}")
+        try:
+            while True:
+                utterance = self._queue.get()
+                if utterance is _CLOSE:
+                    return
+                self.current = utterance
+                if utterance.generation != self._generation:
+                    self.current = None
+                    self._finish(utterance, cancelled=True)
+                    continue
+                utterance.started = time.perf_counter()
+                try:
+                    self._say(utterance.text)
+                except Exception as e:
+                    utterance.error = e
+                    print(f"{type(self).__name__} Error: {e}")
+                finally:
+                    self.current = None
+                    self._finish(utterance)
+        finally:
+            try:
+                self._shutdown()
+            except Exception:
+                pass
+
+    def _open(self):
+        pass
+
+    @abstractmethod
+    def _say(self, text: str):
+        pass
+
+    def _stop(self):
+        pass
 
-class Pyttsx3TTS(TTSEngine):
+    def _shutdown(self):
+        pass
+
+
+class Pyttsx3TTS(QueuedTTS):
     """
     Offline TTS using pyttsx3.
     """
-    
-    def __init__(self, rate: int = 175, voice_id: str = None):
+
+    def __init__(self, rate: int = 175, voice_id: str = None, max_pending: int = 8):
         try:
-            import pyttsx3
-            # Initialize engine only once? pyttsx3.init() is a factory.
-            # But the loop handling is tricky. We'll init per instance but be careful.
-            self.engine = pyttsx3.init()
-            self.engine.setProperty('rate', rate)
-            
-            if voice_id:
-                self.engine.setProperty('voice', voice_id)
-            else:
-                # Try to find a good female voice defaults
-                voices = self.engine.getProperty('voices')
-                for voice in voices:
-                    if "zira" in voice.name.lower():  # Windows standard female
-                        self.engine.setProperty('voice', voice.id)
-                        break
-                        
+            import pyttsx3  # noqa: F401
         except ImportError:
             raise VoiceError("pyttsx3 is not installed. Run: pip install pyttsx3")
+        super().__init__(max_pending)
+        self.rate = rate
+        self.voice_id = voice_id
+        self.engine = None
 
-    def speak(self, text: str, blocking: bool = True):
+    def _open(self):
+        import pyttsx3
+        # The engine (SAPI/COM on Windows) must live on the thread that drives it
+        self.engine = pyttsx3.init()
+        self.engine.setProperty('rate', self.rate)
+
+        if self.voice_id:
+            self.engine.setProperty('voice', self.voice_id)
+        else:
+            # Try to find a good female voice defaults
+            voices = self.engine.getProperty('voices')
+            for voice in voices:
+                if "zira" in voice.name.lower():  # Windows standard female
+                    self.engine.setProperty('voice', voice.id)
+                    break
+
+    def _say(self, text: str):
         try:
             self.engine.say(text)
-            if blocking:
-                self.engine.runAndWait()
-            else:
-                self.engine.startLoop(False)
-                self.engine.iterate()
-                self.engine.endLoop()
+            self.engine.runAndWait()
         except RuntimeError:
             # Handle "run loop already started"
             pass
 
+    def _stop(self):
+        if self.engine is not None:
+            self.engine.stop()
+
 
-class ElevenLabsTTS(TTSEngine):
+class ElevenLabsTTS(QueuedTTS):
     """
     Cloud-based high-fidelity TTS using ElevenLabs.
     """
-    
-    def __init__(self, api_key: str, voice_id: str = "21m00Tcm4TlvDq8ikWAM"): # Default "Rachel"
-        self.api_key = api_key
-        self.voice_id = voice_id
-        
+
+    def __init__(self, api_key: str, voice_id: str = "21m00Tcm4TlvDq8ikWAM",  # Default "Rachel"
+                 max_pending: int = 8):
         if not api_key:
             raise ConfigurationError("ElevenLabs API key is missing.")
+        super().__init__(max_pending)
+        self.api_key = api_key
+        self.voice_id = voice_id
+        self._session = None
+        self._playback = None
 
-    def speak(self, text: str, blocking: bool = True):
+    def _open(self):
+        # Keep-alive: every utterance after the first skips the TLS handshake
+        from pulse.core.http import get_session
+        self._session = get_session()
+
+    def _say(self, text: str):
         try:
-            import requests
             from pydub import AudioSegment
-            from pydub.playback import play
             import io
-            
-            url = f"https://api.elevenlabs.io/v1/text-to-speech/{self.voice_id}"
-            headers = {
-                "Accept": "audio/mpeg",
-                "Content-Type": "application/json",
-                "xi-api-key": self.api_key
-            }
-            data = {
-                "text": text,
-                "model_id": "eleven_monolingual_v1",
-                "voice_settings": {"stability": 0.5, "similarity_boost": 0.5}
-            }
-            
-            response = requests.post(url, json=data, headers=headers)
-            response.raise_for_status()
-            
-            # Play audio
-            # pydub requires ffmpeg installed.
-            # Alternative: use simpleaudio or playsound if pydub is heavy.
-            # For robustness we'll try to just write temp file and play it if pydub fails?
-            # Actually let's assume pydub + simpleaudio/ffmpeg
-            
-            audio_data = io.BytesIO(response.content)
-            audio = AudioSegment.from_file(audio_data, format="mp3")
-            play(audio)
-            
         except ImportError:
-             raise VoiceError("pydub/requests not installed. Run: pip install requests pydub")
-        except Exception as e:
-            print(f"ElevenLabs Error: {e}")
+            raise VoiceError("pydub/requests not installed. Run: pip install requests pydub")
+
+        url = f"https://api.elevenlabs.io/v1/text-to-speech/{self.voice_id}"
+        headers = {
+            "Accept": "audio/mpeg",
+            "Content-Type": "application/json",
+            "xi-api-key": self.api_key
+        }
+        data = {
+            "text": text,
+            "model_id": "eleven_monolingual_v1",
+            "voice_settings": {"stability": 0.5, "similarity_boost": 0.5}
+        }
+
+        response = self._session.post(url, json=data, headers=headers, timeout=30)
+        response.raise_for_status()
+        if self.current is not None and self.current.cancelled:
+            return
+
+        # pydub requires ffmpeg installed.
+        audio = AudioSegment.from_file(io.BytesIO(response.content), format="mp3")
+        try:
+            import simpleaudio
+        except ImportError:
+            from pydub.playback import play
+            play(audio)  # Not interruptible
+            return
+        self._playback = simpleaudio.play_buffer(
+            audio.raw_data, num_channels=audio.channels,
+            bytes_per_sample=audio.sample_width, sample_rate=audio.frame_rate
+        )
+        try:
+            self._playback.wait_done()
+        finally:
+            self._playback = None
+
+    def _stop(self):
+        playback = self._playback
+        if playback is not None:
+            playback.stop()
 
 
-class SystemTTS(TTSEngine):
+# Started once; speaks each base64 line of stdin and answers "done" when finished
+_POWERSHELL_SCRIPT = (
+    "Add-Type -AssemblyName System.Speech; "
+    "$s = New-Object System.Speech.Synthesis.SpeechSynthesizer; "
+    "[Console]::Out.WriteLine('ready'); [Console]::Out.Flush(); "
+    "while (($line = [Console]::In.ReadLine()) -ne $null) { "
+    "$s.Speak([Text.Encoding]::UTF8.GetString([Convert]::FromBase64String($line))); "
+    "[Console]::Out.WriteLine('done'); [Console]::Out.Flush() }"
+)
+
+
+class _ProcessTTS(QueuedTTS):
+    """
+    An engine backed by one long-lived speech process that reads a line
+    per utterance and answers a line when it has finished speaking.
+    Cancelling kills the process; a fresh one is started right away so the
+    next utterance does not pay for the start-up.
+    """
+
+    ready_line = None  # Printed once by the process when it can take text
+
+    def __init__(self, max_pending: int = 8):
+        super().__init__(max_pending)
+        self._process: Optional[subprocess.Popen] = None
+        self._process_lock = threading.Lock()
+
+    @abstractmethod
+    def _command(self) -> List[str]:
+        pass
+
+    def _encode(self, text: str) -> str:
+        return text.replace("\n", " ")
+
+    def _spawn(self) -> subprocess.Popen:
+        process = subprocess.Popen(
+            self._command(), stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL, text=True, encoding="utf-8", bufsize=1
+        )
+        if self.ready_line is not None:
+            process.stdout.readline()
+        return process
+
+    def _open(self):
+        with self._process_lock:
+            self._process = self._spawn()
+
+    def _say(self, text: str):
+        with self._process_lock:
+            process = self._process
+            if process is None or process.poll() is not None:
+                process = self._process = self._spawn()
+        process.stdin.write(self._encode(text) + "\n")
+        process.stdin.flush()
+        if not process.stdout.readline():  # Killed by cancel(), or crashed
+            threading.Thread(target=self._respawn, args=(process,), daemon=True).start()
+
+    def _stop(self):
+        with self._process_lock:
+            process = self._process
+        if process is not None and process.poll() is None:
+            process.kill()
+
+    def _respawn(self, dead: subprocess.Popen):
+        """Replace a dead process; the next utterance waits on the lock until it is up."""
+        dead.wait()
+        with self._process_lock:
+            if self._process is dead:
+                self._process = self._spawn()
+
+    def _shutdown(self):
+        with self._process_lock:
+            process, self._process = self._process, None
+        if process is not None and process.poll() is None:
+            try:
+                process.stdin.close()
+                process.wait(timeout=2)
+            except Exception:
+                process.kill()
+
+
+class SystemTTS(_ProcessTTS):
     """
     Robust Windows TTS using PowerShell (System.Speech).
-    Avoids Python threading/COM issues by running in a separate process.
+    Avoids Python threading/COM issues by running in a separate process,
+    started once: System.Speech is loaded a single time, not per utterance.
     """
-    def speak(self, text: str, blocking: bool = True):
-        import subprocess
-        
-        # Escape quotes for PowerShell
-        safe_text = text.replace('"', "'").replace("\n", " ")
-        
-        # PowerShell command to speak
-        ps_command = f"Add-Type -AssemblyName System.Speech; (New-Object System.Speech.Synthesis.SpeechSynthesizer).Speak(\"{safe_text}\")"
-        
+    ready_line = "ready"
+
+    def _command(self) -> List[str]:
+        return ["powershell", "-NoProfile", "-NonInteractive", "-Command", _POWERSHELL_SCRIPT]
+
+    def _encode(self, text: str) -> str:
+        # Base64 keeps quotes, newlines and non-ASCII text out of PowerShell's way
+        return base64.b64encode(text.encode("utf-8")).decode("ascii")
+
+
+class EspeakTTS(QueuedTTS):
+    """
+    Linux TTS using espeak-ng (or espeak). The process is light enough to
+    run per utterance; cancelling terminates the one speaking.
+    """
+
+    def __init__(self, voice: str = "en", rate: int = 175, max_pending: int = 8):
+        super().__init__(max_pending)
+        self.binary = shutil.which("espeak-ng") or shutil.which("espeak")
+        if not self.binary:
+            raise VoiceError("espeak is not installed. Run: sudo apt install espeak-ng")
+        self.voice = voice
+        self.rate = rate
+        self._process: Optional[subprocess.Popen] = None
+
+    def _say(self, text: str):
+        self._process = subprocess.Popen(
+            [self.binary, "-v", self.voice, "-s", str(self.rate), "--stdin"],
+            stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            text=True, encoding="utf-8"
+        )
         try:
-            if blocking:
-                subprocess.run(["powershell", "-Command", ps_command], check=True)
-            else:
-                subprocess.Popen(["powershell", "-Command", ps_command])
-        except Exception as e:
-            print(f"SystemTTS Error: {e}")
+            self._process.communicate(text)
+        finally:
+            self._process = None
+
+    def _stop(self):
+        process = self._process
+        if process is not None and process.poll() is None:
+            process.terminate()
+
+
+class StubTTS(QueuedTTS):
+    """
+    Silent engine for tests and benchmarks: "speaks" for `word_ms` per
+    word and records what it said. Cancelling cuts the current utterance.
+    """
+
+    def __init__(self, word_ms: float = 0.0, max_pending: int = 8):
+        super().__init__(max_pending)
+        self.word_ms = word_ms
+        self.said: List[str] = []
+        self._interrupt = threading.Event()
+
+    def _say(self, text: str):
+        self._interrupt.clear()
+        if self.current is not None and self.current.cancelled:
+            return
+        self.said.append(text)
+        self._interrupt.wait(len(text.split()) * self.word_ms / 1000)
+
+    def _stop(self):
+        self._interrupt.set()
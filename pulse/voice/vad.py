@@ -0,0 +1,120 @@
+"""
+Energy voice activity detection and barge-in.
+
+EnergyVAD calls a frame speech when its RMS level is `ratio` times the
+running noise floor (and above `min_rms`), and reports an onset after
+`onset_ms` of consecutive speech frames, so clicks and short bursts do
+not count. The floor follows the non-speech frames, which on speakers
+(no headset) includes the assistant's own voice leaking into the mic;
+raise `ratio` if it interrupts itself.
+
+BargeInMonitor runs the VAD over a capture source on a background thread
+while the assistant speaks and calls back on the first onset.
+"""
+
+import math
+import threading
+import time
+from array import array
+from typing import Callable, Optional
+
+from pulse.voice.audio import AudioSource
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+def frame_rms(frame: bytes) -> float:
+    """Root-mean-square level of a frame of 16-bit PCM."""
+    if not frame:
+        return 0.0
+    if NUMPY_AVAILABLE:
+        samples = np.frombuffer(frame, dtype=np.int16).astype(np.float32)
+        return float(np.sqrt(np.mean(samples * samples)))
+    samples = array("h", frame)
+    return math.sqrt(sum(s * s for s in samples) / len(samples))
+
+
+class EnergyVAD:
+    """Speech onset detection on frame energy against an adaptive noise floor."""
+
+    def __init__(self, ratio: float = 3.0, min_rms: float = 500.0, onset_ms: int = 150,
+                 frame_ms: int = 30, floor_alpha: float = 0.05, calibration_ms: int = 150):
+        self.ratio = ratio
+        self.min_rms = min_rms
+        self.onset_frames = max(1, round(onset_ms / frame_ms))
+        self.calibration_frames = round(calibration_ms / frame_ms)
+        self.floor_alpha = floor_alpha
+        self.reset()
+
+    def reset(self):
+        self.floor: Optional[float] = None
+        self.frames = 0
+        self._run = 0  # Consecutive speech frames
+
+    def is_speech(self, rms: float) -> bool:
+        return rms >= self.min_rms and (self.floor is None or rms >= self.floor * self.ratio)
+
+    def update(self, frame: bytes) -> bool:
+        """Feed one frame; True when it completes a speech onset."""
+        rms = frame_rms(frame)
+        self.frames += 1
+        if self.frames <= self.calibration_frames:
+            # The first frames only set the floor
+            self.floor = rms if self.floor is None else max(self.floor, rms)
+            return False
+        if self.is_speech(rms):
+            self._run += 1
+            return self._run == self.onset_frames
+        self._run = 0
+        self.floor = rms if self.floor is None else self.floor + self.floor_alpha * (rms - self.floor)
+        return False
+
+
+class BargeInMonitor:
+    """Watches a source for speech on a background thread; `on_speech` is called once on onset."""
+
+    def __init__(self, source: AudioSource, vad: EnergyVAD, on_speech: Callable[[], None]):
+        self.source = source
+        self.vad = vad
+        self.on_speech = on_speech
+        self.triggered = threading.Event()
+        self.onset_at: Optional[float] = None  # perf_counter() of the detection
+        self.onset_offset_s: Optional[float] = None  # Audio time into the capture
+        self.error: Optional[Exception] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "BargeInMonitor":
+        self.vad.reset()
+        self.source.open()
+        self._thread = threading.Thread(target=self._run, name="pulse-barge-in", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def _run(self):
+        try:
+            while not self._stop.is_set():
+                frame = self.source.read_frame()
+                if frame is None:
+                    return
+                if self.vad.update(frame):
+                    self.onset_at = time.perf_counter()
+                    self.onset_offset_s = self.vad.frames * self.source.frame_ms / 1000
+                    self.triggered.set()
+                    self.on_speech()
+                    return
+        except Exception as e:
+            self.error = e
+            print(f"Barge-in monitor stopped: {e}")
+        finally:
+            self.source.close()
@@ -2,28 +2,52 @@
 Voice interaction loop.
 """
 
+import os
+import queue
 import time
 import threading
+from typing import List, Optional
 from pulse.core.brain import Brain
 from pulse.config import PulseConfig
+from pulse.core.events import TurnEvent
+from pulse.exceptions import VoiceError
+from pulse.voice.audio import AudioSource, MicrophoneSource
+from pulse.voice.segmenter import SentenceSplitter
 from pulse.voice.stt import WhisperSTT
-from pulse.voice.tts import Pyttsx3TTS, ElevenLabsTTS
+from pulse.voice.tts import TTSEngine, QueuedTTS, Pyttsx3TTS, ElevenLabsTTS, SystemTTS, EspeakTTS, StubTTS
+from pulse.voice.vad import BargeInMonitor, EnergyVAD
+from pulse.voice.wake_word import WakeWordDetector
+
+_END = object()  # Marks the end of a response on the segment queue
 
 class VoiceLoop:
     """
     Manages the Listen -> Think -> Speak loop.
     """
     
-    def __init__(self, brain: Brain, config: PulseConfig):
+    def __init__(self, brain: Brain, config: PulseConfig, audio_source: Optional[AudioSource] = None):
         self.brain = brain
         self.config = config
         self.running = False
         self.thread = None
+        self.status = None
+        self.barged_in = False  # Whether the user talked over the last response
+        self.monitor: Optional[BargeInMonitor] = None  # The last barge-in monitor
         
         # Initialize engines
         print("Initializing Speech Engines...")
-        self.stt = WhisperSTT(model_size=config.whisper_model_size)
-        self.tts = None # Lazy init in loop for thread safety
+        self.stt = WhisperSTT(
+            model_size=config.whisper_model_size, device=config.whisper_device, language=config.whisper_language
+        )
+        if config.whisper_preload:
+            self.stt.warm_up(background=True)
+        self.tts: Optional[TTSEngine] = None  # Created and started in start()
+        self.wake_detector = self._make_wake_detector(config)
+        # Listens for the wake word and for barge-in while speaking; pass a
+        # WavFileSource to replay a recording instead
+        self.audio_source = audio_source
+        if self.audio_source is None and (config.barge_in or self.wake_detector is not None):
+            self.audio_source = MicrophoneSource()
             
         print(f"Voice ready. Wake words: {config.wake_words}")
 
@@ -33,30 +57,189 @@ class VoiceLoop:
             return
         
         self.running = True
-        self._run_loop()
+        if self.tts is None:
+            self.tts = self._make_tts(self.config)
+        if isinstance(self.tts, QueuedTTS):
+            # Before the first listen, so the engine's start-up overlaps it
+            self.tts.start()
+        try:
+            self._run_loop()
+        finally:
+            # Also catches a worker a last speak() restarted after stop()
+            self.tts.close()
 
     def stop(self):
         """Stop the voice loop."""
         self.running = False
+        if self.tts:
+            self.tts.cancel()
+            self.tts.close()
         if self.thread:
             self.thread.join()
 
+    @staticmethod
+    def _make_tts(config: PulseConfig) -> TTSEngine:
+        if config.tts_engine == "elevenlabs":
+            return ElevenLabsTTS(api_key=config.elevenlabs_api_key)
+        if config.tts_engine == "system":
+            return SystemTTS()
+        if config.tts_engine == "espeak":
+            return EspeakTTS()
+        if config.tts_engine == "stub":
+            return StubTTS()
+        return Pyttsx3TTS()
+
+    @staticmethod
+    def _make_wake_detector(config: PulseConfig) -> Optional[WakeWordDetector]:
+        """The offline wake-word detector, once wake words have been enrolled."""
+        if config.wake_word_engine == "google":
+            return None
+        path = config.wake_word_templates
+        if not os.path.exists(path):
+            if config.wake_word_engine == "local":
+                print(f"No wake words enrolled at {path}. Run: python -m pulse.tools.enroll_wake_word")
+            return None
+        try:
+            detector = WakeWordDetector.load(path)
+        except (ImportError, VoiceError, OSError, ValueError, KeyError) as e:
+            print(f"Offline wake-word detection unavailable: {e}")
+            return None
+        print(f"Offline wake words: {', '.join(detector.templates)}")
+        return detector
+
+    def _listen_for_wake_word(self) -> bool:
+        """Wait for a wake word: offline on the audio source when enrolled, else through STT."""
+        if self.wake_detector is None or self.audio_source is None:
+            return self.stt.listen_for_wake_words(self.config.wake_words)
+        try:
+            hit = self.wake_detector.listen(self.audio_source, timeout=30, should_stop=lambda: not self.running)
+        except VoiceError as e:
+            print(f"Offline wake-word detection failed, using STT: {e}")
+            self.wake_detector = None
+            return False
+        if hit is not None:
+            print(f"Heard wake word '{hit.word}' (distance {hit.distance:.3f})")
+        return hit is not None
+
+    def _publish_status(self, status: str):
+        """Let subscribers (the web UI) know what the loop is doing."""
+        if status != self.status:
+            self.status = status
+            self.brain.events.publish(TurnEvent.STATUS, status, source="voice")
+
+    def _respond(self, user_command: str) -> List[str]:
+        """
+        Speak the response to `user_command` while it is still streaming.
+
+        A producer thread reads `brain.stream_thought` and queues complete
+        sentences; this thread hands them to the TTS queue as they come, so
+        the user hears the first sentence while the rest is generated.
+        Returns the segments spoken.
+        """
+        segments = queue.Queue()
+        stop = threading.Event()
+        producer = threading.Thread(
+            target=self._produce_segments, args=(user_command, segments, stop),
+            name="pulse-voice-stream", daemon=True
+        )
+        producer.start()
+
+        spoken, error, monitor = [], None, None
+        try:
+            while True:
+                item = segments.get()
+                if item is _END:
+                    break
+                if isinstance(item, Exception):
+                    error = item
+                    continue
+                if not self.running or (monitor is not None and monitor.triggered.is_set()):
+                    stop.set()
+                    continue
+                if not spoken:
+                    self._publish_status("speaking")
+                    monitor = self._start_barge_in(stop)
+                spoken.append(item)
+                # Only waits when the engine is `max_pending` sentences behind
+                self.tts.speak(item, blocking=False)
+            self._wait_for_speech(monitor)
+        finally:
+            stop.set()
+            if monitor is not None:
+                monitor.stop()
+            # The turn is in memory once the producer is done; wait for it
+            # so the next command is answered with this one in context
+            producer.join()
+        if spoken:
+            print(f"Pulse: {' '.join(spoken)}{' (interrupted)' if self.barged_in else ''}")
+        if error:
+            raise error
+        return spoken
+
+    def _start_barge_in(self, stop_stream: Optional[threading.Event] = None) -> Optional[BargeInMonitor]:
+        """Listen for the user talking over the response; speech cuts it off (and its stream)."""
+        if not self.config.barge_in or self.audio_source is None:
+            return None
+
+        def interrupt():
+            self.tts.cancel()
+            if stop_stream is not None:
+                stop_stream.set()
+
+        vad = EnergyVAD(
+            ratio=self.config.barge_in_ratio, min_rms=self.config.barge_in_min_rms,
+            onset_ms=self.config.barge_in_onset_ms, frame_ms=self.audio_source.frame_ms
+        )
+        try:
+            self.monitor = BargeInMonitor(self.audio_source, vad, interrupt).start()
+            return self.monitor
+        except VoiceError as e:
+            print(f"Barge-in disabled: {e}")
+            self.audio_source = None
+            return None
+
+    def _wait_for_speech(self, monitor: Optional[BargeInMonitor] = None) -> bool:
+        """
+        Wait until the TTS queue has drained; cut speech short if the loop
+        is stopped. Returns whether the user barged in.
+        """
+        try:
+            while not self.tts.wait(timeout=0.05):
+                if not self.running:
+                    self.tts.cancel()
+                    break
+        finally:
+            if monitor is not None:
+                monitor.stop()
+        self.barged_in = monitor is not None and monitor.triggered.is_set()
+        return self.barged_in
+
+    def _produce_segments(self, user_command: str, segments: queue.Queue, stop: threading.Event):
+        """Stream the response and queue it sentence by sentence, then `_END`."""
+        splitter = SentenceSplitter()
+        stream = self.brain.stream_thought(user_command, source="voice")
+        try:
+            for chunk in stream:
+                if stop.is_set():
+                    break
+                for segment in splitter.feed(chunk):
+                    segments.put(segment)
+            else:
+                for segment in splitter.flush():
+                    segments.put(segment)
+        except Exception as e:
+            segments.put(e)
+        finally:
+            # Closing an abandoned stream still saves what was generated
+            stream.close()
+            segments.put(_END)
+
     def _run_loop(self):
         """Main interaction loop."""
         print("Creating Pulse Voice Loop...")
         
         print(f"Active wake words: {self.config.wake_words}")
         
-        # Initialize TTS here to ensure it runs in the same thread as the loop
-        if not self.tts:
-            if self.config.tts_engine == "elevenlabs":
-                self.tts = ElevenLabsTTS(api_key=self.config.elevenlabs_api_key)
-            elif self.config.tts_engine == "system":
-                from pulse.voice.tts import SystemTTS
-                self.tts = SystemTTS()
-            else:
-                self.tts = Pyttsx3TTS()
-        
         # Continuous conversation state
         conversation_active = False
         last_interaction_time = 0
@@ -78,7 +261,8 @@ class VoiceLoop:
                 
                 if not listen_directly:
                     print("\nWaiting for wake word...")
-                    if self.stt.listen_for_wake_words(self.config.wake_words):
+                    self._publish_status("waiting")
+                    if self._listen_for_wake_word():
                         print(f"Wake word detected!")
                         self.tts.speak("Yes?", blocking=True)
                         listen_directly = True
@@ -88,6 +272,7 @@ class VoiceLoop:
                 if listen_directly:
                     # Listen for command
                     print("Listening for command...")
+                    self._publish_status("listening")
                     user_command = self.stt.listen(timeout=5)
                     
                     if user_command:
@@ -103,11 +288,22 @@ class VoiceLoop:
 
                         # Think & Speak
                         print("Pulse Thinking...")
-                        response = self.brain.think(user_command)
-                        print(f"Pulse: {response}")
-                        self.tts.speak(response)
+                        self._publish_status("thinking")
+                        if self.config.stream_voice:
+                            self._respond(user_command)
+                        else:
+                            response = self.brain.think(user_command, source="voice")
+                            print(f"Pulse: {response}")
+                            self._publish_status("speaking")
+                            monitor = self._start_barge_in()
+                            self.tts.speak(response, blocking=False)
+                            self._wait_for_speech(monitor)
                         
                         # Ready for next turn immediately
+                        if self.barged_in:
+                            print("Barge-in: listening.")
+                            last_interaction_time = time.time()
+                            continue
                         
                     else:
                         # Silence handling
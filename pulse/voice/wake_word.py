@@ -0,0 +1,386 @@
+"""
+Offline wake-word detection.
+
+Audio is turned into MFCC frames (25 ms windows every 10 ms) as it
+arrives, vectorised in NumPy. Each frame advances a streaming
+subsequence DTW against every enrolled template of every wake word at
+once: the DTW steps (1,1), (1,2) and (2,1) only look back at earlier
+input frames, so a new frame updates one column for all templates with a
+handful of array operations, and no window is ever re-matched. A word is
+detected when a template's length-normalised path cost ends below the
+word's threshold while there is speech-level energy, which only happens
+for audio that follows the template's spectral trajectory at between
+half and twice its speed.
+
+Templates come from a few recordings of the user saying the word (see
+pulse.tools.enroll_wake_word); the threshold is set from how far apart
+the recordings are from one another. Recent audio is kept in a ring
+buffer, so the detection can hand the spoken word on.
+"""
+
+import json
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pulse.exceptions import VoiceError
+from pulse.voice.audio import AudioSource
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+SAMPLE_RATE = 16000
+# Bounds of the threshold enroll() derives from the spread of the recordings
+_MIN_THRESHOLD = 0.1
+_MAX_THRESHOLD = 0.2
+_DEFAULT_THRESHOLD = 0.15
+
+
+def _mel(hz):
+    return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+
+def _hz(mel):
+    return 700.0 * (10.0 ** (mel / 2595.0) - 1.0)
+
+
+class MFCC:
+    """
+    Streaming MFCC extractor: `feed()` int16 samples, get the feature
+    frames completed by them (n x `n_mfcc - 1`, c0 dropped) and the RMS
+    level of each frame.
+    """
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, win_ms: float = 25.0, hop_ms: float = 10.0,
+                 n_fft: int = 512, n_mels: int = 26, n_mfcc: int = 13, preemphasis: float = 0.97):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for wake-word detection. Run: pip install numpy")
+        self.sample_rate = sample_rate
+        self.win = int(sample_rate * win_ms / 1000)
+        self.hop = int(sample_rate * hop_ms / 1000)
+        self.n_fft = n_fft
+        self.preemphasis = preemphasis
+        self.window = np.hamming(self.win).astype(np.float32)
+
+        # Triangular mel filters, (n_fft // 2 + 1) x n_mels
+        edges = _hz(np.linspace(_mel(20.0), _mel(sample_rate / 2), n_mels + 2))
+        bins = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+        lower, center, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+        filters = np.maximum(0.0, np.minimum((bins - lower) / (center - lower), (upper - bins) / (upper - center)))
+        self.filters = filters.T.astype(np.float32)
+
+        # Orthonormal DCT-II, keeping coefficients 1..n_mfcc-1
+        n = np.arange(n_mels)
+        k = np.arange(1, n_mfcc)[:, None]
+        self.dct = (np.sqrt(2.0 / n_mels) * np.cos(np.pi * k * (2 * n + 1) / (2 * n_mels))).T.astype(np.float32)
+        self.reset()
+
+    @property
+    def dim(self) -> int:
+        return self.dct.shape[1]
+
+    def reset(self):
+        self._pending = np.zeros(0, dtype=np.float32)
+
+    def feed(self, samples: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+        buffer = np.concatenate((self._pending, samples.astype(np.float32)))
+        count = 0 if len(buffer) < self.win else 1 + (len(buffer) - self.win) // self.hop
+        if not count:
+            self._pending = buffer
+            return np.zeros((0, self.dim), dtype=np.float32), np.zeros(0, dtype=np.float32)
+        self._pending = buffer[count * self.hop:]
+
+        frames = np.lib.stride_tricks.sliding_window_view(buffer, self.win)[::self.hop][:count]
+        rms = np.sqrt(np.mean(frames * frames, axis=1))
+        emphasized = frames[:, 1:] - self.preemphasis * frames[:, :-1]
+        power = np.abs(np.fft.rfft(emphasized * self.window[1:], self.n_fft)) ** 2
+        # The floor stands in for dither: digitally silent bands must not dominate
+        log_mel = np.log(power @ self.filters + 1.0)
+        return (log_mel @ self.dct).astype(np.float32), rms.astype(np.float32)
+
+    def features(self, samples: "np.ndarray") -> "np.ndarray":
+        """Features of a whole clip."""
+        self.reset()
+        features, _ = self.feed(samples)
+        self.reset()
+        return features
+
+
+def to_samples(audio) -> "np.ndarray":
+    """int16 samples from PCM bytes or an array."""
+    if isinstance(audio, (bytes, bytearray)):
+        return np.frombuffer(audio, dtype=np.int16)
+    return np.asarray(audio)
+
+
+def trim_silence(samples: "np.ndarray", sample_rate: int = SAMPLE_RATE, ratio: float = 4.0,
+                 pad_ms: int = 50) -> "np.ndarray":
+    """The clip from the first to the last 10 ms block clearly above its quietest blocks."""
+    block = sample_rate // 100
+    count = len(samples) // block
+    if count < 3:
+        return samples
+    levels = np.sqrt(np.mean(samples[:count * block].astype(np.float32).reshape(count, block) ** 2, axis=1))
+    floor = max(float(np.percentile(levels, 10)), 1.0)
+    voiced = np.flatnonzero(levels > floor * ratio)
+    if not len(voiced):
+        return samples
+    pad = pad_ms * sample_rate // 1000
+    return samples[max(0, voiced[0] * block - pad):min(len(samples), (voiced[-1] + 1) * block + pad)]
+
+
+def _unit(features: "np.ndarray") -> "np.ndarray":
+    return features / (np.linalg.norm(features, axis=1, keepdims=True) + 1e-6)
+
+
+def dtw_distance(template: "np.ndarray", query: "np.ndarray", center: Optional["np.ndarray"] = None) -> float:
+    """
+    Length-normalised cost of `query` against `template` (whole clips), as
+    the detector scores it with `center` as the word's mean frame.
+    """
+    bank = _TemplateBank({"w": [template]}, {"w": center} if center is not None else None)
+    best = np.inf
+    for frame in query:
+        best = min(best, float(bank.step(frame)[0]))
+    return best
+
+
+class _TemplateBank:
+    """
+    All templates stacked into one (rows x dim) array, with the running
+    DTW columns for the last two input frames.
+
+    Frames are compared by the cosine distance of their offsets from the
+    word's mean frame: raw MFCC vectors of any two voiced sounds point in
+    much the same direction, their deviations from the word do not.
+    """
+
+    def __init__(self, templates: Dict[str, List["np.ndarray"]],
+                 centers: Optional[Dict[str, "np.ndarray"]] = None):
+        self.words: List[str] = []
+        word_centers = []
+        rows, row_word, starts, ends, lengths = [], [], [], [], []
+        offset = 0
+        for w, (word, clips) in enumerate(templates.items()):
+            center = (centers or {}).get(word)
+            if center is None:
+                center = np.concatenate(clips).mean(axis=0)
+            word_centers.append(center)
+            for clip in clips:
+                rows.append(_unit(clip - center))
+                row_word.extend([w] * len(clip))
+                starts.append(offset)
+                ends.append(offset + len(clip) - 1)
+                lengths.append(len(clip))
+                self.words.append(word)
+                offset += len(clip)
+        self.rows = np.concatenate(rows).astype(np.float32)
+        self.centers = np.array(word_centers, dtype=np.float32)
+        self.row_word = np.array(row_word)
+        # rows . (frame - center) = rows . frame - rows . center
+        self.row_offsets = np.einsum("ij,ij->i", self.rows, self.centers[self.row_word])
+        self._center_sq = np.einsum("ij,ij->i", self.centers, self.centers)
+        self.ends = np.array(ends)
+        self.lengths = np.array(lengths, dtype=np.float32)
+        count = len(self.rows)
+        index = np.arange(count)
+        first = np.zeros(count, dtype=bool)
+        first[starts] = True
+        second = np.zeros(count, dtype=bool)
+        second[[s + 1 for s, e in zip(starts, ends) if e > s]] = True
+        # Row i-1 / i-2 of the same template; the extra last slot holds inf
+        self.prev1 = np.where(first, count, index - 1)
+        self.prev2 = np.where(first | second, count, index - 2)
+        self.first = first
+        self.reset()
+
+    def reset(self):
+        count = len(self.rows)
+        self._d1 = np.full(count + 1, np.inf, dtype=np.float32)  # D[:, j-1]
+        self._d2 = np.full(count + 1, np.inf, dtype=np.float32)  # D[:, j-2]
+        self._c1 = np.full(count + 1, np.inf, dtype=np.float32)  # cost[:, j-1]
+
+    def step(self, frame: "np.ndarray") -> "np.ndarray":
+        """Advance by one input frame; returns each template's normalised cost ending here."""
+        # |frame - center| per word, without building the offsets
+        norms = np.sqrt(np.maximum(frame @ frame - 2 * (self.centers @ frame) + self._center_sq, 1e-12))
+        cost = np.empty(len(self.rows) + 1, dtype=np.float32)
+        cost[:-1] = 1.0 - (self.rows @ frame - self.row_offsets) / norms[self.row_word]  # Cosine distance
+        cost[-1] = np.inf
+        d1, d2, c1 = self._d1, self._d2, self._c1
+        best = np.minimum(d1[self.prev1], d2[self.prev1])
+        best = np.minimum(best, d1[self.prev2] + c1[self.prev1])
+        column = np.empty_like(cost)
+        column[:-1] = cost[:-1] + best
+        column[:-1][self.first] = cost[:-1][self.first]  # A match may start at any frame
+        column[-1] = np.inf
+        self._d2, self._d1, self._c1 = d1, column, cost
+        return column[self.ends] / self.lengths
+
+
+@dataclass
+class WakeWordHit:
+    word: str
+    distance: float
+    at_s: float  # Audio time of the detection since the detector started
+    audio: Optional[bytes] = None  # The most recent audio, ending with the wake word
+
+
+class WakeWordDetector:
+    """
+    Detects enrolled wake words in a stream of 16-bit mono PCM.
+
+    `process()` takes audio as it arrives and returns a hit or None;
+    `listen()` runs it over an AudioSource. `thresholds` map each word to
+    the highest template cost still counted as a detection.
+    """
+
+    def __init__(self, templates: Dict[str, List["np.ndarray"]], thresholds: Optional[Dict[str, float]] = None,
+                 sample_rate: int = SAMPLE_RATE, min_rms: float = 300.0, refractory_s: float = 1.0,
+                 ring_s: float = 2.0):
+        if not templates:
+            raise VoiceError("No wake words are enrolled")
+        self.templates = templates
+        self.mfcc = MFCC(sample_rate)
+        self.bank = _TemplateBank(templates)
+        self.thresholds = {word: (thresholds or {}).get(word) or _DEFAULT_THRESHOLD for word in templates}
+        self._limits = np.array([self.thresholds[w] for w in self.bank.words], dtype=np.float32)
+        self.sample_rate = sample_rate
+        self.min_rms = min_rms
+        self.frame_s = self.mfcc.hop / sample_rate
+        self.refractory_frames = int(refractory_s / self.frame_s)
+        self._max_len = int(self.bank.lengths.max())
+        # Ring buffers: raw audio for hand-off, frame levels for the energy check
+        self._ring = np.zeros(int(ring_s * sample_rate), dtype=np.int16)
+        self._levels = np.zeros(self._max_len, dtype=np.float32)
+        self.reset()
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "WakeWordDetector":
+        """A detector for the templates saved by `save_templates()`."""
+        templates, thresholds = load_templates(path)
+        if kwargs.get("thresholds") is None:
+            kwargs["thresholds"] = thresholds
+        return cls(templates, **kwargs)
+
+    def reset(self):
+        """Forget all audio heard so far (partial matches included)."""
+        self.mfcc.reset()
+        self.bank.reset()
+        self._ring[:] = 0
+        self._ring_pos = 0
+        self._levels[:] = 0.0
+        self.frames = 0
+        self._quiet_until = 0
+        self.best: Dict[str, float] = {}  # Lowest cost per word so far (for tuning)
+
+    def _remember(self, samples: "np.ndarray"):
+        samples = samples[-len(self._ring):]
+        end = self._ring_pos + len(samples)
+        if end <= len(self._ring):
+            self._ring[self._ring_pos:end] = samples
+        else:
+            split = len(self._ring) - self._ring_pos
+            self._ring[self._ring_pos:] = samples[:split]
+            self._ring[:end - len(self._ring)] = samples[split:]
+        self._ring_pos = end % len(self._ring)
+
+    def recent_audio(self) -> bytes:
+        """The last `ring_s` seconds of audio, oldest first."""
+        return np.roll(self._ring, -self._ring_pos).tobytes()
+
+    def process(self, audio) -> Optional[WakeWordHit]:
+        samples = to_samples(audio)
+        self._remember(samples)
+        features, levels = self.mfcc.feed(samples)
+        hit = None
+        for frame, level in zip(features, levels):
+            self._levels[self.frames % self._max_len] = level
+            self.frames += 1
+            costs = self.bank.step(frame)
+            if self.frames < self._quiet_until or hit is not None:
+                continue
+            matched = np.flatnonzero(costs <= self._limits)
+            for i in matched[np.argsort(costs[matched])]:
+                # The matched stretch must be speech, not a quiet room
+                length = int(self.bank.lengths[i])
+                recent = self._levels[(self.frames - 1 - np.arange(length)) % self._max_len]
+                if np.mean(recent >= self.min_rms) >= 0.5:
+                    hit = WakeWordHit(self.bank.words[i], float(costs[i]), self.frames * self.frame_s)
+                    break
+            for i in np.flatnonzero(np.isfinite(costs)):
+                word = self.bank.words[i]
+                self.best[word] = min(self.best.get(word, np.inf), float(costs[i]))
+        if hit is not None:
+            hit.audio = self.recent_audio()
+            self.bank.reset()
+            self._quiet_until = self.frames + self.refractory_frames
+        return hit
+
+    def listen(self, source: AudioSource, timeout: Optional[float] = None,
+               should_stop: Optional[Callable[[], bool]] = None) -> Optional[WakeWordHit]:
+        """
+        Run over `source` until a wake word, the end of the audio, `timeout`
+        seconds or `should_stop()`. Each call starts fresh: audio from an
+        earlier call is not continued across the gap.
+        """
+        if source.sample_rate != self.sample_rate:
+            raise VoiceError(f"Wake-word audio must be {self.sample_rate} Hz, got {source.sample_rate} Hz")
+        self.reset()
+        deadline = time.monotonic() + timeout if timeout else None
+        with source:
+            while True:
+                frame = source.read_frame()
+                if frame is None:
+                    return None
+                hit = self.process(frame)
+                if hit is not None:
+                    return hit
+                if deadline is not None and time.monotonic() > deadline:
+                    return None
+                if should_stop is not None and should_stop():
+                    return None
+
+
+def enroll(clips: List, sample_rate: int = SAMPLE_RATE) -> Tuple[List["np.ndarray"], float]:
+    """
+    Templates from recordings of one word, and a threshold: the worst
+    leave-one-out match among the recordings, with some slack.
+    """
+    if not NUMPY_AVAILABLE:
+        raise ImportError("numpy is required for wake-word detection. Run: pip install numpy")
+    mfcc = MFCC(sample_rate)
+    templates = [mfcc.features(trim_silence(to_samples(clip), sample_rate)) for clip in clips]
+    templates = [t for t in templates if len(t) >= 10]
+    if not templates:
+        raise VoiceError("The recordings are too short to enroll a wake word")
+    if len(templates) < 2:
+        return templates, _DEFAULT_THRESHOLD
+    center = np.concatenate(templates).mean(axis=0)
+    worst = max(
+        min(dtw_distance(other, clip, center) for j, other in enumerate(templates) if j != i)
+        for i, clip in enumerate(templates)
+    )
+    return templates, min(_MAX_THRESHOLD, max(_MIN_THRESHOLD, worst * 2.0))
+
+
+def save_templates(path: str, templates: Dict[str, List["np.ndarray"]], thresholds: Dict[str, float]):
+    arrays = {f"{word}__{i}": clip for word, clips in templates.items() for i, clip in enumerate(clips)}
+    meta = {"version": 1, "thresholds": thresholds, "words": list(templates)}
+    with open(path, "wb") as f:
+        np.savez(f, meta=np.array(json.dumps(meta)), **arrays)
+
+
+def load_templates(path: str) -> Tuple[Dict[str, List["np.ndarray"]], Dict[str, float]]:
+    if not NUMPY_AVAILABLE:
+        raise ImportError("numpy is required for wake-word detection. Run: pip install numpy")
+    with np.load(path) as data:
+        meta = json.loads(str(data["meta"]))
+        templates = {word: [] for word in meta["words"]}
+        for key in sorted(k for k in data.files if k != "meta"):
+            word, _, index = key.rpartition("__")
+            templates.setdefault(word, []).append(data[key])
+    return templates, meta.get("thresholds", {})
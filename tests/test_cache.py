@@ -0,0 +1,51 @@
+"""Persistent caches: eviction order, and forgetting a conversation."""
+
+import os
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+
+from pulse.config import PulseConfig
+from pulse.core.brain import Brain
+from pulse.core.cache import SQLiteCache
+from pulse.tools.stub_llm_server import StubLLMServer
+
+
+def test_prune_drops_expired_then_oldest_rows(tmp_path):
+    cache = SQLiteCache(os.path.join(tmp_path, "cache.db"), "t", ttl=None, max_rows=2)
+    cache.set("stale", "a", ttl=60)
+    cache.set("old", "b", ttl=60)
+    cache.set("new", "c", ttl=60)
+    cache.set("forever", "d")  # expires = 0
+    with cache._conn:
+        cache._conn.execute("UPDATE t SET expires = ? WHERE key = 'stale'", (time.time() - 1,))
+    with cache._lock:
+        cache._prune()
+    # A never-expiring row is the newest here, not the first to go
+    assert [cache.get(k) for k in ("stale", "old", "new", "forever")] == [None, None, "c", "d"]
+    cache.close()
+
+
+def test_clear_memory_clears_response_and_compression_caches(tmp_path):
+    server = StubLLMServer().start()
+    config = PulseConfig(
+        db_path=os.path.join(tmp_path, "test.db"),
+        openrouter_base_url=server.url,
+        fallback_models=[],
+        compressor_backend="local",
+        enable_semantic_memory=False,
+        http_prewarm=False,
+    )
+    try:
+        with redirect_stdout(StringIO()):
+            brain = Brain(config)
+        brain.response_cache.cache.set("answer", "about the conversation")
+        brain.compressor.cache.set("summary", "of the conversation")
+        brain.clear_memory()
+        assert brain.response_cache.cache.get("answer") is None
+        assert brain.compressor.cache.get("summary") is None
+        # Nor do the entries survive in <db>.cache for the next process
+        assert brain.response_cache.cache.persistent.get("answer") is None
+        assert brain.compressor.cache.persistent.get("summary") is None
+    finally:
+        server.stop()
@@ -0,0 +1,28 @@
+"""Circuit breaker: a half-open model gets exactly one probe at a time."""
+
+import time
+
+from pulse.core.model_health import HALF_OPEN, ModelHealthRegistry
+
+
+def _half_open(registry: ModelHealthRegistry, model: str):
+    for _ in range(registry.failure_threshold):
+        registry.record_failure(model)
+    time.sleep(registry.cooldown_s * 2)
+    assert registry.state(model) == HALF_OPEN
+
+
+def test_abandoning_a_non_probe_attempt_keeps_the_probe():
+    registry = ModelHealthRegistry(cooldown_s=0.01)
+    registry.record_success("healthy", 100.0)
+    stale = registry.begin_attempt("flaky")  # Sent before the circuit opened: not a probe
+    _half_open(registry, "flaky")
+    probe = registry.begin_attempt("flaky")
+    assert stale is None and probe is not None
+    assert registry.order(["flaky", "healthy"]) == ["healthy", "flaky"]
+
+    registry.abandon_attempt("flaky", stale)
+    assert registry.order(["flaky", "healthy"]) == ["healthy", "flaky"]
+
+    registry.abandon_attempt("flaky", probe)
+    assert registry.order(["flaky", "healthy"]) == ["flaky", "healthy"]
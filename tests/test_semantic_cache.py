@@ -0,0 +1,61 @@
+"""Semantic cache: follow-ups must never be answered from another conversation."""
+
+import os
+from contextlib import redirect_stdout
+from io import StringIO
+
+import pytest
+
+from pulse.config import PulseConfig
+from pulse.core.brain import Brain
+from pulse.core.semantic_cache import reusable_query
+from pulse.tools.stub_llm_server import StubLLMServer
+
+pytest.importorskip("numpy")
+
+
+@pytest.fixture
+def brain(tmp_path):
+    server = StubLLMServer().start()
+    config = PulseConfig(
+        db_path=os.path.join(tmp_path, "test.db"),
+        openrouter_base_url=server.url,
+        fallback_models=[],
+        compressor_backend="local",
+        enable_semantic_memory=False,
+        http_prewarm=False,
+    )
+    with redirect_stdout(StringIO()):
+        brain = Brain(config)
+    yield brain, server
+    server.stop()
+
+
+@pytest.mark.parametrize("query", [
+    "yes", "no", "how?", "why?", "explain", "go on", "what do you mean",
+    "summarize", "translate to french", "is it safe?",
+])
+def test_short_and_follow_up_queries_are_not_reusable(query):
+    assert not reusable_query(query)
+
+
+@pytest.mark.parametrize("query", [
+    "What is the capital of France?", "Is the earth round?", "explain quantum computing",
+])
+def test_standalone_queries_are_reusable(query):
+    assert reusable_query(query)
+
+
+def test_follow_ups_always_reach_the_llm(brain):
+    brain, server = brain
+    for count, query in enumerate(["What is the capital of France?", "why?", "Is the earth round?", "why?"], 1):
+        brain.think(query)
+        assert server.requests == count
+    assert brain.semantic_cache.hits == 0
+
+
+def test_repeated_question_after_another_exchange_is_not_reused(brain):
+    brain, server = brain
+    for query in ["What is the capital of France?", "Is the earth round?", "What is the capital of France?"]:
+        brain.think(query)
+    assert server.requests == 3
@@ -0,0 +1,74 @@
+"""Wake-word detection state across listen() calls."""
+
+import random
+from typing import List, Optional
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from pulse.tools.bench_wake_word import _in_noise, _pcm, random_speaker, room_noise, synth_word
+from pulse.voice import wake_word
+from pulse.voice.audio import AudioSource
+from pulse.voice.wake_word import SAMPLE_RATE, WakeWordDetector, enroll
+
+
+class _FrameSource(AudioSource):
+    """Serves fixed audio in 30 ms frames, then endless room noise."""
+
+    def __init__(self, samples: "np.ndarray", rng: random.Random):
+        self.frames: List[bytes] = [
+            samples[i:i + self.frame_samples].tobytes()
+            for i in range(0, len(samples) - self.frame_samples + 1, self.frame_samples)
+        ]
+        self.rng = rng
+
+    def read_frame(self) -> Optional[bytes]:
+        if self.frames:
+            return self.frames.pop(0)
+        return _pcm(room_noise(self.frame_ms / 1000, self.rng)).tobytes()
+
+
+class _Clock:
+    """Stands in for time.monotonic(): advances one frame per read."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        self.now += 0.03
+        return self.now
+
+
+@pytest.fixture
+def detector():
+    rng = random.Random(3)
+    clips = [_pcm(_in_noise(synth_word("pulse", rng, **random_speaker(rng)), rng)) for _ in range(3)]
+    templates, threshold = enroll(clips)
+    return WakeWordDetector({"pulse": templates}, {"pulse": threshold})
+
+
+@pytest.fixture
+def word():
+    rng = random.Random(11)
+    speaker = {"pitch": 150.0, "tempo": 1.0, "tract": 1.0}
+    return _pcm(_in_noise(synth_word("pulse", rng, level=4000.0, **speaker), rng, pad_s=0.5)), rng
+
+
+def test_detects_the_wake_word(detector, word, monkeypatch):
+    samples, rng = word
+    monkeypatch.setattr(wake_word.time, "monotonic", _Clock())
+    hit = detector.listen(_FrameSource(samples, rng), timeout=len(samples) / SAMPLE_RATE + 0.5)
+    assert hit is not None and hit.word == "pulse"
+
+
+def test_listen_after_timeout_starts_fresh(detector, word, monkeypatch):
+    samples, rng = word
+    monkeypatch.setattr(wake_word.time, "monotonic", _Clock())
+    # Time out in the middle of the word, leaving partial matches behind
+    middle = int(0.5 * SAMPLE_RATE) + int(0.3 * SAMPLE_RATE)
+    assert detector.listen(_FrameSource(samples[:middle], rng), timeout=middle / SAMPLE_RATE) is None
+
+    # The rest of the word, heard on its own, is not a wake word
+    rest = samples[middle:]
+    assert detector.listen(_FrameSource(rest, rng), timeout=len(rest) / SAMPLE_RATE) is None